@@ -0,0 +1,390 @@
+# api.py
+"""HTTP/JSON API for the IntelliPath pipeline.
+
+    uvicorn api:app --host 0.0.0.0 --port 8000
+    python api.py
+
+Every POST endpoint takes the resume in one of three forms:
+
+- a form (multipart or urlencoded) with a ``file`` upload (PDF/DOCX/TXT)
+  or a ``text`` field, plus an optional ``preferences`` field holding JSON
+- ``application/json``: ``{"text": "...", "preferences": {...}}``
+- ``text/plain``: the resume text as the body, preferences as a JSON
+  ``preferences`` query parameter
+
+A ``mode`` query parameter (``ner``, ``rules`` or ``hybrid``; default
+INTELLIPATH_EXTRACTION_MODE) picks how entities are extracted; ``rules``
+never touches the NER model.
+
+Endpoints:
+
+- ``POST /extract/text``      raw text of the resume
+- ``POST /extract/entities``  NER entities (offsets into the text)
+- ``POST /summary``           normalized resume summary
+- ``POST /summary/stream``    the resume streamed through parsing, NER and
+  normalization as NDJSON events: one per page/segment with its entities,
+  then the summary (and the Markdown plan if preferences were given)
+- ``POST /career-path``       the career plan: Markdown streamed section by
+  section as it is rendered, or plain text, HTML or JSON with
+  ``?format=text|html|json``
+- ``POST /career-path/matrix`` what-if plans for every combination of the
+  repeatable ``area`` and ``timeline`` query parameters (default: every
+  career track and timeline), as JSON
+- ``GET /health``             liveness
+- ``GET /ready``              200 once the NER model has loaded (always in
+  ``rules`` mode), 503 before
+- ``GET /metrics``            Prometheus text: stage timings, counters, cache
+
+Bodies over INTELLIPATH_MAX_INPUT_BYTES get a 413; text past
+INTELLIPATH_MAX_TEXT_CHARS is dropped before NER. Results share the
+process-wide stage cache with the UI. At most
+INTELLIPATH_API_CONCURRENCY requests are processed at once; others wait up
+to INTELLIPATH_API_QUEUE_TIMEOUT seconds and then get a 503.
+"""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import iterate_in_threadpool, run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.formparsers import FormParser, MultiPartException, MultiPartParser
+
+from cache import RESULT_CACHE, content_key
+from career_plan import FORMATS, iter_markdown, render
+from generator import TIMELINES, stage_recommendation_cache_stats
+from iextract import EXTRACTION_MODES, entity_cache_stats, extraction_mode, ner_stats, warm_up_ner
+from jobs import get_job_queue
+from metrics import prometheus_text, request_scope
+from knowledge_base import CAREER_TRACKS
+from pipeline import stage_career_plan, stage_entities, stage_plan_matrix, stage_summary, stage_text, stream_resume
+from resume_parser import MAX_TEXT_CHARS, InputTooLarge, check_size
+
+
+API_CONCURRENCY = int(os.environ.get("INTELLIPATH_API_CONCURRENCY", "4"))
+API_QUEUE_TIMEOUT = float(os.environ.get("INTELLIPATH_API_QUEUE_TIMEOUT", "30"))
+# Most plans one /career-path/matrix request may ask for.
+API_MAX_PLAN_MATRIX = int(os.environ.get("INTELLIPATH_API_MAX_PLAN_MATRIX", "64"))
+
+_limiter = None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    global _limiter
+    _limiter = asyncio.Semaphore(API_CONCURRENCY)
+    # Start loading the model now so /ready turns green without waiting
+    # for the first request to pay for it.
+    if extraction_mode() != "rules":
+        warm_up_ner()
+    yield
+
+
+app = FastAPI(title="IntelliPath API", lifespan=lifespan)
+
+
+def _parse_preferences(value):
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    try:
+        preferences = json.loads(value)
+    except ValueError:
+        raise HTTPException(422, "preferences must be a JSON object")
+    if not isinstance(preferences, dict):
+        raise HTTPException(422, "preferences must be a JSON object")
+    return preferences
+
+
+def _check_size(nbytes):
+    try:
+        check_size(nbytes)
+    except InputTooLarge as e:
+        raise HTTPException(413, str(e))
+
+
+async def _bounded_stream(request: Request):
+    """The request body chunk by chunk, ending in a 413 as soon as more than
+    INTELLIPATH_MAX_INPUT_BYTES have arrived (chunked bodies have no
+    Content-Length to check up front)."""
+    received = 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        _check_size(received)
+        yield chunk
+
+
+async def _read_body(request: Request) -> bytes:
+    return b"".join([chunk async for chunk in _bounded_stream(request)])
+
+
+async def _read_form(request: Request, content_type: str):
+    parser = MultiPartParser if content_type.startswith("multipart/form-data") else FormParser
+    try:
+        return await parser(request.headers, _bounded_stream(request)).parse()
+    except MultiPartException as e:
+        raise HTTPException(400, e.message)
+
+
+async def _read_resume(request: Request) -> dict:
+    """Pull the resume (file bytes or text) and preferences out of any
+    accepted request body. No more than INTELLIPATH_MAX_INPUT_BYTES of the
+    body is ever read."""
+    content_type = request.headers.get("content-type", "")
+    # Refuse bodies that announce an oversized length before reading them.
+    _check_size(int(request.headers.get("content-length") or 0))
+    mode = request.query_params.get("mode") or None
+    if mode is not None and mode not in EXTRACTION_MODES:
+        raise HTTPException(422, f"mode must be one of {', '.join(EXTRACTION_MODES)}")
+    resume = {"data": None, "filename": None, "text": None, "mode": mode}
+    if content_type.startswith(("multipart/form-data", "application/x-www-form-urlencoded")):
+        form = await _read_form(request, content_type)
+        try:
+            upload = form.get("file")
+            if upload is not None and not isinstance(upload, str):
+                _check_size(upload.size or 0)
+                resume["data"], resume["filename"] = await upload.read(), upload.filename or "resume.txt"
+            else:
+                resume["text"] = form.get("text")
+            resume["preferences"] = _parse_preferences(form.get("preferences"))
+        finally:
+            await form.close()
+    elif content_type.startswith("application/json"):
+        try:
+            body = json.loads(await _read_body(request))
+        except ValueError:
+            raise HTTPException(422, "Body is not valid JSON")
+        if not isinstance(body, dict):
+            raise HTTPException(422, "Expected a JSON object with a 'text' field")
+        resume["text"] = body.get("text")
+        resume["preferences"] = _parse_preferences(body.get("preferences"))
+    else:
+        resume["text"] = (await _read_body(request)).decode("utf-8", errors="ignore")
+        resume["preferences"] = _parse_preferences(request.query_params.get("preferences"))
+    if resume["text"] is not None and not isinstance(resume["text"], str):
+        raise HTTPException(422, "'text' must be a string")
+    if resume["data"] is None and not resume["text"]:
+        raise HTTPException(422, "Provide a resume as a 'file' upload or as text")
+    return resume
+
+
+def _resume_text(resume):
+    if resume["data"] is None:
+        text = resume["text"]
+        if MAX_TEXT_CHARS is not None:
+            text = text[:MAX_TEXT_CHARS]
+        return content_key(text.encode("utf-8")), text
+    try:
+        return stage_text(resume["data"], resume["filename"])
+    except InputTooLarge as e:
+        raise HTTPException(413, str(e))
+    except Exception as e:
+        raise HTTPException(422, f"Failed to parse file: {e}")
+
+
+def _entities(resume, key, raw):
+    return stage_entities(key, raw, ner_slots=get_job_queue().ner_slots, mode=resume["mode"])
+
+
+def _summary(resume):
+    key, raw = _resume_text(resume)
+    return key, stage_summary(key, _entities(resume, key, raw), mode=resume["mode"])
+
+
+def _jsonable_entities(ents):
+    # Pipeline scores are numpy floats, which the JSON encoder rejects.
+    return [
+        {k: v.item() if hasattr(v, "item") else v for k, v in e.items()}
+        for e in ents if "original_text" not in e
+    ]
+
+
+def _text_response(resume):
+    key, raw = _resume_text(resume)
+    return {"key": key, "characters": len(raw), "text": raw}
+
+
+def _entities_response(resume):
+    key, raw = _resume_text(resume)
+    return {"key": key, "entities": _jsonable_entities(_entities(resume, key, raw))}
+
+
+def _summary_response(resume):
+    key, summary = _summary(resume)
+    return {"key": key, "summary": summary}
+
+
+def _career_path(resume):
+    key, summary = _summary(resume)
+    return key, stage_career_plan(key, summary, resume["preferences"], mode=resume["mode"])
+
+
+def _plan_matrix(resume, areas, timelines, fmt):
+    key, summary = _summary(resume)
+    plans = stage_plan_matrix(key, summary, resume["preferences"], areas, timelines, mode=resume["mode"])
+    return {
+        "key": key,
+        "plans": [
+            {
+                "area_of_interest": area,
+                "timeline": timeline,
+                "track": plan.track.name,
+                "skill_gap_percentage": plan.gaps.gap_percentage,
+                "plan": plan.to_dict() if fmt == "json" else render(plan, fmt),
+            }
+            for (area, timeline), plan in plans.items()
+        ],
+    }
+
+
+def _scoped(name, fn, resume):
+    with request_scope(name):
+        return fn(resume)
+
+
+async def _acquire_slot():
+    try:
+        await asyncio.wait_for(_limiter.acquire(), API_QUEUE_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise HTTPException(503, "Server busy, try again later", headers={"Retry-After": "5"})
+
+
+async def _process(name, fn, request):
+    """Read the request, then run ``fn`` on a worker thread under one of the
+    API's concurrency slots, timed (and profiled, if enabled) as ``name``."""
+    resume = await _read_resume(request)
+    await _acquire_slot()
+    try:
+        return await run_in_threadpool(_scoped, name, fn, resume)
+    finally:
+        _limiter.release()
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+@app.get("/ready")
+def ready():
+    stats = ner_stats()
+    mode = extraction_mode()
+    body = {"ready": mode == "rules" or bool(stats.get("loaded")), "mode": mode, "ner": stats}
+    return JSONResponse(body, status_code=200 if body["ready"] else 503)
+
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Stage timings and counters, plus cache and NER batching gauges, in
+    the Prometheus text format."""
+    lines = [prometheus_text().rstrip("\n")]
+    gauges = {f"cache_{k}": v for k, v in RESULT_CACHE.stats().items()}
+    gauges.update({f"entity_cache_{k}": v for k, v in entity_cache_stats().items()})
+    gauges.update({f"stage_recs_cache_{k}": v for k, v in stage_recommendation_cache_stats().items()})
+    gauges.update({f"ner_batch_{k}": v for k, v in ner_stats().get("batching", {}).items()})
+    for name, value in sorted(gauges.items()):
+        lines.append(f"# TYPE intellipath_{name} gauge")
+        lines.append(f"intellipath_{name} {value}")
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+
+@app.post("/extract/text")
+async def extract_text_endpoint(request: Request):
+    return await _process("api_extract_text", _text_response, request)
+
+
+@app.post("/extract/entities")
+async def extract_entities_endpoint(request: Request):
+    return await _process("api_extract_entities", _entities_response, request)
+
+
+@app.post("/summary")
+async def summary_endpoint(request: Request):
+    return await _process("api_summary", _summary_response, request)
+
+
+def _stream_events(resume):
+    """NDJSON lines of ``pipeline.stream_resume`` for the resume; failures
+    after the response has started become an ``error`` event."""
+    source = resume["data"] if resume["data"] is not None else resume["text"].encode("utf-8")
+    try:
+        for event in stream_resume(source, resume["preferences"] or None, mode=resume["mode"]):
+            if event["event"] == "segment":
+                event = dict(event, entities=_jsonable_entities(event["entities"]))
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+    except Exception as e:
+        yield json.dumps({"event": "error", "error": f"{type(e).__name__}: {e}"}) + "\n"
+
+
+class _SlotStreamingResponse(StreamingResponse):
+    """A StreamingResponse that releases the concurrency slot its endpoint
+    acquired once the response is over, however it ends: a client that
+    disconnects early (even before the body is first iterated) skips both
+    the body's ``finally`` and any background task."""
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            _limiter.release()
+
+
+@app.post("/summary/stream")
+async def summary_stream_endpoint(request: Request):
+    """Segments are parsed, tagged and folded into the summary one at a
+    time, so the first entities arrive before the whole file is parsed and
+    the full text is never held. The request keeps its concurrency slot
+    until the stream ends."""
+    resume = await _read_resume(request)
+    await _acquire_slot()
+    return _SlotStreamingResponse(iterate_in_threadpool(_stream_events(resume)), media_type="application/x-ndjson")
+
+
+_PLAN_MEDIA_TYPES = {"text": "text/plain; charset=utf-8", "html": "text/html; charset=utf-8",
+                     "json": "application/json"}
+
+
+@app.post("/career-path")
+async def career_path_endpoint(request: Request):
+    fmt = request.query_params.get("format", "md")
+    if fmt not in FORMATS:
+        raise HTTPException(422, f"format must be one of {', '.join(FORMATS)}")
+    key, plan = await _process("api_career_path", _career_path, request)
+    if fmt != "md":
+        return Response(render(plan, fmt), media_type=_PLAN_MEDIA_TYPES[fmt], headers={"X-Resume-Key": key})
+    # The plan is built under the request's slot; its sections are rendered
+    # as the client reads them.
+    return StreamingResponse(
+        iter_markdown(plan), media_type="text/markdown; charset=utf-8", headers={"X-Resume-Key": key}
+    )
+
+
+@app.post("/career-path/matrix")
+async def career_path_matrix_endpoint(request: Request):
+    """Plans for each (area, timeline) pair from one parse of the resume.
+    ``format`` picks how each plan is returned: structured ``json``
+    (default), or a rendered ``md``/``text``/``html`` string."""
+    areas = request.query_params.getlist("area") or list(CAREER_TRACKS)
+    timelines = request.query_params.getlist("timeline") or list(TIMELINES)
+    fmt = request.query_params.get("format", "json")
+    if fmt not in FORMATS:
+        raise HTTPException(422, f"format must be one of {', '.join(FORMATS)}")
+    if len(areas) * len(timelines) > API_MAX_PLAN_MATRIX:
+        raise HTTPException(422, f"At most {API_MAX_PLAN_MATRIX} plans per request")
+    return await _process(
+        "api_career_path_matrix",
+        lambda resume: _plan_matrix(resume, areas, timelines, fmt),
+        request,
+    )
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        app,
+        host=os.environ.get("INTELLIPATH_API_HOST", "127.0.0.1"),
+        port=int(os.environ.get("INTELLIPATH_API_PORT", "8000")),
+    )
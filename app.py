@@ -1,9 +1,31 @@
 # app.py
+"""Streamlit UI.
+
+Streamlit re-runs this script on every widget interaction, so the work is
+split by how often it has to happen:
+
+- the NER model, knowledge base and job queue are ``st.cache_resource``s,
+  created once per server process;
+- text extraction is an ``st.cache_data`` function keyed by the upload;
+  NER and normalization run on the shared job queue, whose stage cache
+  makes a re-submitted resume a cache hit, while this script polls the
+  job for its stage and progress;
+- the results of the current upload live in ``st.session_state``, so
+  reruns redraw them without recomputing anything;
+- the preferences and the plan are an ``st.fragment``: changing a
+  preference re-runs only that fragment, which regenerates the plan (a
+  cached, millisecond-scale step) and nothing else.
+
+In the "rules" extraction mode (sidebar) the NER model is never loaded.
+"""
 import streamlit as st
-from utils import save_uploaded_file
-from resume_parser import extract_text
-from iextract import extract_entities, normalize_entities
-from generator import generate_career_path
+from career_plan import render_html, render_json, render_markdown, render_text
+from generator import TIMELINES
+from iextract import EXTRACTION_MODE, EXTRACTION_MODES, warm_up_ner, ner_stats
+from jobs import get_job_queue
+from metrics import request_scope
+from pipeline import stage_career_plan, stage_plan_matrix, stage_text
+from resume_parser import InputTooLarge
 
 
 # Page configuration
@@ -14,8 +36,40 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+AREAS_OF_INTEREST = [
+    "Software Development",
+    "Data Science & Analytics",
+    "DevOps & Cloud",
+    "Cybersecurity",
+    "Product Management",
+    "UI/UX Design",
+    "Artificial Intelligence & Machine Learning",
+    "Mobile Development",
+    "Web Development",
+    "Game Development",
+    "Blockchain & Web3",
+]
+OTHER_AREA = "Other (please specify)"
+
+FUTURE_GOALS = [
+    "Become a technical leader/architect",
+    "Move into management/leadership",
+    "Start my own company/entrepreneurship",
+    "Work for top tech companies (FAANG)",
+    "Become a subject matter expert",
+    "Work remotely/freelance",
+    "Contribute to open source",
+    "Pursue advanced education (Master's/PhD)",
+    "Specialize in emerging technologies",
+    "Work internationally",
+    "Focus on social impact/tech for good",
+    "Achieve work-life balance",
+    "High salary/compensation",
+    "Job security and stability"
+]
+
 # Custom CSS for better styling
-st.markdown("""
+CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -63,7 +117,94 @@ st.markdown("""
         margin: 1rem 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+# -- Process-wide resources ---------------------------------------------------
+
+@st.cache_resource(show_spinner=False)
+def load_ner_model():
+    """Start loading the NER model in the background; the page renders
+    immediately and the model is shared by every session."""
+    warm_up_ner()
+
+
+@st.cache_resource(show_spinner=False)
+def load_knowledge_base() -> dict:
+    """Load the knowledge base and the generator's indexes built from it."""
+    import generator  # noqa: F401  (builds the track/skill-gap indexes at import)
+    import knowledge_base
+    return {"version": knowledge_base.VERSION, "tracks": len(knowledge_base.CAREER_TRACKS)}
+
+
+@st.cache_resource(show_spinner=False)
+def job_queue():
+    """The process-wide job queue; its NER slots bound concurrent model use
+    across sessions and the HTTP API."""
+    return get_job_queue()
+
+
+# -- Per-upload results -------------------------------------------------------
+
+@st.cache_data(max_entries=32, show_spinner="📖 Extracting text from resume...")
+def parse_upload(file_bytes: bytes, filename: str) -> dict:
+    with request_scope("ui_parse", filename=filename) as record:
+        key, raw = stage_text(file_bytes, filename)
+    return {"key": key, "text": raw, "timings": record["timings"], "counters": record["counters"]}
+
+
+STAGE_MESSAGES = {
+    None: "⏳ Waiting for a free worker...",
+    "extract_text": "📖 Extracting text from resume...",
+    "extract_entities": "🧠 Analyzing resume content...",
+    "normalize_entities": "🧠 Organizing extracted details...",
+}
+
+
+class AnalysisFailed(Exception):
+    pass
+
+
+def analyze_upload(uploaded, mode) -> dict:
+    """Parse the upload, run NER and normalization on the job queue while
+    showing its progress, and return the artifacts kept in session state."""
+    file_bytes = uploaded.getvalue()
+    parsed = parse_upload(file_bytes, uploaded.name)
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    jobs = job_queue()
+    # No preferences: the plan is built by the plan fragment, per preference change.
+    job = jobs.get(jobs.submit(file_bytes, uploaded.name, mode=mode))
+    while not job.wait(timeout=0.25):
+        state = job.snapshot()
+        progress_bar.progress(state["progress"])
+        status_text.text(STAGE_MESSAGES.get(state["stage"], "⏳ Working..."))
+    progress_bar.empty()
+    status_text.empty()
+
+    state = job.snapshot()
+    if state["status"] == "failed":
+        raise AnalysisFailed(f"{state['failed_stage']}: {state['error']}")
+    result = job.result
+    return {
+        "upload_id": uploaded.file_id,
+        "mode": mode,
+        "filename": uploaded.name,
+        "key": result["key"],
+        "text": result["text"],
+        "summary": result["summary"],
+        # The job's extract_text was a stage-cache hit; report the real parse.
+        "timings": {**state["timings"], **parsed["timings"]},
+        "counters": {**parsed["counters"], **state["counters"]},
+    }
+
+
+# The sidebar's extraction mode, from the previous run on reruns.
+if st.session_state.get("extraction_mode", EXTRACTION_MODE) != "rules":
+    load_ner_model()
+kb_info = load_knowledge_base()
+
+st.markdown(CSS, unsafe_allow_html=True)
 
 # Main header
 st.markdown('<h1 class="main-header">🎯 IntelliPath — AI Career Path Recommender</h1>', unsafe_allow_html=True)
@@ -73,10 +214,10 @@ with st.sidebar:
     st.header("📋 Instructions")
     st.markdown("""
     1. **Upload** your resume (PDF, DOCX, or TXT)
-    2. **Provide** your area of interest and future goals
-    3. **Click Analyze** to process your resume
-    4. **Review** the extracted information
-    5. **Get** your personalized career path
+    2. **Click Analyze** to process your resume
+    3. **Review** the extracted information
+    4. **Provide** your area of interest and future goals
+    5. **Get** your personalized career path, updated as you change them
     6. **Download** your career plan
     """)
     
@@ -89,6 +230,32 @@ with st.sidebar:
     - 💾 **Download Results**: Save your career plan
     """)
 
+    st.header("🧠 Model Status")
+    extraction_mode = st.selectbox(
+        "Extraction mode",
+        EXTRACTION_MODES,
+        index=EXTRACTION_MODES.index(EXTRACTION_MODE),
+        key="extraction_mode",
+        help="ner: the NER model; rules: knowledge-base vocabularies only (fast, no model); hybrid: both",
+    )
+    model_info = ner_stats()
+    if model_info.get("loaded"):
+        st.caption(
+            f"NER model loaded in {model_info['load_seconds']}s "
+            f"(~{model_info['parameter_bytes'] / 1e6:.0f} MB weights)"
+        )
+        batching = model_info.get("batching")
+        if batching and batching["batches"]:
+            st.caption(f"{batching['batches']} NER batches, {batching['mean_batch']} windows per batch on average")
+    elif model_info.get("error"):
+        st.caption(f"NER model failed to load: {model_info['error']}")
+    elif extraction_mode == "rules":
+        st.caption("NER model not loaded (rules mode)")
+    else:
+        st.caption("NER model is loading in the background...")
+    st.caption(f"Knowledge base v{kb_info['version']} ({kb_info['tracks']} career tracks)")
+    show_timings = st.checkbox("⏱️ Show timing breakdown", value=False)
+
 # Main content
 col1, col2, col3 = st.columns([1, 2, 1])
 with col2:
@@ -97,154 +264,49 @@ with col2:
         type=["pdf", "docx", "txt"],
         help="Supported formats: PDF, DOCX, TXT"
     )
+    analyze_button = st.button(
+        "🔍 Analyze Resume", type="primary", use_container_width=True, disabled=uploaded is None
+    )
 
-if uploaded:
-    st.markdown('<div class="info-box">📄 <strong>File uploaded successfully!</strong> Now provide your preferences below.</div>', unsafe_allow_html=True)
-
-# User preferences section
-st.markdown('<h2 class="sub-header">🎯 Your Career Preferences</h2>', unsafe_allow_html=True)
-st.markdown('<div class="user-input-section">Please provide your preferences to get a more personalized career path recommendation.</div>', unsafe_allow_html=True)
-
-# Area of interest
-st.subheader("🌟 Area of Interest")
-area_of_interest = st.selectbox(
-    "What area of technology interests you most?",
-    [
-        "Software Development",
-        "Data Science & Analytics", 
-        "DevOps & Cloud",
-        "Cybersecurity",
-        "Product Management",
-        "UI/UX Design",
-        "Artificial Intelligence & Machine Learning",
-        "Mobile Development",
-        "Web Development",
-        "Game Development",
-        "Blockchain & Web3",
-        "Other (please specify)"
-    ],
-    help="Select the area that most interests you for your career"
-)
-
-# Custom area of interest
-if area_of_interest == "Other (please specify)":
-    area_of_interest = st.text_input("Please specify your area of interest:")
-
-# Future goals
-st.subheader("🎯 Future Goals")
-future_goals = st.multiselect(
-    "What are your future career goals? (Select all that apply)",
-    [
-        "Become a technical leader/architect",
-        "Move into management/leadership",
-        "Start my own company/entrepreneurship",
-        "Work for top tech companies (FAANG)",
-        "Become a subject matter expert",
-        "Work remotely/freelance",
-        "Contribute to open source",
-        "Pursue advanced education (Master's/PhD)",
-        "Specialize in emerging technologies",
-        "Work internationally",
-        "Focus on social impact/tech for good",
-        "Achieve work-life balance",
-        "High salary/compensation",
-        "Job security and stability"
-    ],
-    help="Select your primary career goals"
-)
-
-# Additional goals
-additional_goals = st.text_area(
-    "Any other specific goals or preferences?",
-    placeholder="E.g., I want to work in healthcare technology, I prefer startups over large companies, I want to focus on sustainability...",
-    help="Share any additional context about your career aspirations"
-)
-
-# Timeline preference
-st.subheader("⏰ Career Timeline")
-timeline = st.selectbox(
-    "What's your preferred timeline for career advancement?",
-    [
-        "Fast-track (aim for rapid advancement)",
-        "Steady growth (balanced pace)",
-        "Long-term focus (patient, thorough development)",
-        "Flexible (adapt to opportunities)"
-    ],
-    help="How quickly do you want to advance in your career?"
-)
-
-# Analysis button
-st.markdown("---")
-col1, col2, col3 = st.columns([1, 1, 1])
-with col2:
-    analyze_button = st.button("🚀 Generate Personalized Career Path", type="primary", use_container_width=True)
-
-if analyze_button:
-    if not uploaded:
-        st.error("❌ Please upload a resume first.")
-        st.stop()
-    
-    if not area_of_interest:
-        st.error("❌ Please select or specify your area of interest.")
-        st.stop()
-
-    # Progress tracking
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    # Step 1: Save file
-    status_text.text("📁 Saving uploaded file...")
-    progress_bar.progress(10)
-    with st.spinner("Saving file..."):
-        tmp_path = save_uploaded_file(uploaded, uploaded.name)
-
-    # Step 2: Extract text
-    status_text.text("📖 Extracting text from resume...")
-    progress_bar.progress(20)
-    with st.spinner("Extracting text..."):
-        try:
-            raw = extract_text(tmp_path)
-        except Exception as e:
-            st.error(f"❌ Failed to parse file: {e}")
-            st.stop()
-
-    # Step 3: NER Processing
-    status_text.text("🧠 Analyzing resume content...")
-    progress_bar.progress(40)
-    with st.spinner("Running AI analysis..."):
-        ents = extract_entities(raw)
-        summary = normalize_entities(ents)
-
-    # Step 4: Generate career path
-    status_text.text("🎯 Generating personalized career path...")
-    progress_bar.progress(60)
-    with st.spinner("Creating your personalized career plan..."):
-        try:
-            # Add user preferences to summary
-            user_preferences = {
-                "area_of_interest": area_of_interest,
-                "future_goals": future_goals,
-                "additional_goals": additional_goals,
-                "timeline": timeline
-            }
-            summary["user_preferences"] = user_preferences
-            
-            plan_md = generate_career_path(summary)
-        except Exception as e:
-            st.error(f"❌ Generation failed: {e}")
-            st.stop()
-
-    # Complete
-    progress_bar.progress(100)
-    status_text.text("✅ Analysis complete!")
-    st.success("🎉 Your personalized career path has been generated successfully!")
-
-    # Display results in tabs
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📊 Resume Analysis", "🎯 Career Path", "📄 Raw Text", "💾 Download", "⚙️ Your Preferences"])
+if analyze_button and uploaded is not None:
+    try:
+        st.session_state["analysis"] = analyze_upload(uploaded, extraction_mode)
+    except InputTooLarge as e:
+        st.error(f"❌ {e}")
+    except AnalysisFailed as e:
+        st.error(f"❌ Analysis failed at {e}")
+    except Exception as e:
+        st.error(f"❌ Failed to analyze file: {type(e).__name__}: {e}")
+
+analysis = st.session_state.get("analysis")
+if uploaded is None and analysis is None:
+    st.markdown('<div class="info-box">📄 Upload your resume to get started.</div>', unsafe_allow_html=True)
+elif uploaded is not None and (
+    analysis is None or analysis["upload_id"] != uploaded.file_id or analysis["mode"] != extraction_mode
+):
+    st.markdown('<div class="info-box">📄 <strong>File uploaded successfully!</strong> Click <strong>Analyze Resume</strong> to process it.</div>', unsafe_allow_html=True)
+
+
+def show_analysis(analysis):
+    summary = analysis["summary"]
+    raw = analysis["text"]
+    st.markdown('<h2 class="sub-header">📊 Resume Analysis Results</h2>', unsafe_allow_html=True)
+    st.caption(f"📄 {analysis['filename']} · {analysis['mode']} extraction")
+
+    if show_timings:
+        with st.expander("⏱️ Timing breakdown", expanded=True):
+            total = sum(analysis["timings"].values())
+            st.table([
+                {"Stage": stage, "Seconds": round(seconds, 3),
+                 "Share": f"{seconds / total:.0%}" if total else "-"}
+                for stage, seconds in analysis["timings"].items()
+            ])
+            if analysis["counters"]:
+                st.caption(", ".join(f"{name}: {value}" for name, value in sorted(analysis["counters"].items())))
+
+    tab1, tab2 = st.tabs(["📊 Resume Analysis", "📄 Raw Text"])
 
     with tab1:
-        st.markdown('<h2 class="sub-header">📊 Resume Analysis Results</h2>', unsafe_allow_html=True)
-        
         # Create columns for better layout
         col1, col2 = st.columns(2)
         
@@ -299,71 +361,205 @@ if analyze_button:
                 st.markdown(f"- {achievement}")
 
     with tab2:
-        st.markdown('<h2 class="sub-header">🎯 Your Personalized Career Path</h2>', unsafe_allow_html=True)
-        st.markdown(plan_md)
-
-    with tab3:
-        st.markdown('<h2 class="sub-header">📄 Raw Resume Text</h2>', unsafe_allow_html=True)
         st.text_area("Raw text from your resume", raw[:5000], height=300, disabled=True)
         if len(raw) > 5000:
             st.info(f"Showing first 5000 characters. Total length: {len(raw)} characters")
 
-    with tab4:
+
+def preference_inputs() -> dict:
+    """Preference widgets; their values persist in session state under their keys."""
+    st.markdown('<h2 class="sub-header">🎯 Your Career Preferences</h2>', unsafe_allow_html=True)
+    st.markdown('<div class="user-input-section">Your career path updates as you change these preferences.</div>', unsafe_allow_html=True)
+
+    # Area of interest
+    st.subheader("🌟 Area of Interest")
+    area_of_interest = st.selectbox(
+        "What area of technology interests you most?",
+        AREAS_OF_INTEREST + [OTHER_AREA],
+        key="area_choice",
+        help="Select the area that most interests you for your career"
+    )
+
+    # Custom area of interest
+    if area_of_interest == OTHER_AREA:
+        area_of_interest = st.text_input("Please specify your area of interest:", key="area_other")
+
+    # Future goals
+    st.subheader("🎯 Future Goals")
+    future_goals = st.multiselect(
+        "What are your future career goals? (Select all that apply)",
+        FUTURE_GOALS,
+        key="future_goals",
+        help="Select your primary career goals"
+    )
+
+    # Additional goals
+    additional_goals = st.text_area(
+        "Any other specific goals or preferences?",
+        placeholder="E.g., I want to work in healthcare technology, I prefer startups over large companies, I want to focus on sustainability...",
+        key="additional_goals",
+        help="Share any additional context about your career aspirations"
+    )
+
+    # Timeline preference
+    st.subheader("⏰ Career Timeline")
+    timeline = st.selectbox(
+        "What's your preferred timeline for career advancement?",
+        TIMELINES,
+        key="timeline",
+        help="How quickly do you want to advance in your career?"
+    )
+
+    return {
+        "area_of_interest": area_of_interest,
+        "future_goals": future_goals,
+        "additional_goals": additional_goals,
+        "timeline": timeline
+    }
+
+
+def show_downloads(plan):
+    st.markdown('<div class="download-section">', unsafe_allow_html=True)
+    st.markdown("### 📥 Download Options")
+
+    # Download as Markdown
+    st.download_button(
+        label="📄 Download as Markdown (.md)",
+        data=render_markdown(plan),
+        file_name="intellipath_career_plan.md",
+        mime="text/markdown",
+        use_container_width=True
+    )
+
+    # Download as Text
+    st.download_button(
+        label="📝 Download as Text (.txt)",
+        data=render_text(plan),
+        file_name="intellipath_career_plan.txt",
+        mime="text/plain",
+        use_container_width=True
+    )
+
+    # Download as HTML
+    st.download_button(
+        label="🌐 Download as HTML (.html)",
+        data=render_html(plan),
+        file_name="intellipath_career_plan.html",
+        mime="text/html",
+        use_container_width=True
+    )
+
+    # Download as JSON
+    st.download_button(
+        label="🧾 Download as JSON (.json)",
+        data=render_json(plan),
+        file_name="intellipath_career_plan.json",
+        mime="application/json",
+        use_container_width=True
+    )
+
+    st.markdown("""
+    **📋 What you'll get:**
+    - Your personalized 3-stage career development plan
+    - Skill analysis and recommendations based on your preferences
+    - Immediate next steps and long-term strategy
+    - Professional formatting ready for sharing
+    """)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+
+def show_comparison(analysis, preferences):
+    # What-if comparison
+    compare_areas = st.multiselect(
+        "Areas of interest to compare", AREAS_OF_INTEREST, default=AREAS_OF_INTEREST, key="compare_areas"
+    )
+    compare_timelines = st.multiselect(
+        "Timelines to compare", TIMELINES, default=list(TIMELINES), key="compare_timelines"
+    )
+    if not compare_areas or not compare_timelines:
+        st.info("Select at least one area of interest and one timeline to compare")
+        return
+    # Reuses the resume analysis; only the plans are generated.
+    matrix = stage_plan_matrix(
+        analysis["key"], analysis["summary"], preferences, compare_areas, compare_timelines,
+        mode=analysis["mode"],
+    )
+    st.table([
+        {"Area of Interest": area, "Timeline": plan_timeline, "Track": plan.track.name,
+         "Skills Gap": f"{plan.gaps.gap_percentage}%",
+         "Missing Skills": sum(len(skills) for _, skills in plan.gaps.missing)}
+        for (area, plan_timeline), plan in matrix.items()
+    ])
+    for (area, plan_timeline), plan in matrix.items():
+        with st.expander(f"{area} · {plan_timeline}"):
+            st.markdown(render_markdown(plan))
+
+
+@st.fragment
+def career_plan_section():
+    """Preferences and the plan built from them. Widgets in here re-run only
+    this function, against the analysis already in session state."""
+    analysis = st.session_state["analysis"]
+    preferences = preference_inputs()
+    compare_mode = st.checkbox(
+        "🔀 Also compare plans across other interests and timelines",
+        key="compare_mode",
+        help="Generates a plan for every selected combination from the same resume analysis"
+    )
+
+    st.markdown("---")
+    if not preferences["area_of_interest"]:
+        st.info("Select or specify your area of interest to generate your career path.")
+        return
+
+    plan = stage_career_plan(analysis["key"], analysis["summary"], preferences, mode=analysis["mode"])
+
+    tab_names = ["🎯 Career Path", "💾 Download", "⚙️ Your Preferences"]
+    if compare_mode:
+        tab_names.append("🔀 Compare")
+    tab1, tab2, tab3, *compare_tab = st.tabs(tab_names)
+
+    with tab1:
+        st.markdown('<h2 class="sub-header">🎯 Your Personalized Career Path</h2>', unsafe_allow_html=True)
+        st.markdown(render_markdown(plan))
+
+    with tab2:
         st.markdown('<h2 class="sub-header">💾 Download Your Career Plan</h2>', unsafe_allow_html=True)
-        
-        st.markdown('<div class="download-section">', unsafe_allow_html=True)
-        st.markdown("### 📥 Download Options")
-        
-        # Download as Markdown
-        st.download_button(
-            label="📄 Download as Markdown (.md)",
-            data=plan_md,
-            file_name="intellipath_career_plan.md",
-            mime="text/markdown",
-            use_container_width=True
-        )
-        
-        # Download as Text
-        st.download_button(
-            label="📝 Download as Text (.txt)",
-            data=plan_md,
-            file_name="intellipath_career_plan.txt",
-            mime="text/plain",
-            use_container_width=True
-        )
-        
-        st.markdown("""
-        **📋 What you'll get:**
-        - Your personalized 3-stage career development plan
-        - Skill analysis and recommendations based on your preferences
-        - Immediate next steps and long-term strategy
-        - Professional formatting ready for sharing
-        """)
-        st.markdown('</div>', unsafe_allow_html=True)
-
-    with tab5:
+        show_downloads(plan)
+
+    with tab3:
         st.markdown('<h2 class="sub-header">⚙️ Your Career Preferences</h2>', unsafe_allow_html=True)
         
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("🌟 Area of Interest")
-            st.info(area_of_interest)
+            st.info(preferences["area_of_interest"])
             
             st.subheader("⏰ Timeline Preference")
-            st.info(timeline)
+            st.info(preferences["timeline"])
         
         with col2:
             st.subheader("🎯 Future Goals")
-            if future_goals:
-                for goal in future_goals:
+            if preferences["future_goals"]:
+                for goal in preferences["future_goals"]:
                     st.markdown(f"- {goal}")
             else:
                 st.info("No specific goals selected")
         
-        if additional_goals:
+        if preferences["additional_goals"]:
             st.subheader("📝 Additional Goals")
-            st.info(additional_goals)
+            st.info(preferences["additional_goals"])
+
+    if compare_tab:
+        with compare_tab[0]:
+            st.markdown('<h2 class="sub-header">🔀 Compare Career Plans</h2>', unsafe_allow_html=True)
+            show_comparison(analysis, preferences)
+
+
+if analysis is not None:
+    show_analysis(analysis)
+    career_plan_section()
 
 # Footer
 st.markdown("---")
@@ -372,4 +568,4 @@ st.markdown("""
     <p>🎯 IntelliPath - AI-Powered Career Path Recommender</p>
     <p>Upload your resume and share your preferences to get personalized career guidance!</p>
 </div>
-""", unsafe_allow_html=True)
\ No newline at end of file
+""", unsafe_allow_html=True)
@@ -0,0 +1,223 @@
+# batch.py
+"""Headless bulk processing of resumes.
+
+    python batch.py resumes/ --preferences prefs.json --output results.jsonl --workers 4
+
+Inputs are files, directories (searched for .pdf/.docx/.txt) or manifest
+files (.lst/.list: one path per line, .jsonl: one {"path": ...} object per
+line). Each resume runs extract_text -> extract_entities ->
+normalize_entities -> generate_career_path in a process pool with one NER
+model per worker; results are appended to the output JSONL as they finish
+and a throughput / timing report is printed at the end. ``--mode rules``
+skips the model entirely (see ``iextract.EXTRACTION_MODES``).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+MANIFEST_EXTENSIONS = (".lst", ".list", ".jsonl")
+# iextract.EXTRACTION_MODES, spelled out: the parent must not import the
+# pipeline (and open cache connections) before forking the workers.
+EXTRACTION_MODES = ("ner", "rules", "hybrid")
+STAGES = ("extract_text", "extract_entities", "normalize_entities", "generate_career_path")
+
+
+def _read_manifest(path):
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if path.endswith(".jsonl"):
+                line = json.loads(line)["path"]
+            yield line if os.path.isabs(line) else os.path.join(base, line)
+
+
+def collect_inputs(inputs, recursive=True):
+    """Expand files, directories and manifests into a list of resume paths."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            walker = os.walk(item) if recursive else [(item, [], os.listdir(item))]
+            for root, _, files in walker:
+                paths.extend(
+                    os.path.join(root, name) for name in sorted(files)
+                    if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS
+                )
+        elif os.path.splitext(item)[1].lower() in MANIFEST_EXTENSIONS:
+            paths.extend(_read_manifest(item))
+        else:
+            paths.append(item)
+    return paths
+
+
+def _init_worker(threads, mode=None):
+    # Load this worker's NER model up front so the first resume doesn't pay for it.
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    from iextract import extraction_mode, warm_up_ner
+    if extraction_mode(mode) != "rules":
+        warm_up_ner(background=False)
+
+
+def process_resume(path, preferences, mode=None):
+    """Run the full pipeline on one file and return a JSON-serializable record."""
+    from iextract import extraction_mode
+    from metrics import request_scope
+    from pipeline import stage_entities, stage_plan, stage_summary, stage_text
+    from resume_parser import check_size
+
+    record = {"path": path, "ok": False, "mode": extraction_mode(mode), "timings": {}}
+    timings = record["timings"]
+    stage = "read"
+    try:
+        with request_scope("batch", path=path) as scope:
+            record["counters"] = scope["counters"]
+            check_size(os.path.getsize(path))
+            with open(path, "rb") as f:
+                data = f.read()
+
+            stage = "extract_text"
+            started = time.perf_counter()
+            key, raw = stage_text(data, os.path.basename(path))
+            timings[stage] = time.perf_counter() - started
+
+            stage = "extract_entities"
+            started = time.perf_counter()
+            ents = stage_entities(key, raw, mode=mode)
+            timings[stage] = time.perf_counter() - started
+
+            stage = "normalize_entities"
+            started = time.perf_counter()
+            summary = stage_summary(key, ents, mode=mode)
+            timings[stage] = time.perf_counter() - started
+
+            stage = "generate_career_path"
+            started = time.perf_counter()
+            plan_md = stage_plan(key, summary, preferences, mode=mode)
+            timings[stage] = time.perf_counter() - started
+    except Exception as e:
+        record["error"] = f"{stage}: {type(e).__name__}: {e}"
+        return record
+
+    record.update({
+        "ok": True,
+        "sha256": key,
+        "characters": len(raw),
+        "entities": sum(1 for e in ents if "original_text" not in e),
+        "summary": summary,
+        "career_path": plan_md,
+    })
+    return record
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def build_report(records, elapsed):
+    ok = [r for r in records if r["ok"]]
+    report = {
+        "files": len(records),
+        "succeeded": len(ok),
+        "failed": len(records) - len(ok),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_per_second": round(len(records) / elapsed, 3) if elapsed else 0.0,
+        "stages": {},
+        "failures": [{"path": r["path"], "error": r["error"]} for r in records if not r["ok"]],
+    }
+    counters = {}
+    for r in records:
+        for name, value in r.get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + value
+    report["counters"] = counters
+    for stage in STAGES:
+        values = [r["timings"][stage] for r in records if stage in r["timings"]]
+        if values:
+            report["stages"][stage] = {
+                "mean": round(statistics.fmean(values), 4),
+                "p50": round(_percentile(values, 50), 4),
+                "p95": round(_percentile(values, 95), 4),
+                "max": round(max(values), 4),
+            }
+    return report
+
+
+def run_batch(paths, preferences, output, workers=None, threads_per_worker=None, progress=None, mode=None):
+    """Process ``paths`` in a process pool, streaming records to ``output`` (a text file)."""
+    records = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(threads_per_worker, mode)
+    ) as pool:
+        futures = {pool.submit(process_resume, path, preferences, mode): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                record = future.result()
+            except Exception as e:  # worker died (e.g. out of memory)
+                record = {"path": futures[future], "ok": False, "timings": {},
+                          "error": f"worker: {type(e).__name__}: {e}"}
+            output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            output.flush()
+            records.append({k: record[k] for k in ("path", "ok", "timings", "counters", "error") if k in record})
+            if progress:
+                progress(len(records), len(paths), record)
+    return build_report(records, time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the IntelliPath pipeline over many resumes.")
+    parser.add_argument("inputs", nargs="+", help="Resume files, directories or manifest files (.lst/.jsonl)")
+    parser.add_argument("--preferences", "-p", help="JSON file with area_of_interest, future_goals, additional_goals, timeline")
+    parser.add_argument("--output", "-o", default="-", help="JSONL file for results (default: stdout)")
+    parser.add_argument("--workers", "-w", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--threads-per-worker", type=int, default=None, help="Torch intra-op threads per worker")
+    parser.add_argument("--mode", choices=EXTRACTION_MODES, default=None,
+                        help="Extraction mode; rules never loads the NER model (default: INTELLIPATH_EXTRACTION_MODE)")
+    parser.add_argument("--no-recursive", action="store_true", help="Don't descend into subdirectories")
+    parser.add_argument("--report", help="Also write the summary report to this JSON file")
+    args = parser.parse_args(argv)
+
+    preferences = {}
+    if args.preferences:
+        with open(args.preferences, "r", encoding="utf-8") as f:
+            preferences = json.load(f)
+
+    paths = collect_inputs(args.inputs, recursive=not args.no_recursive)
+    if not paths:
+        parser.error("no resumes found in the given inputs")
+
+    def progress(done, total, record):
+        status = "ok" if record["ok"] else f"FAILED ({record['error']})"
+        print(f"[{done}/{total}] {record['path']}: {status}", file=sys.stderr)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    try:
+        report = run_batch(paths, preferences, output, args.workers, args.threads_per_worker, progress, args.mode)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    print(json.dumps(report, indent=2), file=sys.stderr)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+# benchmark.py
+"""Reproducible pipeline benchmark on a synthetic resume corpus.
+
+    python benchmark.py --output results.json
+    python benchmark.py --save-baseline baseline.json
+    python benchmark.py --baseline baseline.json --threshold 0.25
+
+Resumes are generated from the knowledge-base vocabularies in three
+lengths and three formats (TXT, DOCX, PDF) with a fixed seed, then every
+file goes through parsing, NER, normalization and career-path generation,
+each stage timed on its own. The stage cache is bypassed, the per-window
+entity cache is turned off and the stage-recommendation memo is emptied
+before every plan, so repeats time the work rather than lookups. NER uses a
+stub that tags vocabulary phrases, so the numbers measure this code rather
+than a model download; pass ``--ner model`` to use INTELLIPATH_NER_MODEL
+(e.g. a small local checkpoint) instead. ``--mode`` picks the extraction
+mode; ``--mode rules`` times the model-free path.
+
+With ``--baseline``, the run fails (exit code 1) if any stage's p50 or p95
+is more than ``--threshold`` slower than the baseline's (and by more than
+``--min-delta-ms``, so sub-millisecond jitter doesn't count).
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from knowledge_base import (
+    ACHIEVEMENT_PATTERNS,
+    CERT_PATTERNS,
+    COMPANY_PATTERNS,
+    EDUCATION_PATTERNS,
+    JOB_TITLE_PATTERNS,
+    PROJECT_PATTERNS,
+    SKILL_PATTERNS,
+    VERSION,
+)
+from iextract import EXTRACTION_MODES
+
+
+STAGES = ("parse", "extract_entities", "normalize_entities", "generate_career_path")
+FORMATS = ("txt", "docx", "pdf")
+# Number of experience entries per resume for each size.
+SIZES = {"short": 2, "medium": 6, "long": 20}
+COMPARED = ("p50", "p95")
+
+PREFERENCES = {
+    "area_of_interest": "Data Science & Analytics",
+    "future_goals": ["Become a technical leader/architect", "Contribute to open source"],
+    "additional_goals": "",
+    "timeline": "Steady growth (balanced pace)",
+}
+
+_FILLER = (
+    "Collaborated with cross-functional teams to deliver features on schedule.",
+    "Reduced page load times by profiling and removing redundant queries.",
+    "Mentored junior engineers and ran weekly code reviews.",
+    "Owned the on-call rotation and wrote runbooks for common incidents.",
+    "Worked with product managers to turn requirements into technical designs.",
+)
+
+
+# -- synthetic corpus -------------------------------------------------------
+
+def generate_resume(rng: random.Random, experiences: int) -> str:
+    """One synthetic resume drawn from the knowledge-base vocabularies."""
+    skills = [s for group in SKILL_PATTERNS.values() for s in group]
+    lines = [
+        f"Candidate {rng.randint(1000, 9999)}",
+        f"{rng.choice(JOB_TITLE_PATTERNS).title()} | candidate@example.com",
+        "",
+        "SUMMARY",
+        f"Engineer with {rng.randint(1, 15)} years of experience in "
+        f"{', '.join(rng.sample(skills, 4))}.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(skills, min(len(skills), 8 + experiences * 2))),
+        "",
+        "EXPERIENCE",
+    ]
+    for _ in range(experiences):
+        lines.append(
+            f"{rng.choice(JOB_TITLE_PATTERNS).title()} at {rng.choice(COMPANY_PATTERNS).title()} "
+            f"({rng.randint(2005, 2023)} - {rng.randint(2006, 2024)})"
+        )
+        for _ in range(3):
+            lines.append(f"- {rng.choice(_FILLER)} Used {rng.choice(skills)} and {rng.choice(skills)}.")
+        lines.append(f"- Built a {rng.choice(PROJECT_PATTERNS)} with {rng.choice(skills)}.")
+    lines += [
+        "",
+        "EDUCATION",
+        f"{rng.choice(EDUCATION_PATTERNS).title()} in Computer Science",
+        "",
+        "CERTIFICATIONS",
+        *(c.title() for c in rng.sample(list(CERT_PATTERNS), min(3, len(CERT_PATTERNS)))),
+        "",
+        "ACHIEVEMENTS",
+        *(f"{a.title()} for work on {rng.choice(skills)}"
+          for a in rng.sample(list(ACHIEVEMENT_PATTERNS), min(2, len(ACHIEVEMENT_PATTERNS)))),
+    ]
+    return "\n".join(lines)
+
+
+def write_txt(text: str, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def write_docx(text: str, path: str):
+    from docx import Document
+
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode("latin-1", "replace").decode("latin-1")
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(text: str, path: str, lines_per_page=50):
+    """Minimal text-only PDF (Helvetica, one text object per page)."""
+    lines = text.split("\n")
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page in pages:
+        body = "BT /F1 10 Tf 12 TL 50 790 Td " + " ".join(f"({_pdf_escape(l)}) '" for l in page) + " ET"
+        objects.append(f"<< /Length {len(body.encode('latin-1'))} >>\nstream\n{body}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+WRITERS = {"txt": write_txt, "docx": write_docx, "pdf": write_pdf}
+
+
+def build_corpus(directory: str, per_size=3, sizes=SIZES, formats=FORMATS, seed=0) -> list:
+    """Write ``per_size`` resumes per (size, format) under ``directory``.
+
+    Returns ``[(path, format, size)]``. The same seed always gives the same
+    corpus.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for size, experiences in sizes.items():
+        for i in range(per_size):
+            text = generate_resume(rng, experiences)
+            for fmt in formats:
+                path = os.path.join(directory, f"{size}-{i}.{fmt}")
+                WRITERS[fmt](text, path)
+                corpus.append((path, fmt, size))
+    return corpus
+
+
+# -- stub NER ---------------------------------------------------------------
+
+_STUB_LABELS = {"skills": "SKILL", "job_titles": "DESIGNATION", "companies": "COMPANY",
+                "education": "DEGREE", "projects": "PROJECT", "certifications": "CERTIFICATION",
+                "achievements": "ACHIEVEMENT"}
+
+
+class StubNER:
+    """Stands in for the token-classification pipeline: tags vocabulary
+    phrases, with the same call signature and output shape."""
+
+    tokenizer = None
+
+    def _tag(self, text):
+        from iextract import find_vocabulary
+
+        ents = []
+        for start, end, phrase, fields in find_vocabulary(text):
+            ents.append({"entity_group": _STUB_LABELS.get(fields[0], "SKILL"), "score": 0.99,
+                         "word": text[start:end], "start": start, "end": end})
+        return ents
+
+    def __call__(self, inputs, batch_size=None):
+        if isinstance(inputs, str):
+            return self._tag(inputs)
+        return [self._tag(t) for t in inputs]
+
+
+def use_stub_ner():
+    import iextract  # registers the real loader on import; replace it after
+    from model_registry import registry
+
+    registry.register("ner", StubNER)
+
+
+# -- measurement ------------------------------------------------------------
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def summarize(values) -> dict:
+    total = sum(values)
+    return {
+        "n": len(values),
+        "mean": round(statistics.fmean(values), 6),
+        "p50": round(_percentile(values, 50), 6),
+        "p95": round(_percentile(values, 95), 6),
+        "p99": round(_percentile(values, 99), 6),
+        "throughput_per_second": round(len(values) / total, 3) if total else 0.0,
+    }
+
+
+def run_benchmark(corpus, repeats=3, warmup=1, mode=None) -> dict:
+    """Time each stage on every corpus file ``repeats`` times."""
+    from cache import ResultCache
+    from generator import clear_stage_recommendation_cache, generate_career_path
+    from iextract import extract_entities, extraction_mode, normalize_entities, use_entity_cache, warm_up_ner
+    from resume_parser import extract_text
+
+    use_entity_cache(ResultCache(max_entries=0))
+    mode = extraction_mode(mode)
+    if mode != "rules":
+        warm_up_ner(background=False)
+    samples = {}
+
+    def record(stage, seconds):
+        samples.setdefault(stage, []).append(seconds)
+
+    for round_ in range(warmup + repeats):
+        for path, fmt, size in corpus:
+            timings = {}
+            started = time.perf_counter()
+            raw = extract_text(path)
+            timings["parse"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            ents = extract_entities(raw, mode=mode)
+            timings["extract_entities"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            summary = normalize_entities(ents)
+            timings["normalize_entities"] = time.perf_counter() - started
+
+            clear_stage_recommendation_cache()
+            started = time.perf_counter()
+            generate_career_path(dict(summary, user_preferences=PREFERENCES))
+            timings["generate_career_path"] = time.perf_counter() - started
+
+            if round_ < warmup:
+                continue
+            for stage, seconds in timings.items():
+                record(stage, seconds)
+            record(f"parse:{fmt}", timings["parse"])
+            record(f"end_to_end:{size}", sum(timings.values()))
+
+    return {stage: summarize(values) for stage, values in sorted(samples.items())}
+
+
+def compare(results: dict, baseline: dict, threshold=0.25, stage_thresholds=None, min_delta=0.001) -> list:
+    """Regressions of ``results`` against ``baseline``, as readable strings."""
+    stage_thresholds = stage_thresholds or {}
+    regressions = []
+    for stage, base in baseline.get("stages", {}).items():
+        current = results["stages"].get(stage)
+        if current is None:
+            continue
+        limit = stage_thresholds.get(stage, threshold)
+        for metric in COMPARED:
+            old, new = base[metric], current[metric]
+            if new > old * (1 + limit) and new - old > min_delta:
+                regressions.append(
+                    f"{stage} {metric}: {new * 1000:.2f} ms vs baseline {old * 1000:.2f} ms "
+                    f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%, limit {limit * 100:.0f}%)"
+                )
+    return regressions
+
+
+def _parse_stage_thresholds(items):
+    thresholds = {}
+    for item in items or ():
+        stage, _, value = item.partition("=")
+        if not value:
+            raise SystemExit(f"--stage-threshold expects STAGE=FRACTION, got {item!r}")
+        thresholds[stage] = float(value)
+    return thresholds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the IntelliPath pipeline on synthetic resumes.")
+    parser.add_argument("--per-size", type=int, default=3, help="Resumes per size and format")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--ner", choices=("stub", "model"), default="stub",
+                        help="stub: vocabulary tagger; model: INTELLIPATH_NER_MODEL")
+    parser.add_argument("--mode", choices=EXTRACTION_MODES, default=None,
+                        help="Extraction mode (default: INTELLIPATH_EXTRACTION_MODE)")
+    parser.add_argument("--corpus-dir", help="Keep the generated corpus here (default: temporary)")
+    parser.add_argument("--output", "-o", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Results JSON to compare against")
+    parser.add_argument("--save-baseline", help="Also write these results as a baseline file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--stage-threshold", action="append", metavar="STAGE=FRACTION",
+                        help="Per-stage override of --threshold (repeatable)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="Ignore slowdowns smaller than this many milliseconds")
+    args = parser.parse_args(argv)
+    stage_thresholds = _parse_stage_thresholds(args.stage_threshold)
+
+    if args.ner == "stub":
+        use_stub_ner()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.corpus_dir or tmp
+        os.makedirs(directory, exist_ok=True)
+        corpus = build_corpus(directory, args.per_size, formats=args.formats, seed=args.seed)
+        started = time.perf_counter()
+        stages = run_benchmark(corpus, args.repeats, mode=args.mode)
+        elapsed = time.perf_counter() - started
+
+    from iextract import extraction_mode, ner_signature
+    results = {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "knowledge_base": VERSION,
+            "ner": "stub" if args.ner == "stub" else ner_signature(),
+            "mode": extraction_mode(args.mode),
+            "seed": args.seed,
+            "files": len(corpus),
+            "repeats": args.repeats,
+            "elapsed_seconds": round(elapsed, 3),
+        },
+        "stages": stages,
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        meta = baseline.get("meta", {})
+        for field in ("ner", "mode"):
+            # Baselines from before --mode existed ran the hybrid path.
+            expected = meta.get(field, "hybrid" if field == "mode" else None)
+            if expected != results["meta"][field]:
+                print(f"warning: baseline {field} {expected!r} "
+                      f"differs from this run's {results['meta'][field]!r}", file=sys.stderr)
+        regressions = compare(results, baseline, args.threshold, stage_thresholds, args.min_delta_ms / 1000)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+        print("No stage regressed beyond its threshold.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
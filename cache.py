@@ -0,0 +1,159 @@
+# cache.py
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def content_key(data: bytes) -> str:
+    """SHA-256 hex digest of an uploaded file's bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def preferences_key(preferences) -> str:
+    """Stable digest of a preferences dict, independent of key order."""
+    payload = json.dumps(preferences or {}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-tier LRU cache with per-entry TTL.
+
+    The memory tier holds up to ``max_entries`` values. If ``db_path`` is
+    given, values are also written to a SQLite file (pickled) capped at
+    ``max_disk_entries``, so results survive restarts and are shared between
+    processes using the same file. ``ttl`` is in seconds; ``None`` means
+    entries never expire.
+    """
+
+    def __init__(self, max_entries=256, ttl=24 * 3600, db_path=None, max_disk_entries=10_000):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "sets": 0, "evictions": 0}
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expiry(self):
+        return time.time() + self.ttl if self.ttl is not None else None
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    blob, expires_at = row
+                    if expires_at is None or expires_at > now:
+                        self._db.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                        self._db.commit()
+                        value = pickle.loads(blob)
+                        self._remember(key, value, expires_at)
+                        self._stats["disk_hits"] += 1
+                        return value
+                    self._db.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._db.commit()
+            self._stats["misses"] += 1
+            return default
+
+    def _remember(self, key, value, expires_at):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def set(self, key, value):
+        expires_at = self._expiry()
+        with self._lock:
+            self._remember(key, value, expires_at)
+            self._stats["sets"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at, time.time()),
+                )
+                self._trim_disk()
+                self._db.commit()
+
+    def _trim_disk(self):
+        self._db.execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        (count,) = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()
+        excess = count - self.max_disk_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            info = dict(self._stats)
+            info["entries"] = len(self._memory)
+            if self._db is not None:
+                (info["disk_entries"],) = self._db.execute("SELECT COUNT(*) FROM cache").fetchone()
+        return info
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+# Shared by the UI and any other entry point in the process. Set
+# INTELLIPATH_CACHE_DB to a file path to enable the on-disk tier.
+RESULT_CACHE = ResultCache(
+    max_entries=_env_int("INTELLIPATH_CACHE_SIZE", 256),
+    ttl=_env_int("INTELLIPATH_CACHE_TTL", 24 * 3600) or None,
+    db_path=os.environ.get("INTELLIPATH_CACHE_DB") or None,
+)
+
+# NER output per token window (see iextract.chunk_key), so revised resumes
+# and shared boilerplate only send changed windows through the model.
+# INTELLIPATH_ENTITY_CACHE_SIZE=0 disables it; INTELLIPATH_ENTITY_CACHE_DB
+# adds an on-disk tier.
+ENTITY_CACHE = ResultCache(
+    max_entries=_env_int("INTELLIPATH_ENTITY_CACHE_SIZE", 4096),
+    ttl=_env_int("INTELLIPATH_ENTITY_CACHE_TTL", 7 * 24 * 3600) or None,
+    db_path=os.environ.get("INTELLIPATH_ENTITY_CACHE_DB") or None,
+)
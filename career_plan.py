@@ -0,0 +1,369 @@
+# career_plan.py
+"""The career plan as data, and its Markdown/text/HTML/JSON renderings.
+
+``generator.build_career_plan`` fills in a ``CareerPlan``; the ``render_*``
+functions turn it into a document. Each format's templates are bound once
+at import, output is assembled with ``"".join`` and the per-track tech
+stack sections, which never change, are rendered ahead of time.
+"""
+import html
+import json
+from dataclasses import asdict, dataclass
+
+from knowledge_base import SKILL_REQUIREMENTS
+
+
+@dataclass(frozen=True, slots=True)
+class ResumeOverview:
+    skills: tuple = ()
+    job_titles: tuple = ()
+    education: tuple = ()
+    projects: tuple = ()
+    certifications: tuple = ()
+    achievements: tuple = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Preferences:
+    # None means "not given", which renders differently from an empty value.
+    area_of_interest: str = None
+    timeline: str = None
+    future_goals: tuple = None
+    additional_goals: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class Track:
+    name: str
+    description: str
+
+
+@dataclass(frozen=True, slots=True)
+class GapAnalysis:
+    matching: tuple   # ((category, (skill, ...)), ...)
+    missing: tuple
+    gap_percentage: float
+    stack_track: str  # SKILL_REQUIREMENTS key whose tech stack applies
+
+
+@dataclass(frozen=True, slots=True)
+class Stage:
+    title: str
+    focus: str
+    recommendations: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class NextSteps:
+    immediate: tuple  # ((label, text), ...)
+    long_term: tuple
+
+
+@dataclass(frozen=True, slots=True)
+class CareerPlan:
+    overview: ResumeOverview
+    preferences: Preferences
+    track: Track
+    gaps: GapAnalysis
+    stages: tuple
+    next_steps: NextSteps
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["gaps"]["matching"] = {c: list(s) for c, s in self.gaps.matching}
+        data["gaps"]["missing"] = {c: list(s) for c, s in self.gaps.missing}
+        data["gaps"]["tech_stack"] = {
+            c: list(tools) for c, tools in SKILL_REQUIREMENTS[self.gaps.stack_track]["tech_stack"].items()
+        }
+        data["next_steps"]["immediate"] = [
+            {"label": label, "text": text} for label, text in self.next_steps.immediate
+        ]
+        return data
+
+
+FORMATS = ("md", "text", "html", "json")
+
+# Resume fields in the analysis summary: (field, label, items shown)
+_OVERVIEW_FIELDS = (
+    ("skills", "Skills Identified", 10),
+    ("job_titles", "Experience", 5),
+    ("education", "Education", 3),
+    ("projects", "Projects", 3),
+    ("certifications", "Certifications", 3),
+    ("achievements", "Achievements", 3),
+)
+
+_NO_MATCHING = "No specific skills from your resume match the required skills for this career track."
+_NO_MISSING = "Great! You have all the required skills for this career track."
+_DISCLAIMER = (
+    "This career path is tailored specifically to your resume, interests, and goals. "
+    "Consider your personal circumstances, work-life balance preferences, and market "
+    "conditions when following these recommendations."
+)
+
+
+def _preview(items, limit):
+    return ", ".join(items[:limit]) + ("..." if len(items) > limit else "")
+
+
+def _preference_fields(p: Preferences):
+    """(label, value) rows of the preferences section."""
+    goals = ("Not specified",) if p.future_goals is None else p.future_goals
+    rows = [
+        ("Area of Interest", "Not specified" if p.area_of_interest is None else p.area_of_interest),
+        ("Timeline", "Not specified" if p.timeline is None else p.timeline),
+        ("Future Goals", ", ".join(goals)),
+    ]
+    if p.additional_goals:
+        rows.append(("Additional Goals", p.additional_goals))
+    return rows
+
+
+def _alignment_fields(plan: CareerPlan):
+    p = plan.preferences
+    return (
+        ("Skills Analysis", f"{len(plan.overview.skills)} skills identified from your resume"),
+        ("Interest Alignment", f"{'General technology' if p.area_of_interest is None else p.area_of_interest} focus"),
+        ("Timeline Preference", p.timeline if p.timeline is not None else "Balanced approach"),
+        ("Future Aspirations", f"{len(p.future_goals or ())} specific goals identified"),
+        ("Skills Gap", f"{plan.gaps.gap_percentage}% of required skills need development"),
+    )
+
+
+# -- Markdown ---------------------------------------------------------------
+
+_MD_HEAD = "\n# 🎯 Personalized Career Path Recommendation\n\n## 📊 Resume Analysis Summary\n"
+_MD_FIELD = "- **{}:** {}\n".format
+_MD_TRACK = "\n## 🚀 Recommended Career Track: {}\n{}\n\n## ⚙️ Your Preferences\n".format
+_MD_GAP = (
+    "\n---\n\n## 🔍 Skills Analysis & Tech Stack\n\n### 📈 Skills Gap Analysis\n"
+    "**Current Skills Gap:** {}% of required skills are missing\n\n### ✅ Skills You Already Have\n"
+).format
+_MD_CATEGORY = "\n**{}:**\n".format
+_MD_ITEM = "- {} {}\n".format
+_MD_BULLET = "- {}\n".format
+_MD_NOTE = "\n*{}*\n".format
+_MD_SECTION = "\n\n### {}\n".format
+_MD_STAGES = "\n\n---\n\n## 📈 3-Stage Career Development Plan"
+_MD_STAGE = "\n\n### {}\n**Focus:** {}\n\n".format
+_MD_NUMBERED = "{}. {}\n".format
+_MD_NEXT = "\n\n---\n\n## 💡 Personalized Recommendations\n\n### Immediate Next Steps (Next 3-6 months):\n\n"
+_MD_STEP = "{}. **{}:** {}\n".format
+_MD_LONG_TERM = "\n\n### Long-term Strategy (1-3 years):\n"
+_MD_ALIGNMENT = "\n---\n\n## 🎯 Goal Alignment\n\nYour career path has been customized based on:\n"
+_MD_TAIL = f"\n---\n\n*{_DISCLAIMER}*\n"
+
+
+def _md_categories(groups, marker, empty):
+    if not groups:
+        return _MD_NOTE(empty)
+    return "".join(
+        _MD_CATEGORY(category) + "".join(_MD_ITEM(marker, item) for item in items)
+        for category, items in groups
+    )
+
+
+_MD_TECH_STACK = {
+    track: _md_categories(tuple(req["tech_stack"].items()), "🛠️", "")
+    for track, req in SKILL_REQUIREMENTS.items()
+}
+
+
+def iter_markdown(plan: CareerPlan):
+    """Yield the Markdown plan section by section, each rendered as it is
+    reached (for streaming responses)."""
+    o, g = plan.overview, plan.gaps
+    yield _MD_HEAD + "".join(
+        _MD_FIELD(label, _preview(getattr(o, field), n)) for field, label, n in _OVERVIEW_FIELDS
+    )
+    yield _MD_TRACK(plan.track.name, plan.track.description) + "".join(
+        _MD_FIELD(label, value) for label, value in _preference_fields(plan.preferences)
+    )
+    yield "".join((
+        _MD_GAP(g.gap_percentage),
+        _md_categories(g.matching, "✅", _NO_MATCHING),
+        _MD_SECTION("❌ Critical Missing Skills"),
+        _md_categories(g.missing, "❌", _NO_MISSING),
+        _MD_SECTION("🛠️ Recommended Tech Stack"),
+        _MD_TECH_STACK[g.stack_track],
+    ))
+    parts = [_MD_STAGES]
+    for stage in plan.stages:
+        parts.append(_MD_STAGE(stage.title, stage.focus))
+        parts.extend(_MD_NUMBERED(i, rec) for i, rec in enumerate(stage.recommendations, 1))
+    yield "".join(parts)
+    parts = [_MD_NEXT]
+    parts.extend(_MD_STEP(i, label, text) for i, (label, text) in enumerate(plan.next_steps.immediate, 1))
+    parts.append(_MD_LONG_TERM)
+    parts.extend(_MD_BULLET(item) for item in plan.next_steps.long_term)
+    yield "".join(parts)
+    yield _MD_ALIGNMENT + "".join(_MD_FIELD(label, value) for label, value in _alignment_fields(plan)) + _MD_TAIL
+
+
+def render_markdown(plan: CareerPlan) -> str:
+    return "".join(iter_markdown(plan))
+
+
+# -- Plain text -------------------------------------------------------------
+
+_TXT_TITLE = "{0}\n{1}\n".format
+_TXT_HEADING = "\n{0}\n{1}\n".format
+_TXT_FIELD = "  {}: {}\n".format
+_TXT_CATEGORY = "  {}:\n".format
+_TXT_ITEM = "    - {}\n".format
+_TXT_BULLET = "  - {}\n".format
+_TXT_NUMBERED = "  {}. {}\n".format
+_TXT_STEP = "  {}. {}: {}\n".format
+
+
+def _txt_heading(title, rule="-"):
+    return _TXT_HEADING(title, rule * len(title))
+
+
+def _txt_categories(groups, empty):
+    if not groups:
+        return f"  {empty}\n"
+    return "".join(
+        _TXT_CATEGORY(category) + "".join(_TXT_ITEM(item) for item in items)
+        for category, items in groups
+    )
+
+
+_TXT_TECH_STACK = {
+    track: _txt_categories(tuple(req["tech_stack"].items()), "")
+    for track, req in SKILL_REQUIREMENTS.items()
+}
+
+
+def render_text(plan: CareerPlan) -> str:
+    o, g = plan.overview, plan.gaps
+    title = "PERSONALIZED CAREER PATH RECOMMENDATION"
+    parts = [_TXT_TITLE(title, "=" * len(title)), _txt_heading("Resume Analysis Summary")]
+    parts.extend(_TXT_FIELD(label, _preview(getattr(o, field), n)) for field, label, n in _OVERVIEW_FIELDS)
+    parts.append(_txt_heading(f"Recommended Career Track: {plan.track.name}"))
+    parts.append(f"  {plan.track.description}\n")
+    parts.append(_txt_heading("Your Preferences"))
+    parts.extend(_TXT_FIELD(label, value) for label, value in _preference_fields(plan.preferences))
+    parts.append(_txt_heading("Skills Gap Analysis"))
+    parts.append(f"  Current skills gap: {g.gap_percentage}% of required skills are missing\n")
+    parts.append(_txt_heading("Skills You Already Have"))
+    parts.append(_txt_categories(g.matching, _NO_MATCHING))
+    parts.append(_txt_heading("Critical Missing Skills"))
+    parts.append(_txt_categories(g.missing, _NO_MISSING))
+    parts.append(_txt_heading("Recommended Tech Stack"))
+    parts.append(_TXT_TECH_STACK[g.stack_track])
+    for stage in plan.stages:
+        parts.append(_txt_heading(stage.title))
+        parts.append(f"  Focus: {stage.focus}\n")
+        parts.extend(_TXT_NUMBERED(i, rec) for i, rec in enumerate(stage.recommendations, 1))
+    parts.append(_txt_heading("Immediate Next Steps (Next 3-6 months)"))
+    parts.extend(_TXT_STEP(i, label, text) for i, (label, text) in enumerate(plan.next_steps.immediate, 1))
+    parts.append(_txt_heading("Long-term Strategy (1-3 years)"))
+    parts.extend(_TXT_BULLET(item) for item in plan.next_steps.long_term)
+    parts.append(_txt_heading("Goal Alignment"))
+    parts.extend(_TXT_FIELD(label, value) for label, value in _alignment_fields(plan))
+    parts.append(f"\n{_DISCLAIMER}\n")
+    return "".join(parts)
+
+
+# -- HTML -------------------------------------------------------------------
+
+_esc = html.escape
+_HTML_HEAD = (
+    '<article class="career-plan">\n'
+    "<h1>🎯 Personalized Career Path Recommendation</h1>\n"
+    "<h2>📊 Resume Analysis Summary</h2>\n"
+)
+_HTML_HEADING = "<h{0}>{1}</h{0}>\n".format
+_HTML_FIELD = "<li><strong>{}:</strong> {}</li>\n".format
+_HTML_LI = "<li>{}</li>\n".format
+_HTML_STEP = "<li><strong>{}:</strong> {}</li>\n".format
+_HTML_CATEGORY = "<h4>{}</h4>\n<ul>\n{}</ul>\n".format
+_HTML_NOTE = "<p><em>{}</em></p>\n".format
+_HTML_TAIL = f"<hr>\n<p><em>{_esc(_DISCLAIMER)}</em></p>\n</article>\n"
+
+
+def _html_list(items, tag="ul"):
+    return f"<{tag}>\n{''.join(items)}</{tag}>\n"
+
+
+def _html_fields(rows):
+    return _html_list(_HTML_FIELD(_esc(label), _esc(value)) for label, value in rows)
+
+
+def _html_categories(groups, empty):
+    if not groups:
+        return _HTML_NOTE(_esc(empty))
+    return "".join(
+        _HTML_CATEGORY(_esc(category), "".join(_HTML_LI(_esc(item)) for item in items))
+        for category, items in groups
+    )
+
+
+_HTML_TECH_STACK = {
+    track: _html_categories(tuple(req["tech_stack"].items()), "")
+    for track, req in SKILL_REQUIREMENTS.items()
+}
+
+
+def render_html(plan: CareerPlan) -> str:
+    o, g = plan.overview, plan.gaps
+    parts = [_HTML_HEAD]
+    parts.append(_html_fields(
+        (label, _preview(getattr(o, field), n)) for field, label, n in _OVERVIEW_FIELDS
+    ))
+    parts.append(_HTML_HEADING(2, f"🚀 Recommended Career Track: {_esc(plan.track.name)}"))
+    parts.append(f"<p>{_esc(plan.track.description)}</p>\n")
+    parts.append(_HTML_HEADING(2, "⚙️ Your Preferences"))
+    parts.append(_html_fields(_preference_fields(plan.preferences)))
+    parts.append("<hr>\n")
+    parts.append(_HTML_HEADING(2, "🔍 Skills Analysis &amp; Tech Stack"))
+    parts.append(_HTML_HEADING(3, "📈 Skills Gap Analysis"))
+    parts.append(f"<p><strong>Current Skills Gap:</strong> {g.gap_percentage}% of required skills are missing</p>\n")
+    parts.append(_HTML_HEADING(3, "✅ Skills You Already Have"))
+    parts.append(_html_categories(g.matching, _NO_MATCHING))
+    parts.append(_HTML_HEADING(3, "❌ Critical Missing Skills"))
+    parts.append(_html_categories(g.missing, _NO_MISSING))
+    parts.append(_HTML_HEADING(3, "🛠️ Recommended Tech Stack"))
+    parts.append(_HTML_TECH_STACK[g.stack_track])
+    parts.append("<hr>\n")
+    parts.append(_HTML_HEADING(2, "📈 3-Stage Career Development Plan"))
+    for stage in plan.stages:
+        parts.append(_HTML_HEADING(3, _esc(stage.title)))
+        parts.append(f"<p><strong>Focus:</strong> {_esc(stage.focus)}</p>\n")
+        parts.append(_html_list((_HTML_LI(_esc(rec)) for rec in stage.recommendations), "ol"))
+    parts.append("<hr>\n")
+    parts.append(_HTML_HEADING(2, "💡 Personalized Recommendations"))
+    parts.append(_HTML_HEADING(3, "Immediate Next Steps (Next 3-6 months):"))
+    parts.append(_html_list(
+        (_HTML_STEP(_esc(label), _esc(text)) for label, text in plan.next_steps.immediate), "ol"
+    ))
+    parts.append(_HTML_HEADING(3, "Long-term Strategy (1-3 years):"))
+    parts.append(_html_list(_HTML_LI(_esc(item)) for item in plan.next_steps.long_term))
+    parts.append("<hr>\n")
+    parts.append(_HTML_HEADING(2, "🎯 Goal Alignment"))
+    parts.append("<p>Your career path has been customized based on:</p>\n")
+    parts.append(_html_fields(_alignment_fields(plan)))
+    parts.append(_HTML_TAIL)
+    return "".join(parts)
+
+
+# -- JSON -------------------------------------------------------------------
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+def render_json(plan: CareerPlan) -> str:
+    return _JSON_ENCODER.encode(plan.to_dict())
+
+
+_RENDERERS = {"md": render_markdown, "text": render_text, "html": render_html, "json": render_json}
+
+
+def render(plan: CareerPlan, fmt="md") -> str:
+    """``plan`` as ``"md"``, ``"text"``, ``"html"`` or ``"json"``."""
+    try:
+        renderer = _RENDERERS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown plan format {fmt!r}; expected one of {', '.join(FORMATS)}")
+    return renderer(plan)
@@ -1,62 +1,61 @@
 # generator.py
-import re
-
-
-def analyze_skills_for_career_track(skills, user_preferences=None):
-    """Analyze skills to determine the most suitable career track, considering user preferences."""
-    skills_lower = [skill.lower() for skill in skills]
-    
-    # Define career tracks and their associated skills
-    career_tracks = {
-        "Software Development": {
-            "keywords": ["python", "java", "javascript", "c++", "c#", "react", "angular", "vue", "node.js", "django", "flask", "spring", "git", "docker", "kubernetes", "aws", "azure", "sql", "mongodb", "redis", "api", "rest", "graphql", "microservices", "agile", "scrum"],
-            "description": "Software Development focuses on creating applications, websites, and software solutions."
-        },
-        "Data Science & Analytics": {
-            "keywords": ["python", "r", "sql", "pandas", "numpy", "matplotlib", "seaborn", "scikit-learn", "tensorflow", "pytorch", "keras", "jupyter", "tableau", "powerbi", "excel", "statistics", "machine learning", "deep learning", "data visualization", "etl", "hadoop", "spark"],
-            "description": "Data Science involves analyzing data to extract insights and build predictive models."
-        },
-        "DevOps & Cloud": {
-            "keywords": ["docker", "kubernetes", "jenkins", "gitlab", "github", "aws", "azure", "gcp", "terraform", "ansible", "linux", "bash", "python", "shell", "ci/cd", "monitoring", "logging", "prometheus", "grafana", "nginx", "apache"],
-            "description": "DevOps focuses on automation, infrastructure management, and cloud services."
-        },
-        "Cybersecurity": {
-            "keywords": ["security", "penetration testing", "ethical hacking", "network security", "firewall", "vulnerability assessment", "siem", "wireshark", "nmap", "metasploit", "kali linux", "compliance", "gdpr", "iso 27001", "nist", "cryptography"],
-            "description": "Cybersecurity involves protecting systems, networks, and data from digital attacks."
-        },
-        "Product Management": {
-            "keywords": ["product management", "agile", "scrum", "kanban", "jira", "confluence", "user stories", "roadmap", "market research", "competitive analysis", "stakeholder management", "project management", "prd", "mrr", "user experience", "ux"],
-            "description": "Product Management focuses on developing and managing products that meet user needs."
-        },
-        "UI/UX Design": {
-            "keywords": ["figma", "adobe xd", "sketch", "invision", "user experience", "user interface", "wireframing", "prototyping", "user research", "usability testing", "design systems", "responsive design", "accessibility", "photoshop", "illustrator"],
-            "description": "UI/UX Design focuses on creating user-friendly and visually appealing interfaces."
-        },
-        "Artificial Intelligence & Machine Learning": {
-            "keywords": ["python", "tensorflow", "pytorch", "keras", "scikit-learn", "deep learning", "machine learning", "neural networks", "nlp", "computer vision", "reinforcement learning", "data science", "statistics", "mathematics", "algorithms"],
-            "description": "AI/ML focuses on developing intelligent systems and algorithms that can learn and make decisions."
-        },
-        "Mobile Development": {
-            "keywords": ["swift", "kotlin", "java", "react native", "flutter", "xamarin", "ios", "android", "mobile app", "app development", "mobile ui", "mobile testing", "app store", "google play"],
-            "description": "Mobile Development focuses on creating applications for smartphones and tablets."
-        },
-        "Web Development": {
-            "keywords": ["html", "css", "javascript", "react", "angular", "vue", "node.js", "php", "python", "django", "flask", "wordpress", "web design", "frontend", "backend", "full stack"],
-            "description": "Web Development focuses on creating websites and web applications."
-        },
-        "Game Development": {
-            "keywords": ["unity", "unreal engine", "c++", "c#", "game design", "3d modeling", "animation", "game physics", "game engine", "opengl", "directx", "game programming"],
-            "description": "Game Development focuses on creating interactive games and entertainment software."
-        },
-        "Blockchain & Web3": {
-            "keywords": ["blockchain", "ethereum", "bitcoin", "solidity", "smart contracts", "web3", "defi", "nft", "cryptocurrency", "distributed systems", "cryptography"],
-            "description": "Blockchain & Web3 focuses on decentralized applications and cryptocurrency technologies."
-        },
-        "Business Consulting": {
-            "keywords": ["business", "consulting", "strategy", "management", "analysis", "excel", "powerpoint", "presentation", "client", "stakeholder", "project management", "business process", "optimization", "change management", "financial analysis", "market research", "competitive analysis", "business development", "operations", "strategy consulting", "management consulting", "advisory", "business intelligence", "data analysis", "process improvement"],
-            "description": "Business Consulting focuses on helping organizations improve performance, solve problems, and achieve strategic objectives through expert advice and analysis."
-        }
-    }
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from career_plan import (
+    CareerPlan,
+    GapAnalysis,
+    NextSteps,
+    Preferences,
+    ResumeOverview,
+    Stage,
+    Track,
+    render,
+)
+from knowledge_base import (
+    CAREER_TRACKS,
+    DEFAULT_TRACK,
+    KEYWORD_TO_TRACKS,
+    SKILL_CATEGORIES,
+    SKILL_REQUIREMENTS,
+    SKILL_STAGE_ROLE,
+    TRACK_SKILLS_LOWER,
+)
+from matcher import NgramIndex
+from metrics import timed
+from skill_gap import SKILL_GAP_ENGINE
+
+
+# Every career track keyword, indexed by its tokens so a skill finds the
+# keywords it overlaps with without scanning every track.
+_TRACK_KEYWORD_INDEX = NgramIndex((keyword, keyword) for keyword in KEYWORD_TO_TRACKS)
+
+
+def rank_career_tracks(skills):
+    """Score every career track against ``skills``, best first.
+
+    A track earns a point for each (skill, keyword) pair where one is a
+    whole-token run inside the other ("python" and "python scripting").
+    Returns ``[(track, score), ...]``; ties keep the knowledge base order.
+    """
+    scores = dict.fromkeys(CAREER_TRACKS, 0)
+    for skill in skills:
+        for keyword in _TRACK_KEYWORD_INDEX.match(skill):
+            for track in KEYWORD_TO_TRACKS[keyword]:
+                scores[track] += 1
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def analyze_skills_for_career_track(skills, user_preferences=None, ranking=None):
+    """Analyze skills to determine the most suitable career track, considering user preferences.
+
+    ``ranking`` (from ``rank_career_tracks(skills)``) may be passed in when
+    the same skills are matched against several preferences.
+    """
+    career_tracks = CAREER_TRACKS
+    if ranking is None:
+        ranking = rank_career_tracks(skills)
     
     # If user has specified an area of interest, prioritize it
     if user_preferences and user_preferences.get("area_of_interest"):
@@ -97,376 +96,53 @@ def analyze_skills_for_career_track(skills, user_preferences=None):
             return "Software Development", career_tracks["Software Development"]["description"]
         
         # If no direct match found, find the closest match based on skills
-        best_match = None
-        best_score = 0
-        for track, info in career_tracks.items():
-            score = 0
-            for keyword in info["keywords"]:
-                for skill in skills_lower:
-                    if keyword in skill or skill in keyword:
-                        score += 1
-            if score > best_score:
-                best_score = score
-                best_match = track
-        
-        if best_match:
+        best_match, best_score = ranking[0]
+        if best_score > 0:
             return best_match, f"{career_tracks[best_match]['description']} (Closest match to your interest in {user_preferences['area_of_interest']})"
     
-    # Calculate scores for each career track
-    scores = {}
-    for track, info in career_tracks.items():
-        score = 0
-        for keyword in info["keywords"]:
-            for skill in skills_lower:
-                if keyword in skill or skill in keyword:
-                    score += 1
-        scores[track] = score
-    
     # Return the track with the highest score, or a default
-    if max(scores.values()) > 0:
-        best_track = max(scores, key=scores.get)
+    best_track, best_score = ranking[0]
+    if best_score > 0:
         return best_track, career_tracks[best_track]["description"]
     else:
         return "General Technology", "A broad technology career path suitable for various roles."
 
 
-def analyze_skills_and_tech_stack(career_track, current_skills):
-    """Analyze required skills, missing skills, and tech stack for a career track."""
-    
-    # Define comprehensive skill requirements and tech stacks for each career track
-    skill_requirements = {
-        "Software Development": {
-            "core_skills": {
-                "Programming Languages": ["Python", "JavaScript", "Java", "C++", "C#", "Go", "Rust"],
-                "Web Technologies": ["HTML", "CSS", "React", "Angular", "Vue.js", "Node.js"],
-                "Backend Frameworks": ["Django", "Flask", "Spring Boot", "Express.js", "FastAPI"],
-                "Databases": ["SQL", "MongoDB", "PostgreSQL", "Redis", "MySQL"],
-                "Version Control": ["Git", "GitHub", "GitLab"],
-                "Cloud Platforms": ["AWS", "Azure", "Google Cloud", "Heroku"],
-                "DevOps Tools": ["Docker", "Kubernetes", "Jenkins", "CI/CD"],
-                "Testing": ["JUnit", "PyTest", "Jest", "Selenium"],
-                "Architecture": ["Microservices", "REST APIs", "GraphQL", "System Design"]
-            },
-            "tech_stack": {
-                "Frontend": ["React", "Angular", "Vue.js", "TypeScript", "Redux", "Next.js"],
-                "Backend": ["Node.js", "Python", "Java", "Spring Boot", "Django", "FastAPI"],
-                "Database": ["PostgreSQL", "MongoDB", "Redis", "MySQL", "Elasticsearch"],
-                "Cloud": ["AWS", "Azure", "Google Cloud", "Docker", "Kubernetes"],
-                "Tools": ["Git", "Jenkins", "Jira", "Postman", "VS Code"]
-            }
-        },
-        "UI/UX Design": {
-            "core_skills": {
-                "Design Tools": ["Figma", "Adobe XD", "Sketch", "InVision", "Adobe Photoshop", "Adobe Illustrator"],
-                "Prototyping": ["Wireframing", "Prototyping", "User Flows", "Information Architecture"],
-                "User Research": ["User Interviews", "Usability Testing", "User Personas", "User Journey Mapping"],
-                "Design Principles": ["Visual Design", "Typography", "Color Theory", "Layout Design"],
-                "Design Systems": ["Component Libraries", "Design Tokens", "Style Guides", "Brand Guidelines"],
-                "Accessibility": ["WCAG Guidelines", "Accessibility Testing", "Inclusive Design"],
-                "Collaboration": ["Stakeholder Management", "Design Presentations", "Feedback Integration"],
-                "Analytics": ["User Analytics", "A/B Testing", "Heatmaps", "Conversion Optimization"]
-            },
-            "tech_stack": {
-                "Design Tools": ["Figma", "Adobe XD", "Sketch", "InVision", "Adobe Creative Suite"],
-                "Prototyping": ["Framer", "Principle", "Protopie", "Axure RP"],
-                "Research": ["UserTesting", "Hotjar", "FullStory", "Google Analytics"],
-                "Collaboration": ["Slack", "Microsoft Teams", "Zoom", "Miro", "Notion"],
-                "Development": ["HTML", "CSS", "JavaScript", "React", "Vue.js"]
-            }
-        },
-        "Data Science & Analytics": {
-            "core_skills": {
-                "Programming": ["Python", "R", "SQL", "Scala", "Julia"],
-                "Data Manipulation": ["Pandas", "NumPy", "dplyr", "DataFrames"],
-                "Visualization": ["Matplotlib", "Seaborn", "Plotly", "Tableau", "Power BI"],
-                "Machine Learning": ["Scikit-learn", "TensorFlow", "PyTorch", "Keras"],
-                "Big Data": ["Hadoop", "Spark", "Hive", "Kafka"],
-                "Statistics": ["Statistical Analysis", "Hypothesis Testing", "A/B Testing"],
-                "Databases": ["SQL", "NoSQL", "Data Warehousing", "ETL"],
-                "Tools": ["Jupyter", "RStudio", "Apache Airflow", "MLflow"]
-            },
-            "tech_stack": {
-                "Languages": ["Python", "R", "SQL", "Scala"],
-                "Libraries": ["Pandas", "NumPy", "Scikit-learn", "TensorFlow", "PyTorch"],
-                "Visualization": ["Tableau", "Power BI", "Matplotlib", "Seaborn"],
-                "Big Data": ["Apache Spark", "Hadoop", "Kafka", "Airflow"],
-                "Cloud": ["AWS SageMaker", "Azure ML", "Google AI Platform", "Databricks"]
-            }
-        },
-        "DevOps & Cloud": {
-            "core_skills": {
-                "Cloud Platforms": ["AWS", "Azure", "Google Cloud", "DigitalOcean"],
-                "Containerization": ["Docker", "Kubernetes", "Rancher", "OpenShift"],
-                "CI/CD": ["Jenkins", "GitLab CI", "GitHub Actions", "CircleCI"],
-                "Infrastructure as Code": ["Terraform", "CloudFormation", "Ansible", "Chef"],
-                "Monitoring": ["Prometheus", "Grafana", "ELK Stack", "Datadog"],
-                "Operating Systems": ["Linux", "Windows Server", "Shell Scripting"],
-                "Networking": ["TCP/IP", "DNS", "Load Balancing", "VPN"],
-                "Security": ["IAM", "Security Groups", "Compliance", "Vulnerability Management"]
-            },
-            "tech_stack": {
-                "Cloud": ["AWS", "Azure", "Google Cloud", "Terraform", "Ansible"],
-                "Containers": ["Docker", "Kubernetes", "Helm", "Istio"],
-                "CI/CD": ["Jenkins", "GitLab", "GitHub Actions", "ArgoCD"],
-                "Monitoring": ["Prometheus", "Grafana", "ELK Stack", "Datadog"],
-                "Security": ["Vault", "Secrets Manager", "WAF", "Security Hub"]
-            }
-        },
-        "Cybersecurity": {
-            "core_skills": {
-                "Security Tools": ["Wireshark", "Nmap", "Metasploit", "Burp Suite", "Kali Linux"],
-                "Network Security": ["Firewalls", "IDS/IPS", "VPN", "Network Monitoring"],
-                "Application Security": ["OWASP", "Penetration Testing", "Code Review", "SAST/DAST"],
-                "Incident Response": ["SIEM", "Forensics", "Threat Hunting", "Malware Analysis"],
-                "Compliance": ["GDPR", "ISO 27001", "NIST", "SOC 2"],
-                "Cryptography": ["Encryption", "Hashing", "Digital Signatures", "PKI"],
-                "Operating Systems": ["Linux", "Windows", "macOS Security"],
-                "Programming": ["Python", "Bash", "PowerShell", "C/C++"]
-            },
-            "tech_stack": {
-                "Security Tools": ["Kali Linux", "Metasploit", "Nmap", "Wireshark"],
-                "SIEM": ["Splunk", "QRadar", "ELK Stack", "Microsoft Sentinel"],
-                "Vulnerability Management": ["Nessus", "Qualys", "OpenVAS", "Nexpose"],
-                "Forensics": ["Autopsy", "Volatility", "FTK", "EnCase"],
-                "Cloud Security": ["AWS Security Hub", "Azure Security Center", "Prisma Cloud"]
-            }
-        },
-        "Product Management": {
-            "core_skills": {
-                "Product Strategy": ["Product Vision", "Roadmapping", "Market Analysis", "Competitive Analysis"],
-                "User Research": ["User Interviews", "Surveys", "Usability Testing", "Analytics"],
-                "Agile Methodologies": ["Scrum", "Kanban", "Sprint Planning", "User Stories"],
-                "Data Analysis": ["SQL", "Google Analytics", "A/B Testing", "Metrics"],
-                "Communication": ["Stakeholder Management", "Presentation Skills", "Documentation"],
-                "Business Acumen": ["Business Models", "Pricing Strategy", "Go-to-Market", "ROI Analysis"],
-                "Tools": ["Jira", "Confluence", "Figma", "Mixpanel", "Amplitude"]
-            },
-            "tech_stack": {
-                "Product Management": ["Jira", "Confluence", "Aha!", "Productboard"],
-                "Analytics": ["Google Analytics", "Mixpanel", "Amplitude", "Tableau"],
-                "Design": ["Figma", "Sketch", "InVision", "Adobe XD"],
-                "Communication": ["Slack", "Microsoft Teams", "Zoom", "Loom"],
-                "Research": ["SurveyMonkey", "UserTesting", "Hotjar", "FullStory"]
-            }
-        },
-        "Business Consulting": {
-            "core_skills": {
-                "Analytical Tools": ["Excel", "PowerPoint", "Tableau", "Power BI", "SQL"],
-                "Business Analysis": ["Business Process Analysis", "Financial Analysis", "Market Research"],
-                "Strategy": ["Strategic Planning", "Competitive Analysis", "Business Model Design"],
-                "Project Management": ["Agile", "Scrum", "Kanban", "Project Planning"],
-                "Communication": ["Presentation Skills", "Client Management", "Stakeholder Management"],
-                "Methodologies": ["Lean Six Sigma", "Change Management", "Process Improvement"],
-                "Industry Knowledge": ["Operations Management", "Financial Management", "Marketing"],
-                "Tools": ["Microsoft Office", "Visio", "Jira", "Confluence", "Miro"]
-            },
-            "tech_stack": {
-                "Analytics": ["Excel", "Power BI", "Tableau", "SQL", "Python"],
-                "Presentation": ["PowerPoint", "Prezi", "Canva", "Adobe Creative Suite"],
-                "Project Management": ["Jira", "Confluence", "Monday.com", "Asana"],
-                "Collaboration": ["Slack", "Microsoft Teams", "Zoom", "Miro"],
-                "CRM": ["Salesforce", "HubSpot", "Microsoft Dynamics"]
-            }
-        },
-        "Artificial Intelligence & Machine Learning": {
-            "core_skills": {
-                "Programming": ["Python", "R", "Julia", "C++", "Java"],
-                "Machine Learning": ["Scikit-learn", "TensorFlow", "PyTorch", "Keras", "XGBoost"],
-                "Deep Learning": ["Neural Networks", "CNN", "RNN", "LSTM", "Transformers"],
-                "Data Processing": ["Pandas", "NumPy", "Scipy", "DataFrames", "ETL"],
-                "Mathematics": ["Linear Algebra", "Calculus", "Statistics", "Probability"],
-                "Specializations": ["NLP", "Computer Vision", "Reinforcement Learning", "Time Series"],
-                "Tools": ["Jupyter", "Google Colab", "MLflow", "Weights & Biases"],
-                "Deployment": ["Docker", "Kubernetes", "AWS SageMaker", "Azure ML"]
-            },
-            "tech_stack": {
-                "Languages": ["Python", "R", "Julia", "C++"],
-                "Frameworks": ["TensorFlow", "PyTorch", "Scikit-learn", "Keras"],
-                "Cloud": ["AWS SageMaker", "Azure ML", "Google AI Platform", "Databricks"],
-                "Tools": ["Jupyter", "MLflow", "Weights & Biases", "DVC"],
-                "Deployment": ["Docker", "Kubernetes", "Flask", "FastAPI"]
-            }
-        },
-        "Mobile Development": {
-            "core_skills": {
-                "Platforms": ["iOS", "Android", "Cross-platform"],
-                "Languages": ["Swift", "Kotlin", "Java", "Dart", "JavaScript"],
-                "Frameworks": ["React Native", "Flutter", "Xamarin", "Ionic"],
-                "Development": ["Mobile UI", "App Lifecycle", "State Management", "Navigation"],
-                "Testing": ["Unit Testing", "UI Testing", "Integration Testing"],
-                "Deployment": ["App Store", "Google Play", "CI/CD", "Code Signing"],
-                "Performance": ["Memory Management", "Battery Optimization", "Network Optimization"],
-                "Tools": ["Xcode", "Android Studio", "VS Code", "Firebase"]
-            },
-            "tech_stack": {
-                "Native": ["Swift", "Kotlin", "Xcode", "Android Studio"],
-                "Cross-platform": ["React Native", "Flutter", "Xamarin"],
-                "Backend": ["Firebase", "AWS Amplify", "Parse Server"],
-                "Testing": ["Jest", "Detox", "Espresso", "XCUITest"],
-                "Deployment": ["Fastlane", "App Center", "CodePush"]
-            }
-        },
-        "Web Development": {
-            "core_skills": {
-                "Frontend": ["HTML", "CSS", "JavaScript", "TypeScript"],
-                "Frameworks": ["React", "Angular", "Vue.js", "Next.js", "Nuxt.js"],
-                "Backend": ["Node.js", "Python", "PHP", "Java", "C#"],
-                "Databases": ["MySQL", "PostgreSQL", "MongoDB", "Redis"],
-                "APIs": ["REST", "GraphQL", "SOAP", "Microservices"],
-                "Performance": ["SEO", "Web Performance", "Caching", "CDN"],
-                "Security": ["Web Security", "HTTPS", "Authentication", "Authorization"],
-                "Tools": ["Git", "VS Code", "Chrome DevTools", "Postman"]
-            },
-            "tech_stack": {
-                "Frontend": ["React", "Angular", "Vue.js", "TypeScript", "Tailwind CSS"],
-                "Backend": ["Node.js", "Express", "Django", "Flask", "Laravel"],
-                "Database": ["PostgreSQL", "MongoDB", "Redis", "MySQL"],
-                "Cloud": ["AWS", "Vercel", "Netlify", "Heroku"],
-                "Tools": ["Git", "Docker", "Jenkins", "VS Code"]
-            }
-        },
-        "Game Development": {
-            "core_skills": {
-                "Engines": ["Unity", "Unreal Engine", "Godot", "CryEngine"],
-                "Programming": ["C#", "C++", "Python", "Lua", "JavaScript"],
-                "Game Design": ["Game Mechanics", "Level Design", "Game Balance", "Narrative"],
-                "Graphics": ["3D Modeling", "Animation", "Texturing", "Rendering"],
-                "Audio": ["Sound Design", "Music Integration", "Audio Programming"],
-                "Physics": ["Game Physics", "Collision Detection", "Particle Systems"],
-                "Networking": ["Multiplayer", "Networking", "Server Architecture"],
-                "Tools": ["Blender", "Maya", "Photoshop", "Audacity"]
-            },
-            "tech_stack": {
-                "Engines": ["Unity", "Unreal Engine", "Godot"],
-                "Languages": ["C#", "C++", "Python", "Lua"],
-                "Graphics": ["Blender", "Maya", "3ds Max", "Substance Painter"],
-                "Audio": ["FMOD", "Wwise", "Audacity"],
-                "Platforms": ["PC", "Mobile", "Console", "VR/AR"]
-            }
-        },
-        "Blockchain & Web3": {
-            "core_skills": {
-                "Blockchain": ["Ethereum", "Bitcoin", "Smart Contracts", "Solidity"],
-                "Programming": ["Solidity", "Rust", "JavaScript", "Python", "Go"],
-                "DeFi": ["DeFi Protocols", "Yield Farming", "Liquidity Pools", "DEX"],
-                "NFTs": ["NFT Standards", "ERC-721", "ERC-1155", "Marketplaces"],
-                "Web3": ["Web3.js", "Ethers.js", "MetaMask", "Wallet Integration"],
-                "Security": ["Cryptography", "Auditing", "Penetration Testing"],
-                "Networks": ["Layer 2", "Polygon", "Solana", "Polkadot"],
-                "Tools": ["Hardhat", "Truffle", "Remix", "Ganache"]
-            },
-            "tech_stack": {
-                "Blockchain": ["Ethereum", "Bitcoin", "Polygon", "Solana"],
-                "Development": ["Solidity", "Rust", "Hardhat", "Truffle"],
-                "Frontend": ["React", "Web3.js", "Ethers.js", "MetaMask"],
-                "Tools": ["Remix", "Ganache", "Infura", "Alchemy"],
-                "DeFi": ["Uniswap", "Compound", "Aave", "Curve"]
-            }
-        },
-        "DevOps & Cloud": {
-            "core_skills": {
-                "Cloud Platforms": ["AWS", "Azure", "Google Cloud", "DigitalOcean"],
-                "Containerization": ["Docker", "Kubernetes", "Rancher", "OpenShift"],
-                "CI/CD": ["Jenkins", "GitLab CI", "GitHub Actions", "CircleCI"],
-                "Infrastructure as Code": ["Terraform", "CloudFormation", "Ansible", "Chef"],
-                "Monitoring": ["Prometheus", "Grafana", "ELK Stack", "Datadog"],
-                "Operating Systems": ["Linux", "Windows Server", "Shell Scripting"],
-                "Networking": ["TCP/IP", "DNS", "Load Balancing", "VPN"],
-                "Security": ["IAM", "Security Groups", "Compliance", "Vulnerability Management"]
-            },
-            "tech_stack": {
-                "Cloud": ["AWS", "Azure", "Google Cloud", "Terraform", "Ansible"],
-                "Containers": ["Docker", "Kubernetes", "Helm", "Istio"],
-                "CI/CD": ["Jenkins", "GitLab", "GitHub Actions", "ArgoCD"],
-                "Monitoring": ["Prometheus", "Grafana", "ELK Stack", "Datadog"],
-                "Security": ["Vault", "Secrets Manager", "WAF", "Security Hub"]
-            }
-        },
-        "Cybersecurity": {
-            "core_skills": {
-                "Security Tools": ["Wireshark", "Nmap", "Metasploit", "Burp Suite", "Kali Linux"],
-                "Network Security": ["Firewalls", "IDS/IPS", "VPN", "Network Monitoring"],
-                "Application Security": ["OWASP", "Penetration Testing", "Code Review", "SAST/DAST"],
-                "Incident Response": ["SIEM", "Forensics", "Threat Hunting", "Malware Analysis"],
-                "Compliance": ["GDPR", "ISO 27001", "NIST", "SOC 2"],
-                "Cryptography": ["Encryption", "Hashing", "Digital Signatures", "PKI"],
-                "Operating Systems": ["Linux", "Windows", "macOS Security"],
-                "Programming": ["Python", "Bash", "PowerShell", "C/C++"]
-            },
-            "tech_stack": {
-                "Security Tools": ["Kali Linux", "Metasploit", "Nmap", "Wireshark"],
-                "SIEM": ["Splunk", "QRadar", "ELK Stack", "Microsoft Sentinel"],
-                "Vulnerability Management": ["Nessus", "Qualys", "OpenVAS", "Nexpose"],
-                "Forensics": ["Autopsy", "Volatility", "FTK", "EnCase"],
-                "Cloud Security": ["AWS Security Hub", "Azure Security Center", "Prisma Cloud"]
-            }
-        },
-        "Product Management": {
-            "core_skills": {
-                "Product Strategy": ["Product Vision", "Roadmapping", "Market Analysis", "Competitive Analysis"],
-                "User Research": ["User Interviews", "Surveys", "Usability Testing", "Analytics"],
-                "Agile Methodologies": ["Scrum", "Kanban", "Sprint Planning", "User Stories"],
-                "Data Analysis": ["SQL", "Google Analytics", "A/B Testing", "Metrics"],
-                "Communication": ["Stakeholder Management", "Presentation Skills", "Documentation"],
-                "Business Acumen": ["Business Models", "Pricing Strategy", "Go-to-Market", "ROI Analysis"],
-                "Tools": ["Jira", "Confluence", "Figma", "Mixpanel", "Amplitude"]
-            },
-            "tech_stack": {
-                "Product Management": ["Jira", "Confluence", "Aha!", "Productboard"],
-                "Analytics": ["Google Analytics", "Mixpanel", "Amplitude", "Tableau"],
-                "Design": ["Figma", "Sketch", "InVision", "Adobe XD"],
-                "Communication": ["Slack", "Microsoft Teams", "Zoom", "Loom"],
-                "Research": ["SurveyMonkey", "UserTesting", "Hotjar", "FullStory"]
-            }
-        }
-    }
+def analyze_skills_and_tech_stack(career_track, current_skills, vector=None):
+    """Analyze required skills, missing skills, and tech stack for a career track.
+
+    ``vector`` is the candidate's ``SKILL_GAP_ENGINE.candidate_vector``, if
+    already computed.
+    """
     
     # Get requirements for the career track
-    requirements = skill_requirements.get(career_track, skill_requirements["Software Development"])
-    
-    # Analyze current skills vs required skills
-    current_skills_lower = [skill.lower() for skill in current_skills]
-    current_skills_set = set(current_skills_lower)
+    if career_track not in SKILL_REQUIREMENTS:
+        career_track = DEFAULT_TRACK
+    requirements = SKILL_REQUIREMENTS[career_track]
     
     # Find matching and missing skills
-    matching_skills = {}
-    missing_skills = {}
-    
-    for category, skills in requirements["core_skills"].items():
-        matching = []
-        missing = []
-        
-        for skill in skills:
-            skill_lower = skill.lower()
-            # Check for exact or partial matches with better logic
-            found_match = False
-            for current_skill in current_skills_set:
-                # Check for exact match or if current skill contains the required skill
-                if (skill_lower == current_skill or 
-                    skill_lower in current_skill or 
-                    current_skill in skill_lower):
-                    # Additional check to avoid false positives
-                    if len(skill_lower) > 2:  # Avoid matching very short strings
-                        matching.append(skill)
-                        found_match = True
-                        break
-            
-            if not found_match:
-                missing.append(skill)
-        
-        if matching:
-            matching_skills[category] = matching
-        if missing:
-            missing_skills[category] = missing
+    analysis = SKILL_GAP_ENGINE.analyze(career_track, current_skills, vector)
+    matching_skills = analysis["matching_skills"]
+    missing_skills = analysis["missing_skills"]
     
     return {
         "matching_skills": matching_skills,
         "missing_skills": missing_skills,
         "tech_stack": requirements["tech_stack"],
+        "stack_track": career_track,
         "skill_gap_percentage": calculate_skill_gap_percentage(matching_skills, missing_skills)
     }
 
 
+def compare_skill_gaps(current_skills):
+    """Skill gap of ``current_skills`` against every career track, smallest gap first.
+
+    Returns ``[(track, {"matching", "missing", "skill_gap_percentage"}), ...]``.
+    """
+    report = SKILL_GAP_ENGINE.gap_all(current_skills)
+    return sorted(report.items(), key=lambda item: item[1]["skill_gap_percentage"])
+
+
 def calculate_skill_gap_percentage(matching_skills, missing_skills):
     """Calculate the percentage of skills gap."""
     total_matching = sum(len(skills) for skills in matching_skills.values())
@@ -479,105 +155,68 @@ def calculate_skill_gap_percentage(matching_skills, missing_skills):
     return round((total_missing / total_skills) * 100, 1)
 
 
+# Threads used by build_plan_matrix to assemble what-if plans.
+PLAN_MATRIX_WORKERS = int(os.environ.get("INTELLIPATH_PLAN_MATRIX_WORKERS", "0")) or min(8, os.cpu_count() or 1)
+
+# Memoized stage lists are keyed by skill_signature; this many are kept.
+STAGE_RECS_CACHE_SIZE = int(os.environ.get("INTELLIPATH_STAGE_RECS_CACHE_SIZE", "1024"))
+
+
+@functools.lru_cache(maxsize=16384)
+def _skill_mask(track_key, skill_lower) -> int:
+    """Bit i is set if ``skill_lower`` covers entry i of TRACK_SKILLS_LOWER[track_key]."""
+    mask = 0
+    for i, (_, required) in enumerate(TRACK_SKILLS_LOWER[track_key]):
+        if required in skill_lower or skill_lower in required:
+            mask |= 1 << i
+    return mask
+
+
+def skill_signature(career_track, skills, user_preferences=None):
+    """Everything the stage recommendations depend on:
+    ``(track, matched-skill bitmask, timeline, sorted goals)``."""
+    track_key = career_track if career_track in SKILL_CATEGORIES else DEFAULT_TRACK
+    mask = 0
+    for skill in skills:
+        mask |= _skill_mask(track_key, skill.lower())
+    preferences = user_preferences or {}
+    goals = tuple(sorted(set(preferences.get("future_goals") or ())))
+    return career_track, mask, preferences.get("timeline") or "", goals
+
+
 def generate_dynamic_stage_recommendations(career_track, skills, experience, education, user_preferences=None):
-    """Dynamically generate personalized recommendations based on user's specific inputs and resume analysis."""
-    
-    # Analyze current skill gaps and strengths
-    skills_lower = [skill.lower() for skill in skills]
-    user_interest = user_preferences.get("area_of_interest", "") if user_preferences else ""
-    timeline = user_preferences.get("timeline", "") if user_preferences else ""
-    future_goals = user_preferences.get("future_goals", []) if user_preferences else []
-    
-    # Define skill categories for different career tracks
-    skill_categories = {
-        "Software Development": {
-            "core_languages": ["python", "java", "javascript", "c++", "c#", "go", "rust"],
-            "frameworks": ["react", "angular", "vue", "django", "flask", "spring", "express", "fastapi"],
-            "databases": ["sql", "mongodb", "redis", "postgresql", "mysql"],
-            "tools": ["git", "docker", "kubernetes", "jenkins", "aws", "azure"],
-            "concepts": ["api", "rest", "graphql", "microservices", "agile", "scrum"]
-        },
-        "Data Science & Analytics": {
-            "languages": ["python", "r", "sql", "scala"],
-            "libraries": ["pandas", "numpy", "matplotlib", "seaborn", "scikit-learn", "tensorflow", "pytorch"],
-            "tools": ["jupyter", "tableau", "powerbi", "excel", "spark", "hadoop"],
-            "concepts": ["statistics", "machine learning", "deep learning", "data visualization", "etl"]
-        },
-        "DevOps & Cloud": {
-            "platforms": ["aws", "azure", "gcp", "digitalocean"],
-            "containers": ["docker", "kubernetes", "rancher"],
-            "automation": ["jenkins", "gitlab", "github actions", "terraform", "ansible"],
-            "monitoring": ["prometheus", "grafana", "elk stack", "datadog"],
-            "os": ["linux", "bash", "shell scripting"]
-        },
-        "Cybersecurity": {
-            "tools": ["wireshark", "nmap", "metasploit", "burp suite", "kali linux"],
-            "concepts": ["penetration testing", "ethical hacking", "network security", "vulnerability assessment"],
-            "frameworks": ["nist", "iso 27001", "gdpr", "compliance"],
-            "domains": ["web security", "network security", "application security", "incident response"]
-        },
-        "Product Management": {
-            "methodologies": ["agile", "scrum", "kanban", "lean"],
-            "tools": ["jira", "confluence", "figma", "monday.com", "notion"],
-            "skills": ["user research", "market research", "competitive analysis", "stakeholder management"],
-            "concepts": ["user stories", "roadmap", "prd", "mrr", "user experience"]
-        },
-        "UI/UX Design": {
-            "tools": ["figma", "adobe xd", "sketch", "invision", "photoshop", "illustrator"],
-            "skills": ["wireframing", "prototyping", "user research", "usability testing"],
-            "concepts": ["design systems", "responsive design", "accessibility", "user experience", "user interface"]
-        },
-        "Artificial Intelligence & Machine Learning": {
-            "languages": ["python", "r", "julia"],
-            "libraries": ["tensorflow", "pytorch", "keras", "scikit-learn", "numpy", "pandas"],
-            "domains": ["nlp", "computer vision", "reinforcement learning", "deep learning"],
-            "concepts": ["neural networks", "statistics", "mathematics", "algorithms", "optimization"]
-        },
-        "Mobile Development": {
-            "platforms": ["ios", "android", "react native", "flutter", "xamarin"],
-            "languages": ["swift", "kotlin", "java", "dart", "javascript"],
-            "concepts": ["mobile ui", "app lifecycle", "mobile testing", "app store", "google play"]
-        },
-        "Web Development": {
-            "frontend": ["html", "css", "javascript", "react", "angular", "vue"],
-            "backend": ["node.js", "php", "python", "django", "flask", "express"],
-            "concepts": ["responsive design", "web security", "seo", "performance", "full stack"]
-        },
-        "Game Development": {
-            "engines": ["unity", "unreal engine", "godot"],
-            "languages": ["c++", "c#", "python", "lua"],
-            "skills": ["game design", "3d modeling", "animation", "game physics"],
-            "concepts": ["game mechanics", "level design", "game optimization"]
-        },
-        "Blockchain & Web3": {
-            "platforms": ["ethereum", "bitcoin", "polygon", "solana"],
-            "languages": ["solidity", "rust", "javascript", "python"],
-            "concepts": ["smart contracts", "defi", "nft", "web3", "cryptography", "distributed systems"]
-        },
-        "Business Consulting": {
-            "analytical_tools": ["excel", "powerpoint", "tableau", "powerbi", "sql", "python", "r"],
-            "methodologies": ["business process improvement", "change management", "strategic planning", "lean six sigma", "agile"],
-            "skills": ["business analysis", "financial analysis", "market research", "competitive analysis", "stakeholder management"],
-            "concepts": ["business strategy", "operations management", "organizational development", "performance optimization", "risk management"],
-            "domains": ["strategy consulting", "management consulting", "operations consulting", "financial consulting", "technology consulting"]
-        }
-    }
-    
-    # Get relevant skills for the career track
-    track_skills = skill_categories.get(career_track, skill_categories["Software Development"])
-    
-    # Analyze current skills vs required skills
-    current_skills = set()
-    missing_skills = set()
-    
-    for category, skill_list in track_skills.items():
-        for skill in skill_list:
-            if any(skill.lower() in existing_skill.lower() or existing_skill.lower() in skill.lower() 
-                   for existing_skill in skills):
-                current_skills.add(skill)
-            else:
-                missing_skills.add(skill)
-    
+    """Dynamically generate personalized recommendations based on user's specific inputs and resume analysis.
+
+    Returns three lists (entry, mid and senior level). Resumes with the same
+    ``skill_signature`` get the same, memoized recommendations.
+    """
+    stages = _stage_recommendations(*skill_signature(career_track, skills, user_preferences))
+    return tuple(list(recs) for recs in stages)
+
+
+def stage_recommendation_cache_stats() -> dict:
+    info = _stage_recommendations.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "entries": info.currsize}
+
+
+def clear_stage_recommendation_cache():
+    """Empty the stage-recommendation and skill-mask memos."""
+    _stage_recommendations.cache_clear()
+    _skill_mask.cache_clear()
+
+
+@functools.lru_cache(maxsize=STAGE_RECS_CACHE_SIZE)
+def _stage_recommendations(career_track, mask, timeline, future_goals):
+    track_key = career_track if career_track in SKILL_CATEGORIES else DEFAULT_TRACK
+    skill_roles = SKILL_STAGE_ROLE[track_key]
+
+    # Required skills the candidate has / lacks, in knowledge-base order
+    # (categories are listed core-first)
+    current_skills = []
+    missing_skills = []
+    for i, (skill, _) in enumerate(TRACK_SKILLS_LOWER[track_key]):
+        (current_skills if mask >> i & 1 else missing_skills).append(skill)
+
     # Generate dynamic stage recommendations
     stage1_recs = []
     stage2_recs = []
@@ -586,13 +225,14 @@ def generate_dynamic_stage_recommendations(career_track, skills, experience, edu
     # Stage 1: Entry Level (0-2 years) - Focus on foundational skills
     if missing_skills:
         # Prioritize missing core skills
-        core_missing = list(missing_skills)[:5]  # Top 5 missing skills
+        core_missing = missing_skills[:5]  # Top 5 missing skills
         for skill in core_missing:
-            if skill in track_skills.get("languages", []) + track_skills.get("core_languages", []) + track_skills.get("analytical_tools", []):
+            role = skill_roles.get(skill)
+            if role == "foundation":
                 stage1_recs.append(f"Master {skill} fundamentals and best practices")
-            elif skill in track_skills.get("tools", []) + track_skills.get("platforms", []) + track_skills.get("methodologies", []):
+            elif role == "hands_on":
                 stage1_recs.append(f"Learn {skill} and gain hands-on experience")
-            elif skill in track_skills.get("concepts", []) + track_skills.get("skills", []) + track_skills.get("domains", []):
+            elif role == "principles":
                 stage1_recs.append(f"Understand {skill} principles and applications")
     
     # Add general foundational recommendations based on career track
@@ -618,7 +258,7 @@ def generate_dynamic_stage_recommendations(career_track, skills, experience, edu
     # Stage 2: Mid-Level (2-5 years) - Focus on specialization and leadership
     if current_skills:
         # Build on existing strengths
-        existing_strengths = list(current_skills)[:3]
+        existing_strengths = current_skills[:3]
         for skill in existing_strengths:
             stage2_recs.append(f"Deepen expertise in {skill} and related areas")
     
@@ -662,62 +302,60 @@ def generate_dynamic_stage_recommendations(career_track, skills, experience, edu
             "Develop strategic vision and business acumen"
         ]
     
-    # Customize based on user preferences
-    if user_preferences:
-        # Timeline adjustments
-        if "Fast-track" in timeline:
-            stage1_recs = stage1_recs[:4]  # Focus on fewer, critical skills
-            stage2_recs = stage2_recs[:4]
-            stage3_recs = stage3_recs[:4]
-            stage1_recs.append("Accelerate learning through intensive bootcamps or courses")
-            stage2_recs.append("Seek rapid advancement opportunities and challenging projects")
-        
-        # Goal-specific additions
-        if "Become a technical leader/architect" in future_goals:
-            if career_track == "Business Consulting":
-                stage1_recs.append("Study business architecture and strategic frameworks")
-                stage2_recs.append("Lead business transformation and change initiatives")
-                stage3_recs.append("Define business strategy and organizational standards")
-            else:
-                stage1_recs.append("Study system design and architecture patterns")
-                stage2_recs.append("Lead technical design discussions and decisions")
-                stage3_recs.append("Define technical strategy and standards for organizations")
-        
-        if "Move into management/leadership" in future_goals:
-            stage1_recs.append("Develop leadership and communication skills")
-            stage2_recs.append("Take on team lead and project management roles")
-            stage3_recs.append("Lead cross-functional teams and organizational initiatives")
-        
-        if "Start my own company/entrepreneurship" in future_goals:
-            stage1_recs.append("Learn business fundamentals and startup methodologies")
-            stage2_recs.append("Build a network of potential co-founders and investors")
-            stage3_recs.append("Develop business strategy and fundraising skills")
-        
-        if "Work for top tech companies (FAANG)" in future_goals:
-            if career_track == "Business Consulting":
-                stage1_recs.append("Study business strategy and competitive analysis")
-                stage2_recs.append("Build expertise in technology consulting and digital transformation")
-                stage3_recs.append("Lead strategic initiatives for major technology companies")
-            else:
-                stage1_recs.append("Practice coding interviews and system design problems")
-                stage2_recs.append("Build projects that demonstrate scalability and complexity")
-                stage3_recs.append("Contribute to large-scale systems and high-impact projects")
-        
-        if "Work remotely/freelance" in future_goals:
-            stage1_recs.append("Build a strong online presence and portfolio")
-            stage2_recs.append("Develop client management and project delivery skills")
-            stage3_recs.append("Establish thought leadership and personal brand")
-        
-        if "Become a subject matter expert" in future_goals:
-            stage1_recs.append("Deep dive into specific technologies or business domains")
-            stage2_recs.append("Contribute to professional communities and conferences")
-            stage3_recs.append("Publish research, write books, or create educational content")
-        
-        if "Achieve work-life balance" in future_goals:
-            stage1_recs.append("Develop time management and prioritization skills")
-            stage2_recs.append("Establish boundaries and sustainable work practices")
-            stage3_recs.append("Create flexible work arrangements and team policies")
+    # Timeline adjustments
+    if "Fast-track" in timeline:
+        stage1_recs = stage1_recs[:4]  # Focus on fewer, critical skills
+        stage2_recs = stage2_recs[:4]
+        stage3_recs = stage3_recs[:4]
+        stage1_recs.append("Accelerate learning through intensive bootcamps or courses")
+        stage2_recs.append("Seek rapid advancement opportunities and challenging projects")
+    
+    # Goal-specific additions
+    if "Become a technical leader/architect" in future_goals:
+        if career_track == "Business Consulting":
+            stage1_recs.append("Study business architecture and strategic frameworks")
+            stage2_recs.append("Lead business transformation and change initiatives")
+            stage3_recs.append("Define business strategy and organizational standards")
+        else:
+            stage1_recs.append("Study system design and architecture patterns")
+            stage2_recs.append("Lead technical design discussions and decisions")
+            stage3_recs.append("Define technical strategy and standards for organizations")
+    
+    if "Move into management/leadership" in future_goals:
+        stage1_recs.append("Develop leadership and communication skills")
+        stage2_recs.append("Take on team lead and project management roles")
+        stage3_recs.append("Lead cross-functional teams and organizational initiatives")
+    
+    if "Start my own company/entrepreneurship" in future_goals:
+        stage1_recs.append("Learn business fundamentals and startup methodologies")
+        stage2_recs.append("Build a network of potential co-founders and investors")
+        stage3_recs.append("Develop business strategy and fundraising skills")
+    
+    if "Work for top tech companies (FAANG)" in future_goals:
+        if career_track == "Business Consulting":
+            stage1_recs.append("Study business strategy and competitive analysis")
+            stage2_recs.append("Build expertise in technology consulting and digital transformation")
+            stage3_recs.append("Lead strategic initiatives for major technology companies")
+        else:
+            stage1_recs.append("Practice coding interviews and system design problems")
+            stage2_recs.append("Build projects that demonstrate scalability and complexity")
+            stage3_recs.append("Contribute to large-scale systems and high-impact projects")
+    
+    if "Work remotely/freelance" in future_goals:
+        stage1_recs.append("Build a strong online presence and portfolio")
+        stage2_recs.append("Develop client management and project delivery skills")
+        stage3_recs.append("Establish thought leadership and personal brand")
     
+    if "Become a subject matter expert" in future_goals:
+        stage1_recs.append("Deep dive into specific technologies or business domains")
+        stage2_recs.append("Contribute to professional communities and conferences")
+        stage3_recs.append("Publish research, write books, or create educational content")
+    
+    if "Achieve work-life balance" in future_goals:
+        stage1_recs.append("Develop time management and prioritization skills")
+        stage2_recs.append("Establish boundaries and sustainable work practices")
+        stage3_recs.append("Create flexible work arrangements and team policies")
+
     # Ensure we have enough recommendations
     while len(stage1_recs) < 5:
         stage1_recs.append("Continuously learn and adapt to new technologies and methodologies")
@@ -726,209 +364,172 @@ def generate_dynamic_stage_recommendations(career_track, skills, experience, edu
     while len(stage3_recs) < 5:
         stage3_recs.append("Stay updated with emerging trends and technologies")
     
-    return stage1_recs[:7], stage2_recs[:7], stage3_recs[:7]
+    return tuple(stage1_recs[:7]), tuple(stage2_recs[:7]), tuple(stage3_recs[:7])
+
+
+# The three development stages: (title, focus)
+STAGES = (
+    ("Stage 1: Entry Level (0-2 years)", "Building foundational skills and gaining practical experience"),
+    ("Stage 2: Mid-Level (2-5 years)", "Specialization and leadership development"),
+    ("Stage 3: Senior Level (5+ years)", "Strategic leadership and innovation"),
+)
+
+# Timeline choices offered by the UI, and the what-if matrix's default axis
+TIMELINES = (
+    "Fast-track (aim for rapid advancement)",
+    "Steady growth (balanced pace)",
+    "Long-term focus (patient, thorough development)",
+    "Flexible (adapt to opportunities)",
+)
+FAST_TRACK_TIMELINE = TIMELINES[0]
+
+# Immediate next steps: (label, text), by whether the user chose the fast track
+IMMEDIATE_STEPS = {
+    True: (
+        ("Accelerated Learning", "Focus intensively on the top 3 missing skills from the analysis above"),
+        ("Project Portfolio", "Build 2-3 impressive projects showcasing your target skills"),
+        ("Networking", "Attend industry events and connect with professionals in your target field"),
+        ("Certification", "Pursue relevant certifications to validate your skills quickly"),
+        ("Mentorship", "Find a mentor who can guide your rapid career progression"),
+    ),
+    False: (
+        ("Skill Enhancement", "Focus on the top 2-3 missing skills from the skills analysis"),
+        ("Project Building", "Create portfolio projects showcasing your target skills"),
+        ("Networking", "Connect with professionals in your target career track"),
+        ("Certification", "Consider relevant certifications for your chosen path"),
+        ("Mentorship", "Seek guidance from experienced professionals in your field"),
+    ),
+}
+
+# Extra immediate steps per future goal, in the order they are added
+GOAL_STEPS = {
+    "Work for top tech companies (FAANG)": (
+        ("Interview Preparation", "Start practicing coding interviews and system design"),
+        ("Company Research", "Study the specific technologies and practices used at target companies"),
+    ),
+    "Start my own company/entrepreneurship": (
+        ("Business Skills", "Learn about business models, market research, and customer development"),
+        ("Idea Validation", "Start validating business ideas and building prototypes"),
+    ),
+    "Achieve work-life balance": (
+        ("Time Management", "Develop effective scheduling and prioritization techniques"),
+        ("Wellness Practices", "Establish healthy work habits and stress management strategies"),
+    ),
+}
+
+# Business Consulting replacements for GOAL_STEPS entries
+CONSULTING_GOAL_STEPS = {
+    "Work for top tech companies (FAANG)": (
+        ("Business Strategy", "Study business models and competitive landscapes"),
+        ("Technology Consulting", "Learn about digital transformation and technology strategy"),
+    ),
+}
+
+LONG_TERM_STRATEGY = (
+    "Continuously update skills based on industry trends and your specific goals",
+    "Build a strong professional network and personal brand aligned with your aspirations",
+    "Seek opportunities that align with your timeline and career objectives",
+    "Stay updated with emerging technologies and methodologies in your chosen field",
+    "Consider advanced education or specialized training based on your goals",
+)
+
+
+def _immediate_steps(career_track, user_preferences):
+    steps = list(IMMEDIATE_STEPS[user_preferences.get("timeline") == FAST_TRACK_TIMELINE])
+    future_goals = user_preferences.get("future_goals", [])
+    overrides = CONSULTING_GOAL_STEPS if career_track == "Business Consulting" else {}
+    for goal, extra in GOAL_STEPS.items():
+        if goal in future_goals:
+            steps.extend(overrides.get(goal, extra))
+    return tuple(steps)
 
 
-def generate_career_path(summary: dict) -> str:
-    """Generate a comprehensive career path recommendation based on resume analysis and user preferences."""
-    
-    # Extract data from summary
+@timed("generate_career_path")
+def build_career_plan(summary: dict) -> CareerPlan:
+    """The career plan for a normalized resume summary (with ``user_preferences``)."""
     skills = summary.get("skills", [])
-    job_titles = summary.get("job_titles", [])
-    companies = summary.get("companies", [])
-    education = summary.get("education", [])
-    projects = summary.get("projects", [])
-    certifications = summary.get("certifications", [])
-    achievements = summary.get("achievements", [])
     user_preferences = summary.get("user_preferences", {})
-    
-    # Analyze career track considering user preferences
     career_track, track_description = analyze_skills_for_career_track(skills, user_preferences)
-    
-    # Analyze skills and tech stack
     skills_analysis = analyze_skills_and_tech_stack(career_track, skills)
-    
-    # Generate dynamic stage recommendations
-    stage1_recs, stage2_recs, stage3_recs = generate_dynamic_stage_recommendations(
-        career_track, skills, job_titles, education, user_preferences
-    )
-    
-    # Build the career path response
-    response = f"""
-# 🎯 Personalized Career Path Recommendation
-
-## 📊 Resume Analysis Summary
-- **Skills Identified:** {', '.join(skills[:10])}{'...' if len(skills) > 10 else ''}
-- **Experience:** {', '.join(job_titles[:5])}{'...' if len(job_titles) > 5 else ''}
-- **Education:** {', '.join(education[:3])}{'...' if len(education) > 3 else ''}
-- **Projects:** {', '.join(projects[:3])}{'...' if len(projects) > 3 else ''}
-- **Certifications:** {', '.join(certifications[:3])}{'...' if len(certifications) > 3 else ''}
-- **Achievements:** {', '.join(achievements[:3])}{'...' if len(achievements) > 3 else ''}
-
-## 🚀 Recommended Career Track: {career_track}
-{track_description}
-
-## ⚙️ Your Preferences
-- **Area of Interest:** {user_preferences.get('area_of_interest', 'Not specified')}
-- **Timeline:** {user_preferences.get('timeline', 'Not specified')}
-- **Future Goals:** {', '.join(user_preferences.get('future_goals', ['Not specified']))}
-{f"- **Additional Goals:** {user_preferences.get('additional_goals', '')}" if user_preferences.get('additional_goals') else ''}
-
----
-
-## 🔍 Skills Analysis & Tech Stack
-
-### 📈 Skills Gap Analysis
-**Current Skills Gap:** {skills_analysis['skill_gap_percentage']}% of required skills are missing
-
-### ✅ Skills You Already Have
-"""
-    
-    # Add matching skills
-    if skills_analysis['matching_skills']:
-        for category, skills_list in skills_analysis['matching_skills'].items():
-            response += f"\n**{category}:**\n"
-            for skill in skills_list:
-                response += f"- ✅ {skill}\n"
-    else:
-        response += "\n*No specific skills from your resume match the required skills for this career track.*\n"
-    
-    response += f"""
-
-### ❌ Critical Missing Skills
-"""
-    
-    # Add missing skills
-    if skills_analysis['missing_skills']:
-        for category, skills_list in skills_analysis['missing_skills'].items():
-            response += f"\n**{category}:**\n"
-            for skill in skills_list:
-                response += f"- ❌ {skill}\n"
-    else:
-        response += "\n*Great! You have all the required skills for this career track.*\n"
-    
-    response += f"""
-
-### 🛠️ Recommended Tech Stack
-"""
-    
-    # Add tech stack recommendations
-    for category, tools in skills_analysis['tech_stack'].items():
-        response += f"\n**{category}:**\n"
-        for tool in tools:
-            response += f"- 🛠️ {tool}\n"
-    
-    response += f"""
-
----
+    return _assemble_plan(summary, user_preferences, career_track, track_description, skills_analysis)
 
-## 📈 3-Stage Career Development Plan
 
-### Stage 1: Entry Level (0-2 years)
-**Focus:** Building foundational skills and gaining practical experience
-
-"""
-    
-    for i, rec in enumerate(stage1_recs, 1):
-        response += f"{i}. {rec}\n"
-    
-    response += f"""
-
-### Stage 2: Mid-Level (2-5 years)
-**Focus:** Specialization and leadership development
-
-"""
-    
-    for i, rec in enumerate(stage2_recs, 1):
-        response += f"{i}. {rec}\n"
-    
-    response += f"""
-
-### Stage 3: Senior Level (5+ years)
-**Focus:** Strategic leadership and innovation
+def _assemble_plan(summary, user_preferences, career_track, track_description, skills_analysis):
+    skills = summary.get("skills", [])
+    stage_recs = generate_dynamic_stage_recommendations(
+        career_track, skills, summary.get("job_titles", []), summary.get("education", []), user_preferences
+    )
 
-"""
-    
-    for i, rec in enumerate(stage3_recs, 1):
-        response += f"{i}. {rec}\n"
-    
-    response += f"""
+    goals = user_preferences.get("future_goals")
+    long_term = LONG_TERM_STRATEGY
+    if user_preferences.get("area_of_interest"):
+        long_term += (f"Focus on {user_preferences['area_of_interest']} specialization and expertise",)
+
+    return CareerPlan(
+        overview=ResumeOverview(**{
+            field: tuple(summary.get(field, ()))
+            for field in ("skills", "job_titles", "education", "projects", "certifications", "achievements")
+        }),
+        preferences=Preferences(
+            area_of_interest=user_preferences.get("area_of_interest"),
+            timeline=user_preferences.get("timeline"),
+            future_goals=None if goals is None else tuple(goals),
+            additional_goals=user_preferences.get("additional_goals") or "",
+        ),
+        track=Track(career_track, track_description),
+        gaps=GapAnalysis(
+            matching=tuple((c, tuple(s)) for c, s in skills_analysis["matching_skills"].items()),
+            missing=tuple((c, tuple(s)) for c, s in skills_analysis["missing_skills"].items()),
+            gap_percentage=skills_analysis["skill_gap_percentage"],
+            stack_track=skills_analysis["stack_track"],
+        ),
+        stages=tuple(
+            Stage(title, focus, tuple(recs)) for (title, focus), recs in zip(STAGES, stage_recs)
+        ),
+        next_steps=NextSteps(_immediate_steps(career_track, user_preferences), long_term),
+    )
 
----
 
-## 💡 Personalized Recommendations
+@timed("generate_plan_matrix")
+def build_plan_matrix(summary: dict, combinations, max_workers=PLAN_MATRIX_WORKERS) -> dict:
+    """Career plans for several ``(area_of_interest, timeline)`` choices at once.
 
-### Immediate Next Steps (Next 3-6 months):
-"""
-    
-    # Personalized immediate steps based on preferences
-    if user_preferences.get("timeline") == "Fast-track (aim for rapid advancement)":
-        response += """
-1. **Accelerated Learning:** Focus intensively on the top 3 missing skills from the analysis above
-2. **Project Portfolio:** Build 2-3 impressive projects showcasing your target skills
-3. **Networking:** Attend industry events and connect with professionals in your target field
-4. **Certification:** Pursue relevant certifications to validate your skills quickly
-5. **Mentorship:** Find a mentor who can guide your rapid career progression
-"""
-    else:
-        response += """
-1. **Skill Enhancement:** Focus on the top 2-3 missing skills from the skills analysis
-2. **Project Building:** Create portfolio projects showcasing your target skills
-3. **Networking:** Connect with professionals in your target career track
-4. **Certification:** Consider relevant certifications for your chosen path
-5. **Mentorship:** Seek guidance from experienced professionals in your field
-"""
-    
-    # Add goal-specific recommendations
-    future_goals = user_preferences.get("future_goals", [])
-    if "Work for top tech companies (FAANG)" in future_goals:
-        if career_track == "Business Consulting":
-            response += """
-6. **Business Strategy:** Study business models and competitive landscapes
-7. **Technology Consulting:** Learn about digital transformation and technology strategy
-"""
-        else:
-            response += """
-6. **Interview Preparation:** Start practicing coding interviews and system design
-7. **Company Research:** Study the specific technologies and practices used at target companies
-"""
-    
-    if "Start my own company/entrepreneurship" in future_goals:
-        response += """
-6. **Business Skills:** Learn about business models, market research, and customer development
-7. **Idea Validation:** Start validating business ideas and building prototypes
-"""
-    
-    if "Achieve work-life balance" in future_goals:
-        response += """
-6. **Time Management:** Develop effective scheduling and prioritization techniques
-7. **Wellness Practices:** Establish healthy work habits and stress management strategies
-"""
-    
-    response += f"""
+    Every plan uses the summary's other preferences (goals, additional
+    goals). Track ranking and the candidate's skill vector are computed once,
+    the gap analysis once per distinct track, and the plans are assembled on
+    a thread pool. Returns ``{(area, timeline): CareerPlan}``; each plan is
+    the one ``build_career_plan`` gives for those preferences.
+    """
+    combinations = list(dict.fromkeys(combinations))
+    skills = summary.get("skills", [])
+    base = summary.get("user_preferences") or {}
+    ranking = rank_career_tracks(skills)
+    vector = SKILL_GAP_ENGINE.candidate_vector(skills)
 
-### Long-term Strategy (1-3 years):
-- Continuously update skills based on industry trends and your specific goals
-- Build a strong professional network and personal brand aligned with your aspirations
-- Seek opportunities that align with your timeline and career objectives
-- Stay updated with emerging technologies and methodologies in your chosen field
-- Consider advanced education or specialized training based on your goals
-{f"- Focus on {user_preferences.get('area_of_interest', 'your chosen field')} specialization and expertise" if user_preferences.get('area_of_interest') else ""}
+    tracks = {
+        area: analyze_skills_for_career_track(skills, dict(base, area_of_interest=area), ranking)
+        for area in dict.fromkeys(area for area, _ in combinations)
+    }
+    analyses = {}
+    for track, _ in tracks.values():
+        if track not in analyses:
+            analyses[track] = analyze_skills_and_tech_stack(track, skills, vector)
 
----
+    def build(area, timeline):
+        preferences = dict(base, area_of_interest=area, timeline=timeline)
+        track, description = tracks[area]
+        return _assemble_plan(summary, preferences, track, description, analyses[track])
 
-## 🎯 Goal Alignment
+    if max_workers <= 1 or len(combinations) < 2:
+        return {combo: build(*combo) for combo in combinations}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(combinations))) as pool:
+        futures = {combo: pool.submit(build, *combo) for combo in combinations}
+    return {combo: future.result() for combo, future in futures.items()}
 
-Your career path has been customized based on:
-- **Skills Analysis:** {len(skills)} skills identified from your resume
-- **Interest Alignment:** {user_preferences.get('area_of_interest', 'General technology')} focus
-- **Timeline Preference:** {user_preferences.get('timeline', 'Balanced approach')}
-- **Future Aspirations:** {len(future_goals)} specific goals identified
-- **Skills Gap:** {skills_analysis['skill_gap_percentage']}% of required skills need development
 
----
+def generate_career_path(summary: dict, fmt="md") -> str:
+    """Generate a comprehensive career path recommendation based on resume analysis and user preferences.
 
-*This career path is tailored specifically to your resume, interests, and goals. Consider your personal circumstances, work-life balance preferences, and market conditions when following these recommendations.*
-"""
-    
-    return response
\ No newline at end of file
+    ``fmt`` picks the rendering: ``"md"`` (default), ``"text"``, ``"html"`` or ``"json"``.
+    """
+    return render(build_career_plan(summary), fmt)
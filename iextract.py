@@ -1,427 +1,496 @@
 # iextract.py
-from transformers import pipeline
+import copy
+import hashlib
+import os
 import re
+import threading
+from bisect import bisect_left, bisect_right
+
+from cache import ENTITY_CACHE
+from knowledge_base import (
+    ACHIEVEMENT_PATTERNS,
+    CERT_PATTERNS,
+    COMPANY_PATTERNS,
+    EDUCATION_PATTERNS,
+    JOB_TITLE_PATTERNS,
+    PROJECT_PATTERNS,
+    SKILL_PATTERNS,
+    VERSION as KB_VERSION,
+)
+from matcher import LineIndex, PhraseMatcher
+from metrics import inc, timed
+from microbatch import MicroBatcher
+from model_registry import registry
 
 
 # Pick a resume-focused token-classification model from HF.
 # Example placeholder; change to a model you have access to.
-NER_MODEL = "yashpwr/resume-ner-bert-v2"
+NER_MODEL = os.environ.get("INTELLIPATH_NER_MODEL", "yashpwr/resume-ner-bert-v2")
+
+
+_ner_backend = None
+
+
+def _load_ner():
+    # Imported here so `import iextract` stays cheap; the first
+    # extract_entities call (or warm_up_ner) pays for transformers + weights.
+    from ner_backends import DEFAULT_BACKEND, load_pipeline
+    return load_pipeline(NER_MODEL, _ner_backend or DEFAULT_BACKEND)
+
+
+registry.register("ner", _load_ner)
+
+
+def set_ner_backend(backend: str):
+    """Switch the NER inference backend ("torch", "torch-int8" or "onnx").
+
+    The current pipeline is dropped; the next call loads the new backend.
+    """
+    from ner_backends import BACKENDS
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown NER backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    global _ner_backend
+    _ner_backend = backend
+    registry.register("ner", _load_ner)
+
+
+def ner_signature() -> str:
+    """Identifies the model + backend producing entities (for cache keys)."""
+    from ner_backends import DEFAULT_BACKEND
+    return f"{NER_MODEL}@{_ner_backend or DEFAULT_BACKEND}"
+
+
+# How resumes are read: "ner" uses the model's entities, "rules" only the
+# knowledge-base vocabularies over the text (the model is never loaded),
+# "hybrid" both. Set per call, or process-wide with INTELLIPATH_EXTRACTION_MODE.
+EXTRACTION_MODES = ("ner", "rules", "hybrid")
+EXTRACTION_MODE = os.environ.get("INTELLIPATH_EXTRACTION_MODE", "hybrid")
+
+
+def extraction_mode(mode=None) -> str:
+    """``mode``, or EXTRACTION_MODE if None, after checking it is known."""
+    mode = mode or EXTRACTION_MODE
+    if mode not in EXTRACTION_MODES:
+        raise ValueError(f"Unknown extraction mode {mode!r}; expected one of {', '.join(EXTRACTION_MODES)}")
+    return mode
+
+
+def extraction_signature(mode=None) -> str:
+    """Identifies what produces entities and summaries in ``mode`` (for
+    cache keys): the model, if used, and the knowledge base the rules and
+    plans come from, so a KB update invalidates persisted results."""
+    mode = extraction_mode(mode)
+    if mode == "rules":
+        return f"rules@kb{KB_VERSION}"
+    return f"{mode}:{ner_signature()}@kb{KB_VERSION}"
+
+
+def get_ner():
+    """Return the process-wide NER pipeline, loading it on first use."""
+    return registry.get("ner")
+
+
+def warm_up_ner(background=True):
+    """Start loading the NER pipeline so the first request doesn't pay for it."""
+    return registry.warm_up("ner", background=background)
+
+
+def ner_stats() -> dict:
+    """Load time and memory footprint of the NER pipeline, plus micro-batching
+    counters when it is on."""
+    stats = registry.stats("ner")
+    if NER_BATCHER is not None:
+        stats["batching"] = NER_BATCHER.stats()
+    return stats
+
+
+# Tokens shared by neighbouring windows so entities cut at a window edge are
+# seen whole by the next one, and how many windows go through the model per
+# forward pass.
+NER_STRIDE = int(os.environ.get("INTELLIPATH_NER_STRIDE", "32"))
+NER_BATCH_SIZE = int(os.environ.get("INTELLIPATH_NER_BATCH_SIZE", "8"))
+
+# Fallback window size when the tokenizer can't report offsets.
+MAX_CHARS = 2000
+
+
+def _window_token_budget(tokenizer) -> int:
+    max_len = getattr(tokenizer, "model_max_length", None) or 512
+    if max_len > 100_000:  # tokenizers without a configured limit report a huge sentinel
+        max_len = 512
+    return max(max_len - tokenizer.num_special_tokens_to_add(), 8)
+
+
+_chunking_lock = threading.Lock()
+_chunking_tokenizer = (None, None)
+
+
+def _tokenize_for_chunking(tokenizer, text):
+    # Fast tokenizers can't be used from two threads at once ("Already
+    # borrowed") and the pipeline's own tokenizer may be busy on the model
+    # thread, so chunking goes through a private copy, one caller at a time.
+    global _chunking_tokenizer
+    with _chunking_lock:
+        source, private = _chunking_tokenizer
+        if source is not tokenizer:
+            private = copy.deepcopy(tokenizer)
+            _chunking_tokenizer = (tokenizer, private)
+        enc = private(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+        return enc["offset_mapping"], enc.word_ids()
+
+
+def chunk_text(text: str, tokenizer=None, max_tokens=None, stride=NER_STRIDE):
+    """Split ``text`` into overlapping ``(char_offset, window)`` pairs.
+
+    Windows hold up to ``max_tokens`` tokens (the model's maximum sequence
+    length by default), start and end on word boundaries and overlap their
+    neighbour by up to ``stride`` tokens. Cuts prefer line breaks, so the
+    same paragraphs produce the same windows even after text earlier in the
+    document changed, which lets the entity cache reuse them. Without a
+    fast tokenizer the text is cut into ``MAX_CHARS`` windows instead.
+    """
+    if not text:
+        return []
+    if tokenizer is None or not getattr(tokenizer, "is_fast", False):
+        overlap = min(stride * 4, MAX_CHARS // 2)
+        step = MAX_CHARS - overlap
+        return [(i, text[i:i + MAX_CHARS]) for i in range(0, max(len(text) - overlap, 1), step)]
+
+    max_tokens = max_tokens or _window_token_budget(tokenizer)
+    stride = min(stride, max_tokens // 2)
+    offsets, word_ids = _tokenize_for_chunking(tokenizer, text)
+    n = len(offsets)
+    if n == 0:
+        return []
+
+    def word_start(i):
+        # Move back to the first sub-token of the word containing token i so
+        # re-tokenizing the window yields the same pieces.
+        while 0 < i < n and word_ids[i] is not None and word_ids[i] == word_ids[i - 1]:
+            i -= 1
+        return i
+
+    # Tokens that begin a line.
+    line_starts = [i for i in range(1, n) if "\n" in text[offsets[i - 1][1]:offsets[i][0]]]
+
+    windows = []
+    start = 0
+    while True:
+        end = min(start + max_tokens, n)
+        if end < n:
+            j = bisect_right(line_starts, end) - 1
+            if j >= 0 and line_starts[j] > start + max_tokens // 2:
+                end = line_starts[j]
+            else:
+                cut = word_start(end)
+                if cut > start:  # a single word longer than the window is split as-is
+                    end = cut
+        windows.append((offsets[start][0], text[offsets[start][0]:offsets[end - 1][1]]))
+        if end >= n:
+            break
+        target = max(end - stride, start + 1)
+        j = bisect_left(line_starts, target)
+        if j < len(line_starts) and line_starts[j] < end:
+            next_start = line_starts[j]  # overlap from the first line break in the stride
+        else:
+            next_start = word_start(target)
+        start = next_start if next_start > start else end
+    return windows
+
+
+def _run_ner(ner, windows, batch_size):
+    texts = [w for _, w in windows]
+    try:
+        results = ner(texts, batch_size=batch_size)
+    except Exception:
+        # One bad window shouldn't lose the whole batch; retry them one by one.
+        results = []
+        for t in texts:
+            try:
+                results.append(ner(t))
+            except Exception:
+                # On some environments HF pipeline may error for very long sequences; ignore chunk errors.
+                results.append([])
+    return results
+
 
+# Micro-batching: windows from concurrent extract_entities calls are pooled
+# for up to NER_MAX_WAIT_MS and run through the model together, at most
+# NER_MAX_BATCH per forward pass. Set INTELLIPATH_NER_MAX_WAIT_MS=0 to run
+# every call's windows on its own thread instead. A call that passes its own
+# batch_size also runs on its own thread, since a shared pass can't honour it.
+NER_MAX_WAIT_MS = float(os.environ.get("INTELLIPATH_NER_MAX_WAIT_MS", "5"))
+NER_MAX_BATCH = int(os.environ.get("INTELLIPATH_NER_MAX_BATCH", "16"))
 
-# aggregation_strategy requires transformers>=4.8+
-ner = pipeline("token-classification", model=NER_MODEL, aggregation_strategy="simple")
 
+def _run_pooled(windows):
+    # Similar lengths side by side so each padded sub-batch wastes less.
+    order = sorted(range(len(windows)), key=lambda i: len(windows[i][1]))
+    results = _run_ner(get_ner(), [windows[i] for i in order], NER_BATCH_SIZE)
+    out = [None] * len(windows)
+    for i, r in zip(order, results):
+        out[i] = r
+    return out
+
+
+NER_BATCHER = (
+    MicroBatcher(_run_pooled, NER_MAX_BATCH, NER_MAX_WAIT_MS / 1000, name="ner-microbatch")
+    if NER_MAX_WAIT_MS > 0 else None
+)
+
+
+def _run_windows(ner, windows, batch_size):
+    if NER_BATCHER is not None and batch_size is None:
+        return NER_BATCHER.map(windows)
+    return _run_ner(ner, windows, batch_size or NER_BATCH_SIZE)
+
+
+def chunk_key(window: str, signature=None) -> str:
+    """Entity-cache key of one window: its text under the current model."""
+    payload = f"{signature or ner_signature()}\0{window}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _infer(ner, windows, batch_size):
+    """Window-relative entities for each window; only windows not in the
+    entity cache go through the model."""
+    if ENTITY_CACHE.max_entries <= 0:
+        return _run_windows(ner, windows, batch_size)
+    signature = ner_signature()
+    keys = [chunk_key(w, signature) for _, w in windows]
+    missing = object()
+    results = [ENTITY_CACHE.get(k, missing) for k in keys]
+    todo = [i for i, r in enumerate(results) if r is missing]
+    inc("ner_chunks_cached", len(windows) - len(todo))
+    if todo:
+        fresh = _run_windows(ner, [windows[i] for i in todo], batch_size)
+        for i, ents in zip(todo, fresh):
+            results[i] = ents
+            ENTITY_CACHE.set(keys[i], ents)
+    return results
+
+
+def use_entity_cache(cache):
+    """Replace the per-window entity cache; ``ResultCache(max_entries=0)``
+    turns it off (the benchmarks do, so repeats measure inference)."""
+    global ENTITY_CACHE
+    ENTITY_CACHE = cache
 
-def extract_entities(text: str):
-    """Return aggregated NER results for the given text."""
-    # For very long docs, you may want to chunk. We'll do a simple chunk approach.
-    MAX_CHARS = 2000
-    chunks = [text[i:i+MAX_CHARS] for i in range(0, len(text), MAX_CHARS)]
+
+def entity_cache_stats() -> dict:
+    """Hit/miss counters of the per-window entity cache."""
+    return ENTITY_CACHE.stats()
+
+
+def _merge_windows(windows, results):
+    """Shift entities to document offsets and drop duplicates from overlaps.
+
+    Each window owns the text up to the middle of its overlap with the next
+    window; entities starting outside that span are left to the neighbour,
+    which saw them with more context.
+    """
+    merged = []
+    seen = set()
+    for i, ((offset, window), ents) in enumerate(zip(windows, results)):
+        own_start = 0
+        if i > 0:
+            prev_offset, prev_window = windows[i - 1]
+            own_start = (offset + prev_offset + len(prev_window)) // 2
+        own_end = float("inf")
+        if i + 1 < len(windows):
+            next_offset = windows[i + 1][0]
+            own_end = (next_offset + offset + len(window)) // 2
+        for e in ents:
+            e = dict(e)
+            if e.get("start") is not None:
+                e["start"] += offset
+                e["end"] += offset
+                if not own_start <= e["start"] < own_end:
+                    continue
+                key = (e["start"], e["end"], e.get("entity_group", e.get("entity")))
+                if key in seen:
+                    continue
+                seen.add(key)
+            merged.append(e)
+    return merged
+
+
+@timed("extract_entities")
+def extract_entities(text: str, batch_size=None, stride=NER_STRIDE, mode=None):
+    """Return aggregated NER results for the given text.
+
+    The text is cut into token windows that fit the model (see ``chunk_text``)
+    and all windows go through the pipeline in batches. By default they are
+    shared with concurrent callers when micro-batching is on (else batches
+    of NER_BATCH_SIZE); an explicit ``batch_size`` bypasses the batcher and
+    runs this call's windows in batches of that size.
+    Entity ``start``/``end`` offsets refer to ``text``.
+
+    Unless ``mode`` is "ner", an ``{"original_text": text}`` entry is
+    appended for the vocabulary rules in ``normalize_entities``; in "rules"
+    mode that entry is all there is and the model isn't touched.
+    """
+    mode = extraction_mode(mode)
     out = []
-    for c in chunks:
-        try:
-            out.extend(ner(c))
-        except Exception:
-            # On some environments HF pipeline may error for very long sequences; ignore chunk errors.
-            pass
-    
+    if mode != "rules":
+        ner = get_ner()
+        windows = chunk_text(text, getattr(ner, "tokenizer", None), stride=stride)
+        out = _merge_windows(windows, _infer(ner, windows, batch_size)) if windows else []
+        inc("ner_chunks", len(windows))
+        inc("ner_entities", len(out))
+
     # Add the original text to the results for enhanced skill extraction
-    if out:
+    if mode != "ner" and text:
         out.append({"original_text": text})
     
     return out
 
 
+def iter_entities(segments, batch_size=None, stride=NER_STRIDE, mode=None):
+    """Run NER over an iterable of text segments as they arrive.
+
+    Yields ``(segment, entities)`` per segment, with entity offsets relative
+    to the segments joined by newlines (as ``resume_parser.extract_text``
+    joins them). Nothing is kept once a segment has been yielded. In
+    "rules" mode every segment comes back with no entities. ``batch_size``
+    works as in ``extract_entities``.
+    """
+    use_model = extraction_mode(mode) != "rules"
+    ner = None
+    offset = 0
+    for segment in segments:
+        ents = []
+        if use_model and segment.strip():
+            ner = ner or get_ner()
+            windows = chunk_text(segment, getattr(ner, "tokenizer", None), stride=stride)
+            ents = _merge_windows(windows, _infer(ner, windows, batch_size))
+            inc("ner_chunks", len(windows))
+            inc("ner_entities", len(ents))
+            for e in ents:
+                if e.get("start") is not None:
+                    e["start"] += offset
+                    e["end"] += offset
+        yield segment, ents
+        offset += len(segment) + 1
+
+
 def _clean_token(w: str) -> str:
     w = re.sub(r"\s+", " ", w.replace("##", "")).strip(" -–·•")
     return w
 
 
-def normalize_entities(ents: list) -> dict:
-    data = {
-        "skills": [],
-        "job_titles": [],
-        "companies": [],
-        "education": [],
-        "projects": [],
-        "years_of_experience": [],
-        "certifications": [],
-        "achievements": []
-    }
-
-    # Enhanced skill recognition patterns - Comprehensive Tech and Non-Tech Skills
-    skill_patterns = {
-        # Programming Languages
-        "programming_languages": [
-            "python", "javascript", "java", "c++", "c#", "go", "rust", "swift", "kotlin", 
-            "php", "ruby", "scala", "r", "matlab", "dart", "typescript", "html", "css",
-            "sql", "bash", "powershell", "lua", "perl", "assembly", "cobol", "fortran",
-            "groovy", "clojure", "haskell", "erlang", "elixir", "crystal", "nim", "zig",
-            "v", "julia", "d", "ada", "pascal", "basic", "delphi", "objective-c"
-        ],
-        
-        # Web Technologies
-        "web_technologies": [
-            "html", "css", "javascript", "typescript", "react", "angular", "vue", "svelte",
-            "next.js", "nuxt.js", "gatsby", "ember", "backbone", "jquery", "bootstrap",
-            "tailwind css", "material-ui", "antd", "chakra ui", "styled-components",
-            "sass", "less", "stylus", "webpack", "vite", "parcel", "babel", "eslint"
-        ],
-        
-        # Backend Frameworks
-        "backend_frameworks": [
-            "node.js", "express", "django", "flask", "fastapi", "spring boot", "spring",
-            "laravel", "rails", "asp.net", "dotnet", "gin", "echo", "fiber", "chi",
-            "koa", "hapi", "sails", "meteor", "strapi", "nest.js", "adonis", "phoenix",
-            "play framework", "akka", "vert.x", "micronaut", "quarkus", "grails"
-        ],
-        
-        # Databases
-        "databases": [
-            "mysql", "postgresql", "mongodb", "redis", "sqlite", "oracle", "sql server",
-            "mariadb", "cassandra", "dynamodb", "firebase", "elasticsearch", "neo4j",
-            "couchdb", "rethinkdb", "influxdb", "timescaledb", "cockroachdb", "yugabyte",
-            "scylla", "clickhouse", "snowflake", "bigquery", "redshift", "aurora"
-        ],
-        
-        # Cloud Platforms
-        "cloud_platforms": [
-            "aws", "azure", "google cloud", "gcp", "heroku", "digitalocean", "linode",
-            "vultr", "ibm cloud", "oracle cloud", "alibaba cloud", "firebase", "vercel",
-            "netlify", "cloudflare", "scaleway", "ovh", "rackspace", "upcloud", "exoscale"
-        ],
-        
-        # DevOps Tools
-        "devops_tools": [
-            "docker", "kubernetes", "jenkins", "gitlab", "github actions", "circleci",
-            "travis ci", "ansible", "terraform", "chef", "puppet", "vagrant", "prometheus",
-            "grafana", "elk stack", "datadog", "new relic", "splunk", "nagios", "zabbix",
-            "consul", "vault", "nomad", "helm", "istio", "linkerd", "argocd", "flux",
-            "tekton", "spinnaker", "octopus deploy", "teamcity", "bamboo", "gitlab ci"
-        ],
-        
-        # Data Science & Analytics
-        "data_science": [
-            "python", "r", "julia", "matlab", "sas", "spss", "stata", "power bi", "tableau",
-            "excel", "sql", "spark", "hadoop", "kafka", "airflow", "mlflow", "jupyter",
-            "rstudio", "colab", "databricks", "snowflake", "redshift", "bigquery",
-            "pandas", "numpy", "scipy", "scikit-learn", "tensorflow", "pytorch", "keras",
-            "xgboost", "lightgbm", "catboost", "matplotlib", "seaborn", "plotly", "bokeh",
-            "d3.js", "ggplot2", "shiny", "streamlit", "gradio", "dash", "looker", "qlik"
-        ],
-        
-        # Machine Learning & AI
-        "machine_learning": [
-            "tensorflow", "pytorch", "keras", "scikit-learn", "xgboost", "lightgbm",
-            "catboost", "fastai", "hugging face", "transformers", "spacy", "nltk",
-            "opencv", "pillow", "scikit-image", "pytorch lightning", "wandb", "mlflow",
-            "kubeflow", "sagemaker", "vertex ai", "azure ml", "databricks", "h2o",
-            "rapids", "dask", "vaex", "modin", "ray", "horovod", "deepspeed"
-        ],
-        
-        # Mobile Development
-        "mobile_development": [
-            "swift", "kotlin", "java", "dart", "react native", "flutter", "xamarin",
-            "ionic", "cordova", "phonegap", "xcode", "android studio", "firebase",
-            "onesignal", "branch", "appsflyer", "mixpanel", "amplitude", "segment",
-            "fastlane", "codepush", "app center", "testflight", "play console"
-        ],
-        
-        # Game Development
-        "game_development": [
-            "unity", "unreal engine", "godot", "cryengine", "lumberyard", "c#", "c++",
-            "lua", "python", "blender", "maya", "3ds max", "zbrush", "substance painter",
-            "houdini", "nuke", "after effects", "premiere", "audacity", "fmod", "wwise",
-            "steam", "epic games", "itch.io", "game maker", "construct", "rpg maker"
-        ],
-        
-        # Cybersecurity
-        "cybersecurity": [
-            "kali linux", "metasploit", "nmap", "wireshark", "burp suite", "owasp",
-            "penetration testing", "ethical hacking", "vulnerability assessment",
-            "siem", "splunk", "qradar", "logrhythm", "exabeam", "sentinel", "soc",
-            "incident response", "forensics", "autopsy", "volatility", "ftk", "encase",
-            "nessus", "qualys", "openvas", "nexpose", "rapid7", "tenable", "crowdstrike",
-            "carbon black", "sentinelone", "cylance", "palo alto", "fortinet", "checkpoint"
-        ],
-        
-        # Blockchain & Web3
-        "blockchain_web3": [
-            "ethereum", "bitcoin", "solidity", "rust", "web3.js", "ethers.js", "hardhat",
-            "truffle", "remix", "ganache", "metamask", "walletconnect", "ipfs", "filecoin",
-            "polygon", "solana", "polkadot", "cardano", "binance smart chain", "avalanche",
-            "arbitrum", "optimism", "uniswap", "compound", "aave", "curve", "opensea",
-            "nft", "defi", "dao", "smart contracts", "consensus", "mining", "staking"
-        ],
-        
-        # UI/UX Design
-        "ui_ux_design": [
-            "figma", "adobe xd", "sketch", "invision", "adobe photoshop", "adobe illustrator",
-            "wireframing", "prototyping", "user research", "usability testing", "user experience",
-            "user interface", "design systems", "visual design", "typography", "color theory",
-            "layout design", "accessibility", "ui design", "ux design", "flutter flow",
-            "framer", "principle", "protopie", "axure rp", "balsamiq", "marvel", "zeplin",
-            "abstract", "lucidchart", "draw.io", "whimsical", "mural", "miro", "notion"
-        ],
-        
-        # Business & Productivity Tools
-        "business_tools": [
-            "excel", "powerpoint", "word", "outlook", "sharepoint", "teams", "slack",
-            "zoom", "microsoft office", "google workspace", "salesforce", "hubspot",
-            "jira", "confluence", "monday.com", "asana", "trello", "notion", "airtable",
-            "clickup", "wrike", "smartsheet", "basecamp", "podio", "zoho", "freshdesk",
-            "intercom", "zendesk", "pipedrive", "close", "salesforce", "dynamics 365"
-        ],
-        
-        # Project Management
-        "project_management": [
-            "agile", "scrum", "kanban", "lean", "six sigma", "prince2", "pmp", "pmi",
-            "waterfall", "sprint planning", "user stories", "epics", "backlog", "retrospectives",
-            "daily standups", "sprint reviews", "sprint retrospectives", "story points",
-            "velocity", "burndown charts", "gantt charts", "critical path", "risk management",
-            "stakeholder management", "change management", "resource management"
-        ],
-        
-        # Soft Skills
-        "soft_skills": [
-            "leadership", "communication", "teamwork", "collaboration", "problem solving",
-            "critical thinking", "creativity", "adaptability", "flexibility", "time management",
-            "organization", "planning", "decision making", "negotiation", "conflict resolution",
-            "emotional intelligence", "empathy", "active listening", "presentation skills",
-            "public speaking", "mentoring", "coaching", "facilitation", "influence",
-            "networking", "relationship building", "customer service", "sales", "marketing"
-        ],
-        
-        # Domain Knowledge
-        "domain_knowledge": [
-            "finance", "banking", "insurance", "healthcare", "pharmaceuticals", "biotechnology",
-            "manufacturing", "logistics", "supply chain", "retail", "e-commerce", "real estate",
-            "education", "government", "non-profit", "consulting", "legal", "media",
-            "entertainment", "gaming", "sports", "fitness", "food", "beverage", "automotive",
-            "aerospace", "defense", "energy", "utilities", "telecommunications", "transportation"
-        ],
-        
-        # Operating Systems
-        "operating_systems": [
-            "linux", "ubuntu", "centos", "red hat", "debian", "fedora", "arch linux",
-            "windows", "windows server", "macos", "ios", "android", "chrome os",
-            "freebsd", "openbsd", "netbsd", "solaris", "aix", "hp-ux", "unix"
-        ],
-        
-        # Networking
-        "networking": [
-            "tcp/ip", "dns", "dhcp", "http", "https", "ftp", "smtp", "pop3", "imap",
-            "ssh", "telnet", "vpn", "firewall", "load balancing", "routing", "switching",
-            "vlans", "subnetting", "cidr", "bgp", "ospf", "eigrp", "mpls", "sdn",
-            "nfv", "5g", "wifi", "bluetooth", "ethernet", "fiber", "coaxial"
-        ],
-        
-        # Testing & Quality Assurance
-        "testing_qa": [
-            "unit testing", "integration testing", "system testing", "acceptance testing",
-            "regression testing", "performance testing", "load testing", "stress testing",
-            "security testing", "penetration testing", "usability testing", "accessibility testing",
-            "junit", "testng", "pytest", "jest", "mocha", "chai", "selenium", "cypress",
-            "playwright", "appium", "postman", "soapui", "jmeter", "gatling", "k6",
-            "sonarqube", "codecov", "coveralls", "jenkins", "gitlab ci", "github actions"
-        ],
-        
-        # Version Control
-        "version_control": [
-            "git", "github", "gitlab", "bitbucket", "svn", "mercurial", "perforce",
-            "git flow", "git hooks", "git submodules", "git lfs", "github pages",
-            "gitlab pages", "github actions", "gitlab ci", "bitbucket pipelines"
-        ],
-        
-        # Monitoring & Observability
-        "monitoring_observability": [
-            "prometheus", "grafana", "elk stack", "elasticsearch", "logstash", "kibana",
-            "datadog", "new relic", "splunk", "dynatrace", "appdynamics", "instana",
-            "jaeger", "zipkin", "opentelemetry", "cloudwatch", "azure monitor",
-            "stackdriver", "nagios", "zabbix", "icinga", "sensu", "consul", "etcd"
-        ]
-    }
+# Summary field fed by each vocabulary.
+_VOCABULARIES = (
+    ("skills", [skill for skills in SKILL_PATTERNS.values() for skill in skills]),
+    ("certifications", CERT_PATTERNS),
+    ("education", EDUCATION_PATTERNS),
+    ("achievements", ACHIEVEMENT_PATTERNS),
+    ("projects", PROJECT_PATTERNS),
+    ("companies", COMPANY_PATTERNS),
+    ("job_titles", JOB_TITLE_PATTERNS),
+)
 
-    for e in ents:
-        label = e.get("entity_group", e.get("entity", "")).upper()
-        word = _clean_token(e.get("word", ""))
-        if not word:
-            continue
-        if "SKILL" in label:
-            data["skills"].append(word)
-        elif any(x in label for x in ("DESIGNATION", "JOB", "TITLE")):
-            data["job_titles"].append(word)
-        elif any(x in label for x in ("COMPANY", "ORG")):
-            data["companies"].append(word)
-        elif any(x in label for x in ("DEGREE", "COLLEGE", "EDU", "UNIV")):
-            data["education"].append(word)
-        elif "PROJECT" in label:
-            data["projects"].append(word)
-        elif "YEAR" in label or "EXPERIENCE" in label:
-            data["years_of_experience"].append(word)
-        elif "CERTIFICATION" in label or "CERT" in label:
-            data["certifications"].append(word)
-        elif "ACHIEVEMENT" in label or "AWARD" in label:
-            data["achievements"].append(word)
-
-    # Enhanced skill extraction from text patterns
-    def extract_skills_from_text(text):
-        skills_found = []
-        text_lower = text.lower()
-        
-        # Extract skills from all categories
-        for category, skills in skill_patterns.items():
-            for skill in skills:
-                if skill.lower() in text_lower:
-                    skills_found.append(skill)
-        
-        return skills_found
-
-    def extract_additional_info(text, data):
-        """Extract additional information like certifications, achievements, etc."""
-        text_lower = text.lower()
-        
-        # Extract certifications
-        cert_patterns = [
-            "certification", "certified", "cert", "nptel", "linkedin", "ibm", "microsoft",
-            "aws", "azure", "google", "oracle", "cisco", "comptia", "arcel", "pmp", "prince2",
-            "scrum", "agile", "six sigma", "lean", "itil", "cobit", "iso", "gdpr", "sox",
-            "hipaa", "pci dss", "ccna", "ccnp", "ccie", "mcse", "mcp", "mta", "mcts",
-            "rhcsa", "rhce", "lpic", "cka", "ckad", "cks", "terraform", "ansible", "docker",
-            "kubernetes", "jenkins", "gitlab", "github", "salesforce", "hubspot", "tableau",
-            "power bi", "snowflake", "databricks", "sagemaker", "vertex ai", "azure ml"
-        ]
-        
-        # Extract achievements
-        achievement_patterns = [
-            "nasa hackathon", "flutter flow workshop", "hackathon", "workshop",
-            "award", "recognition", "achievement", "winner", "finalist",
-            "ui/ux design", "rapid prototyping", "hands-on ui/ux design",
-            "competition", "contest", "challenge", "innovation", "excellence",
-            "outstanding", "distinguished", "merit", "honor", "scholarship",
-            "fellowship", "grant", "research", "publication", "patent", "invention",
-            "conference", "presentation", "speaker", "panelist", "mentor", "volunteer",
-            "community service", "leadership", "student government", "club president",
-            "team captain", "project lead", "technical lead", "architect", "expert"
-        ]
-        
-        # Extract projects
-        project_patterns = [
-            "interactive sales analytics dashboard", "weather app", 
-            "postgraduate project management system", "mern stack",
-            "power bi", "sql", "dax", "docker", "jenkins", "kubernetes",
-            "ui/ux design", "rapid prototyping", "flutter flow",
-            "project", "application", "system", "platform", "website", "app",
-            "dashboard", "portal", "api", "service", "tool", "framework", "library",
-            "plugin", "extension", "module", "component", "feature", "functionality",
-            "automation", "script", "bot", "chatbot", "ai", "machine learning",
-            "data analysis", "visualization", "reporting", "monitoring", "tracking",
-            "inventory", "e-commerce", "crm", "erp", "cms", "lms", "blog", "forum",
-            "social media", "game", "simulation", "model", "algorithm", "database",
-            "mobile app", "web app", "desktop app", "cloud", "server", "client"
-        ]
-        
-        # Extract companies
-        company_patterns = [
-            "electronic arts", "ea sports", "deloitte australia", "forage",
-            "vnr vignana jyothi institute", "technology", "microsoft", "google", "apple",
-            "amazon", "meta", "facebook", "netflix", "uber", "lyft", "airbnb", "spotify",
-            "slack", "zoom", "salesforce", "adobe", "oracle", "ibm", "intel", "amd",
-            "nvidia", "cisco", "vmware", "red hat", "canonical", "docker", "hashicorp",
-            "databricks", "snowflake", "palantir", "stripe", "square", "paypal", "visa",
-            "mastercard", "goldman sachs", "jpmorgan", "morgan stanley", "bank of america",
-            "wells fargo", "citigroup", "deloitte", "pwc", "ey", "kpmg", "accenture",
-            "infosys", "tcs", "wipro", "cognizant", "hcl", "tech mahindra", "capgemini",
-            "atos", "nvidia", "amd", "qualcomm", "broadcom", "marvell", "micron",
-            "samsung", "lg", "sony", "panasonic", "philips", "siemens", "ge", "bosch",
-            "volkswagen", "bmw", "mercedes", "toyota", "honda", "ford", "gm", "tesla",
-            "spacex", "blue origin", "virgin galactic", "boeing", "airbus", "lockheed",
-            "raytheon", "northrop grumman", "general dynamics", "bae systems"
-        ]
-        
-        # Extract job titles
-        job_title_patterns = [
-            "software engineering", "virtual experience", "technology virtual experience",
-            "software engineer", "developer", "analyst", "consultant", "architect",
-            "manager", "director", "vp", "cto", "ceo", "founder", "co-founder",
-            "lead", "senior", "junior", "associate", "principal", "staff", "fellow",
-            "intern", "internship", "apprentice", "trainee", "graduate", "entry level",
-            "mid level", "senior level", "executive", "chief", "head", "coordinator",
-            "specialist", "expert", "guru", "ninja", "rockstar", "evangelist",
-            "advocate", "ambassador", "mentor", "coach", "trainer", "instructor",
-            "professor", "lecturer", "researcher", "scientist", "data scientist",
-            "machine learning engineer", "ai engineer", "devops engineer", "sre",
-            "site reliability engineer", "cloud engineer", "security engineer",
-            "network engineer", "systems engineer", "qa engineer", "test engineer",
-            "automation engineer", "frontend developer", "backend developer",
-            "full stack developer", "mobile developer", "game developer", "ui designer",
-            "ux designer", "product manager", "project manager", "scrum master",
-            "business analyst", "data analyst", "financial analyst", "market analyst",
-            "sales representative", "account manager", "customer success", "support",
-            "operations", "administrator", "coordinator", "assistant", "clerk"
-        ]
-        
-        # Check for patterns and add to data
-        for pattern in cert_patterns:
-            if pattern in text_lower:
-                # Find the full certification name
-                lines = text.split('\n')
-                for line in lines:
-                    if pattern in line.lower():
-                        data["certifications"].append(line.strip())
-                        break
-        
-        # Extract education information
-        education_patterns = [
-            "university", "college", "institute", "school", "academy", "bachelor", "master",
-            "phd", "doctorate", "diploma", "certificate", "degree", "b.tech", "m.tech",
-            "b.e", "m.e", "b.sc", "m.sc", "b.com", "m.com", "b.ba", "m.ba", "mba",
-            "bca", "mca", "b.arch", "m.arch", "llb", "llm", "md", "mbbs", "pharmacy",
-            "engineering", "computer science", "information technology", "data science",
-            "business administration", "management", "finance", "marketing", "economics",
-            "mathematics", "physics", "chemistry", "biology", "medicine", "law", "arts",
-            "humanities", "social sciences", "psychology", "sociology", "political science"
-        ]
-        
-        for pattern in education_patterns:
-            if pattern in text_lower:
-                lines = text.split('\n')
-                for line in lines:
-                    if pattern in line.lower():
-                        data["education"].append(line.strip())
-                        break
-        
-        for pattern in achievement_patterns:
-            if pattern in text_lower:
-                lines = text.split('\n')
-                for line in lines:
-                    if pattern in line.lower():
-                        data["achievements"].append(line.strip())
-                        break
-        
-        for pattern in project_patterns:
-            if pattern in text_lower:
-                lines = text.split('\n')
-                for line in lines:
-                    if pattern in line.lower():
-                        data["projects"].append(line.strip())
-                        break
-        
-        for pattern in company_patterns:
-            if pattern in text_lower:
-                lines = text.split('\n')
-                for line in lines:
-                    if pattern in line.lower():
-                        data["companies"].append(line.strip())
-                        break
-        
-        for pattern in job_title_patterns:
-            if pattern in text_lower:
-                lines = text.split('\n')
-                for line in lines:
-                    if pattern in line.lower():
-                        data["job_titles"].append(line.strip())
-                        break
+# All vocabularies compiled once into a single automaton; each phrase is
+# tagged with the summary field(s) it belongs to.
+VOCABULARY_MATCHER = PhraseMatcher(
+    (phrase, field) for field, phrases in _VOCABULARIES for phrase in phrases
+).build()
+
+
+def find_vocabulary(text: str) -> list:
+    """Return ``(start, end, phrase, fields)`` for every vocabulary hit in ``text``."""
+    hits = VOCABULARY_MATCHER.findall(text)
+    inc("pattern_hits", len(hits))
+    return hits
+
+
+SUMMARY_FIELDS = (
+    "skills",
+    "job_titles",
+    "companies",
+    "education",
+    "projects",
+    "years_of_experience",
+    "certifications",
+    "achievements",
+)
+
+
+def _entity_field(label: str):
+    """Summary field an NER label feeds, or None."""
+    if "SKILL" in label:
+        return "skills"
+    elif any(x in label for x in ("DESIGNATION", "JOB", "TITLE")):
+        return "job_titles"
+    elif any(x in label for x in ("COMPANY", "ORG")):
+        return "companies"
+    elif any(x in label for x in ("DEGREE", "COLLEGE", "EDU", "UNIV")):
+        return "education"
+    elif "PROJECT" in label:
+        return "projects"
+    elif "YEAR" in label or "EXPERIENCE" in label:
+        return "years_of_experience"
+    elif "CERTIFICATION" in label or "CERT" in label:
+        return "certifications"
+    elif "ACHIEVEMENT" in label or "AWARD" in label:
+        return "achievements"
+    return None
+
+
+class SummaryBuilder:
+    """Folds entities and text into a resume summary incrementally.
+
+    Feed it NER entities and text segments as they become available; only
+    the distinct values found so far are kept, so memory is bounded by the
+    vocabulary rather than by the document.
+    """
+
+    def __init__(self):
+        self._data = {field: set() for field in SUMMARY_FIELDS}
+        # (field, keyword) pairs already credited to a line
+        self._seen_keywords = set()
+
+    def add_entities(self, ents):
+        for e in ents:
+            label = e.get("entity_group", e.get("entity", "")).upper()
+            word = _clean_token(e.get("word", ""))
+            if not word:
+                continue
+            field = _entity_field(label)
+            if field:
+                self._data[field].add(word)
+
+    def add_text(self, text: str):
+        """Run the vocabulary rules over one piece of the resume text.
+
+        Vocabulary skills are added directly. For the other fields each
+        keyword hit is mapped straight to the line containing it, and the
+        first line mentioning a keyword is kept for every field it feeds.
+        """
+        if not text:
+            return
+        hits = find_vocabulary(text)
+        lines = None
+        for start, _, phrase, fields in hits:
+            for field in fields:
+                if field == "skills":
+                    self._data["skills"].add(phrase)
+                    continue
+                if (field, phrase) in self._seen_keywords:
+                    continue
+                self._seen_keywords.add((field, phrase))
+                if lines is None:
+                    lines = LineIndex(text)
+                self._data[field].add(lines.line_at(start).strip())
+
+    def summary(self) -> dict:
+        return {field: sorted(values, key=str.lower) for field, values in self._data.items()}
+
+
+@timed("normalize_entities")
+def normalize_entities(ents: list) -> dict:
+    builder = SummaryBuilder()
+    builder.add_entities(ents)
 
     # Add extracted skills to the data
     original_text = ""
@@ -433,13 +502,6 @@ def normalize_entities(ents: list) -> dict:
             elif e.get('word'):
                 original_text += " " + e.get('word', '')
     
-    if original_text:
-        additional_skills = extract_skills_from_text(original_text)
-        data["skills"].extend(additional_skills)
-        
-        # Extract additional information from text patterns
-        extract_additional_info(original_text, data)
-
-    for k in data:
-        data[k] = sorted(set(data[k]), key=str.lower)
-    return data
\ No newline at end of file
+    # Extract additional information from text patterns
+    builder.add_text(original_text)
+    return builder.summary()
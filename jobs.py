@@ -0,0 +1,186 @@
+# jobs.py
+import itertools
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from iextract import NER_BATCHER
+from metrics import request_scope
+from pipeline import analyze_resume
+
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class Job:
+    """One queued analysis. Workers update it; readers take ``snapshot()``."""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = QUEUED
+        self.stage = None
+        self.progress = 0
+        self.result = None
+        self.error = None
+        self.failed_stage = None
+        self.timings = {}
+        self.counters = {}
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._stage_started = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def _update(self, stage, percent):
+        now = time.perf_counter()
+        with self._lock:
+            if self.stage is not None and self._stage_started is not None:
+                self.timings[self.stage] = now - self._stage_started
+            self.stage = stage
+            self.progress = percent
+            self._stage_started = now
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        """Block until the job finishes; returns False on timeout."""
+        return self._done.wait(timeout)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "id": self.id,
+                "status": self.status,
+                "stage": self.stage,
+                "progress": self.progress,
+                "error": self.error,
+                "failed_stage": self.failed_stage,
+                "timings": dict(self.timings),
+                "counters": dict(self.counters),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class JobQueue:
+    """In-process analysis queue backed by a thread pool.
+
+    ``submit`` returns a job id straight away; the pipeline runs on one of
+    ``max_workers`` threads and reports each stage through the job, so a UI
+    can poll ``status`` instead of blocking on the work. Text extraction and
+    career-path generation run freely, but at most ``max_ner_concurrency``
+    jobs run the shared NER model at once. Finished jobs are kept for
+    ``retention`` seconds (and at most ``max_finished`` of them).
+    """
+
+    def __init__(self, max_workers=4, max_ner_concurrency=1, retention=3600, max_finished=256):
+        self.retention = retention
+        self.max_finished = max_finished
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="intellipath-job")
+        self._ner_slots = threading.BoundedSemaphore(max_ner_concurrency)
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, data: bytes, filename: str, preferences=None, mode=None) -> str:
+        """Queue an analysis of an uploaded file and return its job id.
+        ``preferences=None`` stops after the summary (no plan); ``mode`` is
+        the extraction mode (see ``iextract.EXTRACTION_MODES``)."""
+        job = Job(uuid.uuid4().hex)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, data, filename, preferences, mode)
+        return job.id
+
+    def _run(self, job, data, filename, preferences, mode):
+        with job._lock:
+            job.status = RUNNING
+            job.started_at = time.time()
+        try:
+            with request_scope("analyze", job=job.id, filename=filename) as record:
+                job.counters = record["counters"]
+                result = analyze_resume(
+                    data, filename, preferences, progress=job._update, ner_slots=self._ner_slots,
+                    mode=mode,
+                )
+        except Exception as e:
+            with job._lock:
+                job.status = FAILED
+                job.failed_stage = job.stage
+                job.error = f"{type(e).__name__}: {e}"
+        else:
+            with job._lock:
+                job.result = result
+                job.status = DONE
+        finally:
+            with job._lock:
+                job.finished_at = time.time()
+            job._done.set()
+
+    @property
+    def ner_slots(self) -> threading.BoundedSemaphore:
+        """The semaphore bounding NER use; other entry points in the process
+        (e.g. the HTTP API) share it so the limit holds across all of them."""
+        return self._ner_slots
+
+    def get(self, job_id) -> Job:
+        """The job with ``job_id``; raises KeyError if unknown or expired."""
+        with self._lock:
+            return self._jobs[job_id]
+
+    def status(self, job_id) -> dict:
+        return self.get(job_id).snapshot()
+
+    def result(self, job_id, timeout=None):
+        """Wait for the job and return its result dict (None if it failed)."""
+        job = self.get(job_id)
+        job.wait(timeout)
+        return job.result
+
+    def _prune(self):
+        now = time.time()
+        finished = [j for j in self._jobs.values() if j.finished]
+        expired = [j for j in finished if now - j.finished_at > self.retention]
+        finished.sort(key=lambda j: j.finished_at)
+        overflow = finished[:max(len(finished) - self.max_finished, 0)]
+        for job in itertools.chain(expired, overflow):
+            self._jobs.pop(job.id, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return counts
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """The process-wide queue, created on first use. Every Streamlit session
+    shares it, so INTELLIPATH_NER_CONCURRENCY bounds model use across users.
+
+    With NER micro-batching on, only the batcher thread touches the model, so
+    by default every worker may submit windows and they share forward passes.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            workers = int(os.environ.get("INTELLIPATH_JOB_WORKERS", "4"))
+            default_slots = workers if NER_BATCHER is not None else 1
+            _queue = JobQueue(
+                max_workers=workers,
+                max_ner_concurrency=int(os.environ.get("INTELLIPATH_NER_CONCURRENCY", default_slots)),
+            )
+        return _queue
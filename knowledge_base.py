@@ -0,0 +1,107 @@
+# knowledge_base.py
+import json
+import os
+from types import MappingProxyType
+
+
+# Versioned data file holding every vocabulary used by iextract and generator.
+# Point INTELLIPATH_KB_PATH at another .json (or .yaml, if PyYAML is
+# installed) file to swap it without touching code.
+KB_PATH = os.environ.get(
+    "INTELLIPATH_KB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "knowledge_base.json"),
+)
+
+
+def _read(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError as e:
+                raise RuntimeError(f"PyYAML is required to load {path}") from e
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+def _freeze(obj):
+    """Recursively turn dicts into read-only mappings and lists into tuples."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(_freeze(v) for v in obj)
+    return obj
+
+
+def _invert(mapping) -> MappingProxyType:
+    """``{group: [item, ...]}`` -> ``{item.lower(): frozenset(groups)}``."""
+    index = {}
+    for group, items in mapping.items():
+        for item in items:
+            index.setdefault(item.lower(), set()).add(group)
+    return MappingProxyType({k: frozenset(v) for k, v in index.items()})
+
+
+_data = _read(KB_PATH)
+
+VERSION = _data["version"]
+
+# --- Resume vocabularies (iextract) ---
+SKILL_PATTERNS = _freeze(_data["skill_patterns"])
+CERT_PATTERNS = _freeze(_data["vocabularies"]["certifications"])
+EDUCATION_PATTERNS = _freeze(_data["vocabularies"]["education"])
+ACHIEVEMENT_PATTERNS = _freeze(_data["vocabularies"]["achievements"])
+PROJECT_PATTERNS = _freeze(_data["vocabularies"]["projects"])
+COMPANY_PATTERNS = _freeze(_data["vocabularies"]["companies"])
+JOB_TITLE_PATTERNS = _freeze(_data["vocabularies"]["job_titles"])
+
+# Every known skill, lowercased, and the skill_patterns categories it sits in.
+ALL_SKILLS = frozenset(s.lower() for skills in SKILL_PATTERNS.values() for s in skills)
+SKILL_TO_CATEGORIES = _invert(SKILL_PATTERNS)
+
+# --- Career tracks (generator) ---
+CAREER_TRACKS = _freeze(_data["career_tracks"])
+SKILL_REQUIREMENTS = _freeze(_data["skill_requirements"])
+SKILL_CATEGORIES = _freeze(_data["skill_categories"])
+DEFAULT_TRACK = "Software Development"
+
+# keyword -> tracks listing it
+KEYWORD_TO_TRACKS = _invert({track: info["keywords"] for track, info in CAREER_TRACKS.items()})
+
+# track -> category -> ((required skill, lowercased), ...)
+REQUIRED_SKILLS_LOWER = MappingProxyType({
+    track: MappingProxyType({
+        category: tuple((skill, skill.lower()) for skill in skills)
+        for category, skills in req["core_skills"].items()
+    })
+    for track, req in SKILL_REQUIREMENTS.items()
+})
+
+# Which kind of stage-1 recommendation a missing skill gets, by the
+# skill_categories group it is listed under.
+_STAGE_ROLES = (
+    ("foundation", ("languages", "core_languages", "analytical_tools")),
+    ("hands_on", ("tools", "platforms", "methodologies")),
+    ("principles", ("concepts", "skills", "domains")),
+)
+
+# track -> skill -> role (first matching role wins, as in the original if/elif chain)
+SKILL_STAGE_ROLE = MappingProxyType({
+    track: MappingProxyType({
+        skill: role
+        for role, groups in reversed(_STAGE_ROLES)
+        for group in groups
+        for skill in categories.get(group, ())
+    })
+    for track, categories in SKILL_CATEGORIES.items()
+})
+
+# track -> ((skill, lowercased), ...) in declaration order, duplicates dropped
+TRACK_SKILLS_LOWER = MappingProxyType({
+    track: tuple((s, s.lower()) for s in dict.fromkeys(
+        skill for skills in categories.values() for skill in skills
+    ))
+    for track, categories in SKILL_CATEGORIES.items()
+})
+
+del _data
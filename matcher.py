@@ -0,0 +1,201 @@
+# matcher.py
+import re
+from bisect import bisect_right
+from collections import deque
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton over a fixed vocabulary of phrases.
+
+    Phrases are matched case-insensitively in a single pass over the text,
+    however many there are. A match only counts when it isn't glued to
+    surrounding letters or digits (so "r" or "go" don't fire inside other
+    words); phrase edges that are punctuation, like the end of "c++", don't
+    need a boundary.
+    """
+
+    def __init__(self, phrases=()):
+        # Node 0 is the root. _goto[n] maps a character to the next node,
+        # _out[n] lists the ids of phrases ending at n (including via fail links).
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._phrases = []
+        self._tags = []
+        self._tag_tuples = []
+        self._ids = {}
+        self._built = False
+        for phrase, tag in phrases:
+            self.add(phrase, tag)
+
+    def add(self, phrase: str, tag=None):
+        """Add ``phrase`` to the vocabulary; ``tag`` is reported with each match."""
+        key = phrase.lower()
+        if not key:
+            return
+        pid = self._ids.get(key)
+        if pid is None:
+            pid = len(self._phrases)
+            self._ids[key] = pid
+            self._phrases.append(key)
+            self._tags.append([])
+            node = 0
+            for ch in key:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node].append(pid)
+            self._built = False
+        if tag is not None and tag not in self._tags[pid]:
+            self._tags[pid].append(tag)
+            self._built = False
+
+    def build(self):
+        """Compute failure links; called automatically before the first search."""
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque()
+        for nxt in goto[0].values():
+            fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in goto[node].items():
+                queue.append(nxt)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                target = goto[f].get(ch, 0)
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] = out[nxt] + [p for p in out[fail[nxt]] if p not in out[nxt]]
+        self._tag_tuples = [tuple(t) for t in self._tags]
+        self._built = True
+        return self
+
+    def __len__(self):
+        return len(self._phrases)
+
+    def finditer(self, text: str):
+        """Yield ``(start, end, phrase, tags)`` for every whole-word match.
+
+        Overlapping matches are all reported ("google" and "google cloud").
+        Offsets index into ``text``.
+        """
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        phrases, tags = self._phrases, self._tag_tuples
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters change length when lowercased; fall back to a
+            # per-character lowering so offsets still line up with ``text``.
+            lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        n = len(lowered)
+        node = 0
+        for i, ch in enumerate(lowered):
+            nxt = goto[node].get(ch)
+            while nxt is None and node:
+                node = fail[node]
+                nxt = goto[node].get(ch)
+            node = nxt or 0
+            if not out[node]:
+                continue
+            end = i + 1
+            for pid in out[node]:
+                phrase = phrases[pid]
+                start = end - len(phrase)
+                if _is_word_char(phrase[0]) and start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                if _is_word_char(phrase[-1]) and end < n and _is_word_char(lowered[end]):
+                    continue
+                yield start, end, phrase, tags[pid]
+
+    def findall(self, text: str):
+        return list(self.finditer(text))
+
+
+class LineIndex:
+    """Line boundaries of a document, computed once.
+
+    Maps any character offset (e.g. a ``PhraseMatcher`` hit) to the line that
+    contains it without re-splitting the text.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.split("\n")
+        self.starts = []
+        pos = 0
+        for line in self.lines:
+            self.starts.append(pos)
+            pos += len(line) + 1
+
+    def __len__(self):
+        return len(self.lines)
+
+    def line_number(self, offset: int) -> int:
+        """Zero-based number of the line containing ``offset``."""
+        return bisect_right(self.starts, offset) - 1
+
+    def line_at(self, offset: int) -> str:
+        """The line containing ``offset``, without its newline."""
+        return self.lines[self.line_number(offset)]
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def phrase_tokens(text: str) -> tuple:
+    """Lowercase word tokens of ``text``; "Node.js" -> ("node", "js"), "C++" -> ("c++",)."""
+    return tuple(_TOKEN_RE.findall(text.lower()))
+
+
+def _ngrams(tokens: tuple, max_n: int):
+    n = len(tokens)
+    for size in range(1, min(n, max_n) + 1):
+        for i in range(n - size + 1):
+            yield tokens[i:i + size]
+
+
+class NgramIndex:
+    """Inverted index from phrases to payloads with token-level partial matching.
+
+    ``match(text)`` returns the payloads of every indexed phrase that is a
+    run of whole tokens inside ``text`` ("python" in "python scripting") or
+    that contains ``text`` as a run of whole tokens ("learning" in "machine
+    learning"). Lookups cost a handful of dict probes per n-gram of ``text``,
+    independent of how many phrases are indexed.
+    """
+
+    def __init__(self, entries=()):
+        self._exact = {}
+        self._partial = {}
+        self._max_n = 0
+        for phrase, payload in entries:
+            self.add(phrase, payload)
+
+    def add(self, phrase: str, payload):
+        tokens = phrase_tokens(phrase)
+        if not tokens:
+            return
+        self._exact.setdefault(tokens, set()).add(payload)
+        for gram in set(_ngrams(tokens, len(tokens))):
+            self._partial.setdefault(gram, set()).add(payload)
+        self._max_n = max(self._max_n, len(tokens))
+
+    def match(self, text: str) -> set:
+        tokens = phrase_tokens(text)
+        if not tokens:
+            return set()
+        found = set(self._partial.get(tokens, ()))
+        for gram in _ngrams(tokens, self._max_n):
+            found.update(self._exact.get(gram, ()))
+        return found
@@ -0,0 +1,213 @@
+# metrics.py
+"""Timers, counters and optional profiling for the pipeline.
+
+    from metrics import timed, inc
+
+    @timed("extract_text")
+    def extract_text(path): ...
+
+    inc("ner_chunks", len(windows))
+
+Everything lands in the process-wide ``METRICS`` (exported in Prometheus
+text format by ``prometheus_text``) and, inside a ``request_scope``, in a
+per-request record that is logged as one JSON line on the
+``intellipath.metrics`` logger when the request ends.
+
+Set INTELLIPATH_PROFILE=cprofile (or pyinstrument, if installed) to write
+a profile of every request scope to INTELLIPATH_PROFILE_DIR.
+"""
+import contextvars
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+
+logger = logging.getLogger("intellipath.metrics")
+
+PROFILE_MODE = os.environ.get("INTELLIPATH_PROFILE", "").strip().lower()
+PROFILE_DIR = os.environ.get("INTELLIPATH_PROFILE_DIR", "profiles")
+
+# Upper bounds (seconds) of the stage latency histogram buckets.
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class Metrics:
+    """Thread-safe counters and per-stage latency histograms."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._stages = {}
+
+    def inc(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {"count": 0, "sum": 0.0, "buckets": [0] * len(self.buckets)}
+            entry["count"] += 1
+            entry["sum"] += seconds
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    entry["buckets"][i] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "stages": {
+                    stage: {"count": e["count"], "sum": round(e["sum"], 6),
+                            "mean": round(e["sum"] / e["count"], 6) if e["count"] else 0.0}
+                    for stage, e in self._stages.items()
+                },
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._stages.clear()
+
+    def prometheus_text(self, prefix="intellipath") -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                metric = f"{prefix}_{_metric_name(name)}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {self._counters[name]}")
+            if self._stages:
+                metric = f"{prefix}_stage_seconds"
+                lines.append(f"# HELP {metric} Time spent in each pipeline stage")
+                lines.append(f"# TYPE {metric} histogram")
+                for stage in sorted(self._stages):
+                    e = self._stages[stage]
+                    label = f'stage="{stage}"'
+                    for bound, count in zip(self.buckets, e["buckets"]):
+                        lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {e["count"]}')
+                    lines.append(f"{metric}_sum{{{label}}} {e['sum']:.6f}")
+                    lines.append(f"{metric}_count{{{label}}} {e['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+METRICS = Metrics()
+
+# The record of the request scope the current thread/task is running in.
+_current = contextvars.ContextVar("intellipath_request_metrics", default=None)
+
+
+def inc(name, value=1):
+    """Add ``value`` to counter ``name`` (process-wide and for the current request)."""
+    METRICS.inc(name, value)
+    record = _current.get()
+    if record is not None:
+        record["counters"][name] = record["counters"].get(name, 0) + value
+
+
+@contextmanager
+def timer(stage):
+    """Time the block as ``stage``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        METRICS.observe(stage, elapsed)
+        record = _current.get()
+        if record is not None:
+            record["timings"][stage] = record["timings"].get(stage, 0.0) + elapsed
+
+
+def timed(stage):
+    """Decorator form of ``timer``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+@contextmanager
+def profiled(label, mode=None):
+    """Profile the block with cProfile or pyinstrument and write the result
+    under PROFILE_DIR; does nothing unless profiling is enabled."""
+    mode = PROFILE_MODE if mode is None else mode
+    if mode not in ("cprofile", "pyinstrument"):
+        yield None
+        return
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    stem = os.path.join(PROFILE_DIR, f"{_metric_name(label)}-{time.strftime('%Y%m%d-%H%M%S')}-{threading.get_ident()}")
+    if mode == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.warning("INTELLIPATH_PROFILE=pyinstrument but pyinstrument is not installed")
+            yield None
+            return
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield stem + ".html"
+        finally:
+            profiler.stop()
+            with open(stem + ".html", "w", encoding="utf-8") as f:
+                f.write(profiler.output_html())
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield stem + ".prof"
+    finally:
+        profiler.disable()
+        profiler.dump_stats(stem + ".prof")
+
+
+@contextmanager
+def request_scope(name, **fields):
+    """Collect the timings and counters of one request.
+
+    Yields the record (``{"request", "timings", "counters", ...}``), which is
+    filled in as the block runs, logged as JSON when it ends, and left for
+    the caller to inspect (e.g. to show a timing breakdown).
+    """
+    record = {"request": name, **fields, "timings": {}, "counters": {}}
+    token = _current.set(record)
+    started = time.perf_counter()
+    try:
+        with profiled(name) as profile_path:
+            if profile_path:
+                record["profile"] = profile_path
+            yield record
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current.reset(token)
+        record["seconds"] = round(time.perf_counter() - started, 6)
+        record["timings"] = {k: round(v, 6) for k, v in record["timings"].items()}
+        METRICS.observe(f"request:{name}", record["seconds"])
+        logger.info(json.dumps(record, default=str))
+
+
+def snapshot() -> dict:
+    return METRICS.snapshot()
+
+
+def prometheus_text() -> str:
+    return METRICS.prometheus_text()
@@ -0,0 +1,87 @@
+# microbatch.py
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class MicroBatcher:
+    """Coalesce items from concurrent callers into shared batches.
+
+    Callers hand a list of items to ``map`` and block until their results
+    are back. A single worker thread takes the first waiting item, keeps
+    collecting for up to ``max_wait`` seconds or until ``max_batch`` items
+    are pending, calls ``run_batch(items)`` once for the lot and hands each
+    result back to the caller it came from. With one caller this adds at
+    most ``max_wait`` of latency; under load the model sees full batches
+    instead of many small ones competing for the same cores.
+
+    ``run_batch`` must return one result per item, in order. If it raises,
+    every caller in that batch gets the exception.
+    """
+
+    def __init__(self, run_batch, max_batch=16, max_wait=0.005, name="microbatch"):
+        self.run_batch = run_batch
+        self.max_batch = max(int(max_batch), 1)
+        self.max_wait = max(float(max_wait), 0.0)
+        self.name = name
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._worker = None
+        self._stats = {"batches": 0, "items": 0, "requests": 0, "max_batch_seen": 0}
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._loop, name=self.name, daemon=True)
+            self._worker.start()
+
+    def map(self, items) -> list:
+        """Run ``items`` through the shared batches; returns their results in order."""
+        items = list(items)
+        if not items:
+            return []
+        futures = [Future() for _ in items]
+        with self._cond:
+            self._ensure_worker()
+            self._pending.extend(zip(items, futures))
+            self._stats["requests"] += 1
+            self._cond.notify()
+        return [f.result() for f in futures]
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return [self._pending.popleft() for _ in range(min(self.max_batch, len(self._pending)))]
+
+    def _loop(self):
+        while True:
+            batch = self._take_batch()
+            items = [item for item, _ in batch]
+            try:
+                results = self.run_batch(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"batch of {len(items)} items returned {len(results)} results")
+            except BaseException as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+            with self._cond:
+                self._stats["batches"] += 1
+                self._stats["items"] += len(batch)
+                self._stats["max_batch_seen"] = max(self._stats["max_batch_seen"], len(batch))
+
+    def stats(self) -> dict:
+        with self._cond:
+            info = dict(self._stats)
+            info["pending"] = len(self._pending)
+        info["mean_batch"] = round(info["items"] / info["batches"], 2) if info["batches"] else 0.0
+        return info
@@ -0,0 +1,144 @@
+# model_registry.py
+import os
+import threading
+import time
+
+
+def _current_rss_bytes() -> int:
+    """Resident set size of this process in bytes (0 if it can't be determined)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        import sys
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes on Linux
+        return rss if sys.platform == "darwin" else rss * 1024
+    except (ImportError, ValueError):
+        return 0
+
+
+def _parameter_bytes(obj) -> int:
+    """Size of the model weights held by a HF pipeline (or bare model), if any."""
+    model = getattr(obj, "model", obj)
+    params = getattr(model, "parameters", None)
+    if params is None:
+        return 0
+    try:
+        return sum(p.numel() * p.element_size() for p in params())
+    except Exception:
+        return 0
+
+
+class ModelRegistry:
+    """Process-wide registry of lazily loaded models.
+
+    Loaders are registered by name and only run on the first ``get`` (or an
+    explicit ``warm_up``). Every caller in the process - including all
+    Streamlit sessions, which share the imported module - gets the same
+    instance.
+    """
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._stats = {}
+        self._errors = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+        self._warmup_threads = {}
+
+    def register(self, name, loader):
+        """Register ``loader`` (a zero-argument callable) under ``name``.
+
+        Re-registering a name drops any instance already loaded for it.
+        """
+        with self._guard:
+            self._loaders[name] = loader
+            self._locks.setdefault(name, threading.Lock())
+            self._models.pop(name, None)
+            self._stats.pop(name, None)
+            self._errors.pop(name, None)
+
+    def get(self, name):
+        """Return the model for ``name``, loading it on first use."""
+        model = self._models.get(name)
+        if model is not None:
+            return model
+        try:
+            lock = self._locks[name]
+        except KeyError:
+            raise KeyError(f"No model registered under {name!r}") from None
+        with lock:
+            model = self._models.get(name)
+            if model is None:
+                model = self._load(name)
+        return model
+
+    def _load(self, name):
+        loader = self._loaders[name]
+        rss_before = _current_rss_bytes()
+        started = time.perf_counter()
+        try:
+            model = loader()
+        except Exception as e:
+            self._errors[name] = e
+            raise
+        self._stats[name] = {
+            "load_seconds": round(time.perf_counter() - started, 3),
+            "rss_delta_bytes": max(_current_rss_bytes() - rss_before, 0),
+            "parameter_bytes": _parameter_bytes(model),
+            "loaded_at": time.time(),
+        }
+        self._errors.pop(name, None)
+        self._models[name] = model
+        return model
+
+    def is_loaded(self, name) -> bool:
+        return name in self._models
+
+    def warm_up(self, name, background=True):
+        """Load ``name`` ahead of the first request.
+
+        With ``background=True`` the load runs on a daemon thread and the
+        thread is returned; calling it again while a warm-up is in flight (or
+        after the model is loaded) is a no-op.
+        """
+        if not background:
+            self.get(name)
+            return None
+        with self._guard:
+            if name not in self._loaders:
+                raise KeyError(f"No model registered under {name!r}")
+            thread = self._warmup_threads.get(name)
+            if self.is_loaded(name) or (thread is not None and thread.is_alive()):
+                return thread
+
+            def _run():
+                try:
+                    self.get(name)
+                except Exception:
+                    # Recorded in self._errors; the next get() retries the load.
+                    pass
+
+            thread = threading.Thread(target=_run, name=f"warm-up:{name}", daemon=True)
+            self._warmup_threads[name] = thread
+        thread.start()
+        return thread
+
+    def stats(self, name=None) -> dict:
+        """Load time and memory footprint for one model, or all of them."""
+        if name is not None:
+            info = {"loaded": self.is_loaded(name)}
+            info.update(self._stats.get(name, {}))
+            if name in self._errors:
+                info["error"] = repr(self._errors[name])
+            return info
+        return {n: self.stats(n) for n in self._loaders}
+
+
+# Shared by every module in the process.
+registry = ModelRegistry()
@@ -0,0 +1,217 @@
+# ner_backends.py
+"""Inference backends for the resume NER model.
+
+- ``torch``: the model as published, full-precision PyTorch
+- ``torch-int8``: PyTorch with Linear layers dynamically quantized to int8
+- ``onnx``: an exported ONNX Runtime session (needs ``optimum[onnxruntime]``)
+
+Pick one with INTELLIPATH_NER_BACKEND or ``iextract.set_ner_backend``. The
+command line converts the model and checks each backend against fp32:
+
+    python ner_backends.py export --output models/ner-onnx
+    python ner_backends.py parity --backend torch-int8 resume1.txt resume2.txt
+    python ner_backends.py bench --backends torch torch-int8 onnx resume1.txt
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+DEFAULT_BACKEND = os.environ.get("INTELLIPATH_NER_BACKEND", "torch")
+# Where `export` writes the ONNX model and where the onnx backend looks for it;
+# if it's missing the model is exported on the fly at load time.
+ONNX_MODEL_DIR = os.environ.get("INTELLIPATH_ONNX_DIR", os.path.join("models", "ner-onnx"))
+
+
+def _require_onnxruntime():
+    try:
+        from optimum.onnxruntime import ORTModelForTokenClassification
+    except ImportError as e:
+        raise RuntimeError(
+            "The onnx backend needs optimum with ONNX Runtime: pip install 'optimum[onnxruntime]'"
+        ) from e
+    return ORTModelForTokenClassification
+
+
+def load_pipeline(model: str, backend: str = DEFAULT_BACKEND):
+    """Build a token-classification pipeline for ``model`` on ``backend``."""
+    from transformers import AutoModelForTokenClassification, AutoTokenizer, pipeline
+
+    if backend == "torch":
+        # aggregation_strategy requires transformers>=4.8+
+        return pipeline("token-classification", model=model, aggregation_strategy="simple")
+
+    if backend == "torch-int8":
+        import torch
+        quantization = getattr(torch, "ao", torch).quantization
+        tokenizer = AutoTokenizer.from_pretrained(model)
+        fp32 = AutoModelForTokenClassification.from_pretrained(model)
+        int8 = quantization.quantize_dynamic(fp32.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("token-classification", model=int8, tokenizer=tokenizer, aggregation_strategy="simple")
+
+    if backend == "onnx":
+        ORTModelForTokenClassification = _require_onnxruntime()
+        if os.path.isdir(ONNX_MODEL_DIR):
+            ort_model = ORTModelForTokenClassification.from_pretrained(ONNX_MODEL_DIR)
+            tokenizer = AutoTokenizer.from_pretrained(ONNX_MODEL_DIR)
+        else:
+            ort_model = ORTModelForTokenClassification.from_pretrained(model, export=True)
+            tokenizer = AutoTokenizer.from_pretrained(model)
+        return pipeline("token-classification", model=ort_model, tokenizer=tokenizer, aggregation_strategy="simple")
+
+    raise ValueError(f"Unknown NER backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+
+
+def export_onnx(model: str, output_dir: str = ONNX_MODEL_DIR) -> str:
+    """Export ``model`` to ONNX (with its tokenizer) under ``output_dir``."""
+    from transformers import AutoTokenizer
+
+    ORTModelForTokenClassification = _require_onnxruntime()
+    ort_model = ORTModelForTokenClassification.from_pretrained(model, export=True)
+    ort_model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model).save_pretrained(output_dir)
+    return output_dir
+
+
+def _entity_keys(ents):
+    return {
+        (e.get("entity_group", e.get("entity")), e.get("start"), e.get("end"))
+        for e in ents if "original_text" not in e
+    }
+
+
+def parity_check(texts, backend: str, reference: str = "torch") -> dict:
+    """Compare the entities ``backend`` finds against ``reference`` on ``texts``.
+
+    Entities are compared by (label, start, end). Returns per-text
+    precision/recall against the reference plus overall F1.
+    """
+    import iextract
+
+    outputs = {}
+    for name in (reference, backend):
+        iextract.set_ner_backend(name)
+        outputs[name] = [_entity_keys(iextract.extract_entities(t)) for t in texts]
+
+    per_text = []
+    tp = fp = fn = 0
+    for i, (ref, got) in enumerate(zip(outputs[reference], outputs[backend])):
+        common = len(ref & got)
+        tp += common
+        fp += len(got - ref)
+        fn += len(ref - got)
+        per_text.append({
+            "text": i,
+            "reference_entities": len(ref),
+            "backend_entities": len(got),
+            "missing": len(ref - got),
+            "extra": len(got - ref),
+        })
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {
+        "backend": backend,
+        "reference": reference,
+        "precision": round(precision, 4),
+        "recall": round(recall, 4),
+        "f1": round(f1, 4),
+        "texts": per_text,
+    }
+
+
+def _bench_one(backend, texts, repeats, queue):
+    # Runs in a fresh process so load time and RSS belong to this backend alone.
+    import iextract
+    from cache import ResultCache
+    from model_registry import _current_rss_bytes
+
+    # Every repeat must run the model, not hit the per-window entity cache.
+    iextract.use_entity_cache(ResultCache(max_entries=0))
+    rss_start = _current_rss_bytes()
+    iextract.set_ner_backend(backend)
+    iextract.warm_up_ner(background=False)
+    stats = iextract.ner_stats()
+    iextract.extract_entities(texts[0])  # first call pays one-off allocations
+    latencies = []
+    for _ in range(repeats):
+        for t in texts:
+            started = time.perf_counter()
+            iextract.extract_entities(t)
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    queue.put({
+        "backend": backend,
+        "load_seconds": stats.get("load_seconds"),
+        "latency_mean": round(statistics.fmean(latencies), 4),
+        "latency_p50": round(latencies[len(latencies) // 2], 4),
+        "latency_p95": round(latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)], 4),
+        "rss_bytes": _current_rss_bytes(),
+        "rss_model_bytes": max(_current_rss_bytes() - rss_start, 0),
+    })
+
+
+def benchmark(texts, backends=BACKENDS, repeats=3) -> list:
+    """Latency and RSS of each backend, each measured in its own process."""
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for backend in backends:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_bench_one, args=(backend, texts, repeats, queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode == 0 and not queue.empty():
+            results.append(queue.get())
+        else:
+            results.append({"backend": backend, "error": f"benchmark process exited with {proc.exitcode}"})
+    return results
+
+
+def _read_texts(paths):
+    if not paths:
+        raise SystemExit("give at least one resume file to run on")
+    from resume_parser import extract_text
+    return [extract_text(p) for p in paths]
+
+
+def main(argv=None):
+    from iextract import NER_MODEL
+
+    parser = argparse.ArgumentParser(description="Convert, check and benchmark NER backends.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_export = sub.add_parser("export", help="Export the NER model to ONNX")
+    p_export.add_argument("--model", default=NER_MODEL)
+    p_export.add_argument("--output", default=ONNX_MODEL_DIR)
+
+    p_parity = sub.add_parser("parity", help="Compare a backend's entities with fp32 PyTorch")
+    p_parity.add_argument("--backend", choices=BACKENDS, required=True)
+    p_parity.add_argument("--min-f1", type=float, default=0.95, help="Exit non-zero below this F1")
+    p_parity.add_argument("files", nargs="*")
+
+    p_bench = sub.add_parser("bench", help="Measure latency and RSS per backend")
+    p_bench.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    p_bench.add_argument("--repeats", type=int, default=3)
+    p_bench.add_argument("files", nargs="*")
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        print(export_onnx(args.model, args.output))
+        return 0
+    if args.command == "parity":
+        report = parity_check(_read_texts(args.files), args.backend)
+        print(json.dumps(report, indent=2))
+        return 0 if report["f1"] >= args.min_f1 else 1
+    if args.command == "bench":
+        print(json.dumps(benchmark(_read_texts(args.files), args.backends, args.repeats), indent=2))
+        return 0
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+# pipeline.py
+import copy
+import itertools
+
+from cache import RESULT_CACHE, content_key, preferences_key
+from career_plan import render
+from generator import build_career_plan, build_plan_matrix, generate_career_path
+from iextract import (
+    SummaryBuilder,
+    extract_entities,
+    extraction_mode,
+    extraction_signature,
+    iter_entities,
+    normalize_entities,
+)
+from resume_parser import MAX_TEXT_CHARS, PDF_MAX_PAGES, extract_text, iter_text_segments
+from utils import upload_source
+
+
+# Each stage is memoized by the SHA-256 of the uploaded bytes, so resubmitting
+# the same resume (with the same preferences, for the plan) skips the work.
+# Stages from NER on also take the extraction ``mode`` ("ner", "rules" or
+# "hybrid"; None means iextract.EXTRACTION_MODE), which is part of their keys.
+
+
+def stage_text(data: bytes, filename: str, cache=RESULT_CACHE):
+    """Return ``(file_key, raw_text)`` for an uploaded file."""
+    key = content_key(data)
+
+    def compute():
+        with upload_source(data, filename) as source:
+            return extract_text(source, filename)
+
+    # The limits shape the text, so text cut at an old limit isn't reused.
+    limits = f"{MAX_TEXT_CHARS}:{PDF_MAX_PAGES}"
+    return key, cache.get_or_compute(f"text:{limits}:{key}", compute)
+
+
+def stage_entities(key: str, raw: str, cache=RESULT_CACHE, ner_slots=None, mode=None):
+    """NER entities for the text; ``ner_slots`` (a semaphore) bounds how many
+    callers run the model at once. Cache hits, and "rules" mode, which
+    doesn't use the model, don't wait for a slot."""
+    mode = extraction_mode(mode)
+
+    def compute():
+        if ner_slots is None or mode == "rules":
+            return extract_entities(raw, mode=mode)
+        with ner_slots:
+            return extract_entities(raw, mode=mode)
+
+    return cache.get_or_compute(f"entities:{extraction_signature(mode)}:{key}", compute)
+
+
+def stage_summary(key: str, ents: list, cache=RESULT_CACHE, mode=None) -> dict:
+    summary = cache.get_or_compute(
+        f"summary:{extraction_signature(mode)}:{key}", lambda: normalize_entities(ents)
+    )
+    # Callers attach user_preferences to the summary; keep the cached copy clean.
+    return copy.deepcopy(summary)
+
+
+def stage_career_plan(key: str, summary: dict, preferences: dict, cache=RESULT_CACHE, mode=None):
+    """The ``CareerPlan`` for a resume and preferences."""
+    summary = dict(summary, user_preferences=preferences)
+    return cache.get_or_compute(
+        f"career_plan:{extraction_signature(mode)}:{key}:{preferences_key(preferences)}",
+        lambda: build_career_plan(summary),
+    )
+
+
+def stage_plan_matrix(key: str, summary: dict, preferences: dict, areas, timelines, cache=RESULT_CACHE,
+                      mode=None) -> dict:
+    """``{(area, timeline): CareerPlan}`` for every combination of ``areas``
+    and ``timelines``, the rest of ``preferences`` unchanged.
+
+    Plans share cache entries with ``stage_career_plan``; the missing ones
+    are built together by ``build_plan_matrix``.
+    """
+    def cache_key(area, timeline):
+        prefs = dict(preferences, area_of_interest=area, timeline=timeline)
+        return f"career_plan:{signature}:{key}:{preferences_key(prefs)}"
+
+    signature = extraction_signature(mode)
+    plans = {}
+    missing = []
+    sentinel = object()
+    for combo in itertools.product(areas, timelines):
+        plan = cache.get(cache_key(*combo), sentinel)
+        if plan is sentinel:
+            missing.append(combo)
+        else:
+            plans[combo] = plan
+    if missing:
+        built = build_plan_matrix(dict(summary, user_preferences=preferences), missing)
+        for combo, plan in built.items():
+            cache.set(cache_key(*combo), plan)
+        plans.update(built)
+    return {combo: plans[combo] for combo in itertools.product(areas, timelines)}
+
+
+def stage_plan(key: str, summary: dict, preferences: dict, cache=RESULT_CACHE, fmt="md", mode=None) -> str:
+    """The career plan rendered as ``fmt`` (see ``career_plan.render``)."""
+    return render(stage_career_plan(key, summary, preferences, cache, mode), fmt)
+
+
+# (stage, percent complete when it starts) reported through analyze_resume's
+# progress callback
+PROGRESS_STAGES = (
+    ("extract_text", 5),
+    ("extract_entities", 20),
+    ("normalize_entities", 75),
+    ("generate_career_path", 85),
+)
+
+
+def analyze_resume(data: bytes, filename: str, preferences: dict, cache=RESULT_CACHE,
+                   progress=None, ner_slots=None, mode=None) -> dict:
+    """Run the full pipeline on an uploaded file, reusing cached stage results.
+
+    ``progress(stage, percent)`` is called as each stage starts and with
+    ``("done", 100)`` at the end. With ``preferences=None`` the run stops
+    after normalization and ``career_plan``/``plan`` are None.
+    """
+    report = progress or (lambda stage, percent: None)
+    stages = dict(PROGRESS_STAGES)
+    report("extract_text", stages["extract_text"])
+    key, raw = stage_text(data, filename, cache)
+    report("extract_entities", stages["extract_entities"])
+    ents = stage_entities(key, raw, cache, ner_slots, mode)
+    report("normalize_entities", stages["normalize_entities"])
+    summary = stage_summary(key, ents, cache, mode)
+    plan = None
+    if preferences is not None:
+        report("generate_career_path", stages["generate_career_path"])
+        plan = stage_career_plan(key, summary, preferences, cache, mode)
+        summary["user_preferences"] = preferences
+    report("done", 100)
+    return {"key": key, "text": raw, "entities": ents, "summary": summary,
+            "career_plan": plan, "plan": plan and render(plan, "md")}
+
+
+def stream_resume(source, preferences=None, mode=None):
+    """Stream a resume through parsing, NER and normalization.
+
+    Segments (PDF pages, groups of paragraphs) flow through the stages one
+    at a time, so the first entities are available before the whole file has
+    been parsed and only the running summary is kept in memory. Yields event
+    dicts:
+
+    - ``{"event": "segment", "index", "characters", "entities"}`` per segment
+    - ``{"event": "summary", "summary"}`` once the document is exhausted
+    - ``{"event": "plan", "plan"}`` if ``preferences`` were given
+    """
+    mode = extraction_mode(mode)
+    builder = SummaryBuilder()
+    segments = iter_entities(iter_text_segments(source), mode=mode)
+    for index, (segment, ents) in enumerate(segments):
+        builder.add_entities(ents)
+        # Like normalize_entities: in "ner" mode the rules only see the
+        # entity words, otherwise the whole segment.
+        builder.add_text(segment if mode != "ner" else " ".join(e["word"] for e in ents))
+        yield {"event": "segment", "index": index, "characters": len(segment), "entities": ents}
+    summary = builder.summary()
+    yield {"event": "summary", "summary": summary}
+    if preferences is not None:
+        yield {"event": "plan", "plan": generate_career_path(dict(summary, user_preferences=preferences))}
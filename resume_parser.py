@@ -1,31 +1,464 @@
 # resume_parser.py
 from PyPDF2 import PdfReader
 from docx import Document
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from contextlib import contextmanager
+import codecs
+import io
+import mmap
+import multiprocessing
 import os
+import tempfile
+import threading
+import zipfile
 
+from metrics import inc, timed
 
-def extract_text_from_pdf(path: str) -> str:
-    reader = PdfReader(path)
-    pages = []
-    for p in reader.pages:
-        txt = p.extract_text() or ""
-        pages.append(txt)
-    return "\n".join(pages).strip()
 
+# Page extraction fans out to a pool once a PDF has at least this many pages;
+# shorter documents aren't worth the pool start-up.
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get("INTELLIPATH_PDF_PARALLEL_MIN_PAGES", "4"))
+PDF_WORKERS = int(os.environ.get("INTELLIPATH_PDF_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+# "process" sidesteps the GIL (PyPDF2 is pure Python); "thread" avoids
+# worker processes, but a page stuck past the timeout keeps its thread busy.
+PDF_EXECUTOR = os.environ.get("INTELLIPATH_PDF_EXECUTOR", "process")
+# Process pools are started with forkserver (spawn where unavailable), not
+# fork: the server process has the model and background threads that page
+# workers must not inherit.
+PDF_START_METHOD = os.environ.get("INTELLIPATH_PDF_START_METHOD") or (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+# Pages beyond the cap are ignored (0 = no cap); a page taking longer than
+# the timeout (seconds) is returned as empty text, and in a process pool the
+# PDF's workers are terminated.
+PDF_MAX_PAGES = int(os.environ.get("INTELLIPATH_PDF_MAX_PAGES", "100")) or None
+PDF_PAGE_TIMEOUT = float(os.environ.get("INTELLIPATH_PDF_PAGE_TIMEOUT", "30"))
 
-def extract_text_from_docx(path: str) -> str:
-    doc = Document(path)
-    return "\n".join(p.text for p in doc.paragraphs).strip()
+# Inputs larger than MAX_INPUT_BYTES are rejected before parsing; extracted
+# text is cut at MAX_TEXT_CHARS (0 = no limit for either), so an oversized
+# upload can't exhaust memory or hold the NER stage for minutes.
+MAX_INPUT_BYTES = int(os.environ.get("INTELLIPATH_MAX_INPUT_BYTES", str(20 * 1024 * 1024))) or None
+MAX_TEXT_CHARS = int(os.environ.get("INTELLIPATH_MAX_TEXT_CHARS", "200000")) or None
+# Plain text is decoded this many bytes at a time.
+DECODE_CHUNK_BYTES = 1024 * 1024
 
 
-def extract_text(path: str) -> str:
-    ext = os.path.splitext(path)[1].lower()
-    if ext == ".pdf":
-        return extract_text_from_pdf(path)
-    elif ext in (".docx",):
-        return extract_text_from_docx(path)
-    elif ext in (".txt",):
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            return f.read()
+class InputTooLarge(ValueError):
+    """The resume exceeds MAX_INPUT_BYTES."""
+
+
+# One reader per worker: PdfReader seeks a shared stream and isn't thread-safe.
+_worker = threading.local()
+
+
+def _reader_key(source):
+    # Process workers get the path anew with every page (equal, not
+    # identical); a file rewritten in place needs a new reader.
+    if isinstance(source, str):
+        stat = os.stat(source)
+        return source, stat.st_mtime_ns, stat.st_size
+    return source
+
+
+def _extract_pdf_page(index: int, source) -> str:
+    key = _reader_key(source)
+    current = getattr(_worker, "key", None)
+    if current is not key and not (isinstance(key, tuple) and current == key):
+        _worker.key = key
+        _worker.reader = PdfReader(_pdf_stream(source))
+    return _worker.reader.pages[index].extract_text() or ""
+
+
+@contextmanager
+def _as_path(source):
+    """``source`` as a path worker processes can open: itself, or a
+    temporary copy of in-memory bytes (removed on exit)."""
+    if isinstance(source, str):
+        yield source
+        return
+    fd, path = tempfile.mkstemp(suffix=".pdf", prefix="intellipath-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(source)
+        yield path
+    finally:
+        os.remove(path)
+
+
+# -- input sources ----------------------------------------------------------
+#
+# Parsers take a path, raw bytes (bytes/bytearray/memoryview) or a binary
+# file object, and work out the format from the content's magic bytes; the
+# filename is only a hint for plain text.
+
+FORMATS = ("pdf", "docx", "txt")
+
+
+def _load(source):
+    """Normalize ``source`` to a path (str) or a bytes-like object."""
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return source
+    if hasattr(source, "getbuffer"):  # BytesIO and Streamlit uploads: no copy
+        return source.getbuffer()
+    if hasattr(source, "read"):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return source.read()
+    raise TypeError(f"Unsupported resume source: {type(source).__name__}")
+
+
+class _BufferReader(io.RawIOBase):
+    """Read-only, seekable file object over a bytes-like object. Unlike
+    ``io.BytesIO`` it doesn't copy the buffer; only the bytes read are."""
+
+    def __init__(self, buffer):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"negative seek position {offset}")
+        self._pos = offset
+        return offset
+
+    def read(self, size=-1):
+        end = len(self._view) if size is None or size < 0 else min(self._pos + size, len(self._view))
+        data = self._view[self._pos:end].tobytes() if end > self._pos else b""
+        self._pos = max(self._pos, end)
+        return data
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    readall = read
+
+
+def _binary_stream(source):
+    if isinstance(source, str):
+        return source  # PdfReader and Document open paths themselves
+    return _BufferReader(source)
+
+
+def _pdf_stream(source):
+    # Paths are memory-mapped: PdfReader would otherwise read the whole file
+    # into a BytesIO, once per worker.
+    if isinstance(source, str) and os.path.getsize(source):
+        with open(source, "rb") as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _binary_stream(source)
+
+
+def input_size(source) -> int:
+    source = _load(source)
+    if isinstance(source, str):
+        return os.path.getsize(source)
+    return memoryview(source).nbytes
+
+
+def check_size(nbytes: int, limit=MAX_INPUT_BYTES):
+    """Raise InputTooLarge if ``nbytes`` is over ``limit``."""
+    if limit is not None and nbytes > limit:
+        raise InputTooLarge(
+            f"Resume is {nbytes / 1024 / 1024:.1f} MB; the limit is {limit / 1024 / 1024:.1f} MB"
+        )
+
+
+def _iter_chunks(source, chunk_size=DECODE_CHUNK_BYTES):
+    if isinstance(source, str):
+        if not os.path.getsize(source):
+            return
+        with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for i in range(0, len(mm), chunk_size):
+                yield mm[i:i + chunk_size]
     else:
-        raise ValueError(f"Unsupported file type: {ext}")
\ No newline at end of file
+        view = memoryview(source).cast("B")
+        for i in range(0, len(view), chunk_size):
+            yield view[i:i + chunk_size]
+
+
+# Text starting with one of these byte-order marks is decoded with the
+# codec, which consumes the mark; anything else is read as UTF-8. UTF-32
+# comes first: its little-endian mark begins with UTF-16's.
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def _bom_encoding(head: bytes):
+    for bom, encoding in _BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+
+def _iter_decoded(source, max_chars=MAX_TEXT_CHARS):
+    """Decode text chunk by chunk, stopping after ``max_chars``.
+
+    Newlines are normalized as text-mode ``open`` does, so paths and bytes
+    decode identically.
+    """
+    encoding = _bom_encoding(_head(source, 4)) or "utf-8"
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(encoding)("ignore"), translate=True)
+    remaining = max_chars
+    for chunk in _iter_chunks(source):
+        text = decoder.decode(chunk)
+        if remaining is not None and len(text) >= remaining:
+            yield text[:remaining]
+            inc("text_truncated")
+            return
+        if remaining is not None:
+            remaining -= len(text)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text if remaining is None else text[:remaining]
+
+
+def _limit_chars(segments, max_chars=MAX_TEXT_CHARS):
+    """Pass segments through until their newline-joined length reaches
+    ``max_chars``; the last one is cut to fit and the rest aren't pulled
+    from ``segments`` (so lazily extracted PDF pages past it never are)."""
+    if max_chars is None:
+        yield from segments
+        return
+    remaining = max_chars
+    for segment in segments:
+        if len(segment) >= remaining:
+            yield segment[:remaining]
+            inc("text_truncated")
+            return
+        remaining -= len(segment) + 1
+        yield segment
+
+
+def _head(source, size=2048) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read(size)
+    return bytes(memoryview(source)[:size])
+
+
+def _is_docx(source) -> bool:
+    try:
+        with zipfile.ZipFile(_binary_stream(source)) as z:
+            return any(name.startswith("word/") for name in z.namelist())
+    except zipfile.BadZipFile:
+        return False
+
+
+def detect_format(source, filename=None) -> str:
+    """``"pdf"``, ``"docx"`` or ``"txt"`` for a resume, judged by its content.
+
+    Text is UTF-8, or UTF-16/UTF-32 with a byte-order mark (as Windows
+    editors save "Unicode" text). Raises ValueError for other binary formats
+    (legacy .doc, images, ...), including UTF-16 without a mark.
+    """
+    source = _load(source)
+    head = _head(source)
+    if b"%PDF-" in head[:1024]:
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        if _is_docx(source):
+            return "docx"
+        raise ValueError("Unsupported file type: ZIP archive that is not a DOCX document")
+    if _bom_encoding(head) or b"\x00" not in head:
+        return "txt"
+    name = filename or (source if isinstance(source, str) else "")
+    ext = os.path.splitext(name)[1].lower() or "binary"
+    raise ValueError(f"Unsupported file type: {ext}")
+
+
+def iter_pdf_pages(source, max_pages=PDF_MAX_PAGES, page_timeout=PDF_PAGE_TIMEOUT, workers=PDF_WORKERS):
+    """Yield the text of each page of a PDF, in page order.
+
+    Pages are extracted on a worker pool a few pages ahead of the consumer,
+    so callers can start on page 1 while later pages are still being parsed.
+    """
+    source = _load(source)
+    stream = _pdf_stream(source)
+    try:
+        yield from _iter_pdf_pages(source, PdfReader(stream), max_pages, page_timeout, workers)
+    finally:
+        if isinstance(stream, mmap.mmap):
+            stream.close()
+
+
+def _iter_pdf_pages(source, reader, max_pages, page_timeout, workers):
+    count = len(reader.pages)
+    if max_pages is not None:
+        count = min(count, max_pages)
+    inc("pdf_pages", count)
+
+    if workers <= 1 or count < PDF_PARALLEL_MIN_PAGES:
+        for i in range(count):
+            yield reader.pages[i].extract_text() or ""
+        return
+
+    if PDF_EXECUTOR == "thread":
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            yield from _iter_pages_on_threads(pool, source, count, page_timeout, workers)
+        finally:
+            # Don't wait for a page stuck past the timeout; its thread
+            # finishes (or not) on its own.
+            pool.shutdown(wait=False, cancel_futures=True)
+    else:
+        with _as_path(source) as path:
+            yield from _iter_pages_on_processes(path, count, page_timeout, workers)
+
+
+def _iter_pages_on_threads(pool, source, count, page_timeout, workers):
+    pending = deque()
+    next_page = 0
+    try:
+        while next_page < count or pending:
+            # Keep a bounded window in flight so a long PDF isn't parsed far
+            # ahead of a slow consumer.
+            while next_page < count and len(pending) < workers * 2:
+                pending.append(pool.submit(_extract_pdf_page, next_page, source))
+                next_page += 1
+            future = pending.popleft()
+            try:
+                text = future.result(timeout=page_timeout)
+            except TimeoutError:
+                inc("pdf_page_timeouts")
+                text = ""
+            yield text
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def _iter_pages_on_processes(path, count, page_timeout, workers):
+    # Each PDF gets its own pool, so a stuck page is stopped by terminating
+    # this PDF's workers only.
+    context = multiprocessing.get_context(PDF_START_METHOD)
+    workers = min(workers, count)
+    pool = context.Pool(workers)
+
+    def submit(page):
+        return page, pool.apply_async(_extract_pdf_page, (page, path))
+
+    pending = deque()
+    next_page = 0
+    try:
+        while next_page < count or pending:
+            while next_page < count and len(pending) < workers * 2:
+                pending.append(submit(next_page))
+                next_page += 1
+            _, result = pending.popleft()
+            try:
+                text = result.get(timeout=page_timeout)
+            except multiprocessing.TimeoutError:
+                # A worker is stuck on this page (or died with it): replace
+                # the pool and resubmit the pages in flight on the old one.
+                inc("pdf_page_timeouts")
+                pool.terminate()
+                inc("pdf_pool_restarts")
+                pool = context.Pool(workers)
+                pending = deque(submit(page) for page, _ in pending)
+                text = ""
+            yield text
+    finally:
+        pool.terminate()
+
+
+def extract_text_from_pdf(source, max_chars=MAX_TEXT_CHARS) -> str:
+    return "\n".join(_limit_chars(iter_pdf_pages(source), max_chars)).strip()
+
+
+def extract_text_from_docx(source, max_chars=MAX_TEXT_CHARS) -> str:
+    doc = Document(_binary_stream(_load(source)))
+    return "\n".join(_limit_chars((p.text for p in doc.paragraphs), max_chars)).strip()
+
+
+def extract_text_from_txt(source, max_chars=MAX_TEXT_CHARS) -> str:
+    return "".join(_iter_decoded(_load(source), max_chars))
+
+
+# Target size of the segments yielded by iter_text_segments for DOCX and TXT
+# files; PDFs are always segmented by page.
+SEGMENT_CHARS = 4000
+
+
+def _group_blocks(blocks, limit=SEGMENT_CHARS):
+    """Join consecutive lines/paragraphs into segments of about ``limit`` chars."""
+    buf = []
+    size = 0
+    for block in blocks:
+        if buf and size + len(block) > limit:
+            yield "\n".join(buf)
+            buf = []
+            size = 0
+        buf.append(block)
+        size += len(block) + 1
+    if buf:
+        yield "\n".join(buf)
+
+
+def _iter_txt_lines(source, max_chars=MAX_TEXT_CHARS):
+    pending = ""
+    for text in _iter_decoded(source, max_chars):
+        lines = (pending + text).split("\n")
+        pending = lines.pop()
+        yield from lines
+    if pending:
+        yield pending
+
+
+def iter_text_segments(source, filename=None, max_chars=MAX_TEXT_CHARS):
+    """Yield the resume text piece by piece: pages for PDFs, groups of
+    paragraphs/lines for DOCX and TXT. Joining the segments with newlines
+    gives the same text as ``extract_text``, up to ``max_chars``.
+    """
+    source = _load(source)
+    check_size(input_size(source))
+    fmt = detect_format(source, filename)
+    if fmt == "pdf":
+        yield from _limit_chars(iter_pdf_pages(source), max_chars)
+    elif fmt == "docx":
+        paragraphs = (p.text for p in Document(_binary_stream(source)).paragraphs)
+        yield from _group_blocks(_limit_chars(paragraphs, max_chars))
+    else:
+        yield from _group_blocks(_iter_txt_lines(source, max_chars))
+
+
+_EXTRACTORS = {"pdf": extract_text_from_pdf, "docx": extract_text_from_docx, "txt": extract_text_from_txt}
+
+
+@timed("extract_text")
+def extract_text(source, filename=None, max_chars=MAX_TEXT_CHARS) -> str:
+    """Text of a resume given as a path, bytes or a binary file object.
+
+    The format comes from the content (see ``detect_format``), not the
+    extension; ``filename`` only names the input in error messages. Inputs
+    over MAX_INPUT_BYTES raise InputTooLarge; text past ``max_chars`` is
+    dropped. PDF pages past it aren't extracted and text files stop being
+    decoded, but python-docx parses a DOCX's XML whole, so only the input
+    size bounds that work.
+    """
+    source = _load(source)
+    check_size(input_size(source))
+    return _EXTRACTORS[detect_format(source, filename)](source, max_chars)
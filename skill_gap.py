@@ -0,0 +1,97 @@
+# skill_gap.py
+import numpy as np
+
+from knowledge_base import REQUIRED_SKILLS_LOWER
+from matcher import NgramIndex
+
+
+# Required skills shorter than this are never counted as matched; names like
+# "go", "r" or "ui" produce too many false positives to count as evidence.
+MIN_MATCH_LENGTH = 3
+
+
+class SkillGapEngine:
+    """Skill-gap analysis for every career track against one shared vocabulary.
+
+    Each distinct required skill gets a column; every (track, category,
+    skill) requirement is a "slot" pointing at its column. A candidate's
+    skills become one boolean vector over the vocabulary, so matching and
+    missing counts for all tracks fall out of a single gather + bincount.
+    """
+
+    def __init__(self, requirements=REQUIRED_SKILLS_LOWER):
+        self.tracks = list(requirements)
+        self.vocabulary = []
+        columns = {}
+        slot_track, slot_column, slot_category, slot_skill = [], [], [], []
+        self._track_slices = {}
+        for t, (track, categories) in enumerate(requirements.items()):
+            first = len(slot_track)
+            for category, skills in categories.items():
+                for skill, skill_lower in skills:
+                    col = columns.get(skill_lower)
+                    if col is None:
+                        col = columns[skill_lower] = len(self.vocabulary)
+                        self.vocabulary.append(skill_lower)
+                    slot_track.append(t)
+                    slot_column.append(col)
+                    slot_category.append(category)
+                    slot_skill.append(skill)
+            self._track_slices[track] = slice(first, len(slot_track))
+
+        self._slot_track = np.array(slot_track, dtype=np.intp)
+        self._slot_column = np.array(slot_column, dtype=np.intp)
+        self._slot_category = slot_category
+        self._slot_skill = slot_skill
+        self._slots_per_track = np.bincount(self._slot_track, minlength=len(self.tracks))
+        self._matchable = np.array([len(s) >= MIN_MATCH_LENGTH for s in self.vocabulary], dtype=bool)
+        self._index = NgramIndex((skill, col) for col, skill in enumerate(self.vocabulary))
+
+    def candidate_vector(self, skills) -> np.ndarray:
+        """Boolean vector over the vocabulary: which required skills ``skills`` cover."""
+        vector = np.zeros(len(self.vocabulary), dtype=bool)
+        hits = set()
+        for skill in skills:
+            hits.update(self._index.match(skill))
+        if hits:
+            vector[np.fromiter(hits, dtype=np.intp, count=len(hits))] = True
+        return vector & self._matchable
+
+    def analyze(self, track, skills, vector=None) -> dict:
+        """Matching and missing skills per category for one track.
+
+        ``vector`` may be passed in when the same candidate is analysed
+        against several tracks.
+        """
+        if vector is None:
+            vector = self.candidate_vector(skills)
+        span = self._track_slices[track]
+        matched = vector[self._slot_column[span]]
+        matching_skills = {}
+        missing_skills = {}
+        for i, hit in enumerate(matched.tolist(), span.start):
+            target = matching_skills if hit else missing_skills
+            target.setdefault(self._slot_category[i], []).append(self._slot_skill[i])
+        return {"matching_skills": matching_skills, "missing_skills": missing_skills}
+
+    def gap_all(self, skills, vector=None) -> dict:
+        """``{track: {"matching", "missing", "skill_gap_percentage"}}`` for every track at once."""
+        if vector is None:
+            vector = self.candidate_vector(skills)
+        matched_slots = vector[self._slot_column]
+        matching = np.bincount(self._slot_track, weights=matched_slots, minlength=len(self.tracks))
+        report = {}
+        for t, track in enumerate(self.tracks):
+            total = int(self._slots_per_track[t])
+            hit = int(matching[t])
+            missing = total - hit
+            report[track] = {
+                "matching": hit,
+                "missing": missing,
+                "skill_gap_percentage": round((missing / total) * 100, 1) if total else 0,
+            }
+        return report
+
+
+# Built once at import from the knowledge base.
+SKILL_GAP_ENGINE = SkillGapEngine()
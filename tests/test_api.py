@@ -0,0 +1,115 @@
+# tests/test_api.py
+import functools
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import api
+import iextract
+from cache import RESULT_CACHE
+from resume_parser import check_size
+
+RESUME = "Jane Doe\nData Scientist at Acme\nSkills: Python, SQL, TensorFlow, Docker\n"
+PREFERENCES = {"area_of_interest": "Data Science", "timeline": "Steady growth (balanced pace)"}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # "rules" mode never loads the model, so the whole API runs offline.
+    monkeypatch.setattr(iextract, "EXTRACTION_MODE", "rules")
+    RESULT_CACHE.clear()
+    with TestClient(api.app) as c:
+        yield c
+    RESULT_CACHE.clear()
+
+
+@pytest.fixture
+def small_limit(monkeypatch):
+    limit = 64
+    monkeypatch.setattr(api, "check_size", functools.partial(check_size, limit=limit))
+    return limit
+
+
+def _summary(response):
+    assert response.status_code == 200, response.text
+    return response.json()["summary"]
+
+
+def test_ready_in_rules_mode(client):
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True and response.json()["mode"] == "rules"
+
+
+def test_every_body_type_gives_the_same_summary(client):
+    by_json = _summary(client.post("/summary", json={"text": RESUME}))
+    assert {"python", "sql"} <= {s.lower() for s in by_json["skills"]}
+    assert _summary(client.post("/summary", data={"text": RESUME})) == by_json
+    assert _summary(client.post("/summary", files={"file": ("resume.txt", RESUME.encode())})) == by_json
+    assert _summary(client.post("/summary", content=RESUME, headers={"content-type": "text/plain"})) == by_json
+
+
+def test_preferences_are_accepted_with_each_body_type(client):
+    plans = [
+        client.post("/career-path?format=json", json={"text": RESUME, "preferences": PREFERENCES}),
+        client.post("/career-path?format=json", data={"text": RESUME, "preferences": json.dumps(PREFERENCES)}),
+        client.post("/career-path?format=json", files={"file": ("resume.txt", RESUME.encode())},
+                    data={"preferences": json.dumps(PREFERENCES)}),
+    ]
+    assert all(r.status_code == 200 for r in plans)
+    bodies = [r.json() for r in plans]
+    assert bodies[0]["track"]["name"] == "Data Science & Analytics"
+    assert bodies[1] == bodies[0] and bodies[2] == bodies[0]
+
+
+def test_streamed_markdown_plan(client):
+    with client.stream("POST", "/career-path", json={"text": RESUME, "preferences": PREFERENCES}) as r:
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/markdown")
+        chunks = list(r.iter_text())
+    text = "".join(chunks)
+    assert "Personalized Career Path Recommendation" in text and "Data Science & Analytics" in text
+
+
+def test_summary_stream_ends_with_the_summary(client):
+    response = client.post("/summary/stream", json={"text": RESUME})
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["event"] == "segment" and events[-1]["event"] == "summary"
+    full = _summary(client.post("/summary", json={"text": RESUME}))
+    assert sorted(events[-1]["summary"]["skills"]) == sorted(full["skills"])
+
+
+@pytest.mark.parametrize("body", [
+    {"json": {"text": 123}},
+    {"json": {"text": ["a"]}},
+    {"json": ["not", "an", "object"]},
+    {"json": {}},
+    {"content": b"{not json", "headers": {"content-type": "application/json"}},
+    {"json": {"text": RESUME, "preferences": "[1, 2]"}},
+])
+def test_bad_bodies_are_422(client, body):
+    assert client.post("/summary", **body).status_code == 422
+
+
+def test_unknown_mode_and_format_are_422(client):
+    assert client.post("/summary?mode=magic", json={"text": RESUME}).status_code == 422
+    assert client.post("/career-path?format=pdf", json={"text": RESUME}).status_code == 422
+
+
+def test_oversized_bodies_are_413(client, small_limit):
+    big = "x" * (small_limit + 1)
+    assert client.post("/summary", json={"text": big}).status_code == 413
+    assert client.post("/summary", content=big, headers={"content-type": "text/plain"}).status_code == 413
+    assert client.post("/summary", files={"file": ("r.txt", big.encode())}).status_code == 413
+    # A chunked body has no Content-Length; it is cut off while being read.
+    chunks = (b"x" * 16 for _ in range(small_limit))
+    assert client.post("/summary", content=chunks, headers={"content-type": "text/plain"}).status_code == 413
+    assert client.post("/summary", content="Python SQL", headers={"content-type": "text/plain"}).status_code == 200
+
+
+def test_metrics_are_prometheus_text(client):
+    client.post("/summary", json={"text": RESUME})
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "intellipath_cache_hits" in response.text
@@ -0,0 +1,19 @@
+# tests/test_batch.py
+import os
+import subprocess
+import sys
+
+import batch
+import iextract
+
+
+def test_mode_choices_match_iextract():
+    assert batch.EXTRACTION_MODES == iextract.EXTRACTION_MODES
+
+
+def test_importing_batch_leaves_the_pipeline_unloaded():
+    # Workers are forked from the parent; it must not hold cache connections.
+    code = "import sys, batch; print('iextract' in sys.modules or 'cache' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(batch.__file__)))
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,86 @@
+# tests/test_cache.py
+import pytest
+
+import cache
+import iextract
+import pipeline
+from cache import ResultCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_least_recently_used_entry_is_evicted_first():
+    c = ResultCache(max_entries=2, ttl=None)
+    c.set("a", 1)
+    c.set("b", 2)
+    assert c.get("a") == 1  # "b" is now the oldest
+    c.set("c", 3)
+
+    assert c.get("b") is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    assert c.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    c = ResultCache(ttl=10)
+    c.set("k", "v")
+    clock[0] += 9.9
+    assert c.get("k") == "v"
+    clock[0] += 0.2
+    assert c.get("k", "missing") == "missing"
+    assert c.stats()["entries"] == 0
+
+
+def test_max_entries_zero_keeps_nothing_in_memory():
+    c = ResultCache(max_entries=0, ttl=None)
+    calls = []
+    assert c.get_or_compute("k", lambda: calls.append(1) or "v") == "v"
+    assert c.get_or_compute("k", lambda: calls.append(1) or "v") == "v"
+    assert len(calls) == 2
+    assert c.stats()["entries"] == 0
+
+
+def test_sqlite_tier_survives_a_new_instance(tmp_path):
+    db = str(tmp_path / "cache.db")
+    value = {"skills": ["python"], "nested": (1, 2.5, None)}
+    ResultCache(db_path=db).set("k", value)
+
+    fresh = ResultCache(db_path=db)
+    assert fresh.get("k") == value
+    assert fresh.stats()["disk_hits"] == 1
+    assert fresh.get("k") == value  # now promoted to memory
+    assert fresh.stats()["hits"] == 1
+
+
+def test_sqlite_tier_drops_expired_and_excess_rows(tmp_path, clock):
+    c = ResultCache(max_entries=0, ttl=10, db_path=str(tmp_path / "cache.db"), max_disk_entries=2)
+    c.set("old", 1)
+    clock[0] += 11
+    assert c.get("old") is None
+    for i, key in enumerate("abc"):
+        clock[0] += 1
+        c.set(key, i)
+    assert c.stats()["disk_entries"] == 2
+    assert c.get("a") is None
+    assert (c.get("b"), c.get("c")) == (1, 2)
+
+
+def test_stage_results_miss_after_the_knowledge_base_version_changes(monkeypatch):
+    c = ResultCache(ttl=None)
+    calls = []
+    monkeypatch.setattr(pipeline, "normalize_entities", lambda ents: calls.append(1) or {"skills": []})
+
+    for mode in iextract.EXTRACTION_MODES:
+        monkeypatch.setattr(iextract, "KB_VERSION", "1")
+        pipeline.stage_summary("key", [], c, mode=mode)
+        before = len(calls)
+        pipeline.stage_summary("key", [], c, mode=mode)
+        assert len(calls) == before, mode
+        monkeypatch.setattr(iextract, "KB_VERSION", "2")
+        pipeline.stage_summary("key", [], c, mode=mode)
+        assert len(calls) == before + 1, mode
@@ -0,0 +1,105 @@
+# tests/test_career_plan.py
+import json
+import os
+
+import pytest
+
+from career_plan import (
+    FORMATS,
+    CareerPlan,
+    GapAnalysis,
+    NextSteps,
+    Preferences,
+    ResumeOverview,
+    Stage,
+    Track,
+    iter_markdown,
+    render,
+)
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+EXTENSIONS = {"md": "md", "text": "txt", "html": "html", "json": "json"}
+HOSTILE = "<script>alert('x')</script> & \"lead\" <b>teams</b>"
+
+
+def _plan(additional_goals="Mentor juniors & speak at <conferences>"):
+    return CareerPlan(
+        overview=ResumeOverview(
+            skills=("Python", "SQL", "C++", "Docker", "AWS", "Git", "Pandas", "NumPy", "Flask", "React", "Go"),
+            job_titles=("Software Engineer", "Intern"),
+            education=("B.Sc. Computer Science",),
+            projects=(),
+            certifications=("AWS Certified Developer",),
+            achievements=("Hackathon winner", "Speaker", "Open-source maintainer", "Mentor"),
+        ),
+        preferences=Preferences(
+            area_of_interest="Software Development",
+            timeline="Steady growth (balanced pace)",
+            future_goals=("Become a technical leader/architect", "Work remotely/freelance"),
+            additional_goals=additional_goals,
+        ),
+        track=Track("Software Development", "Build & ship <software> systems."),
+        gaps=GapAnalysis(
+            matching=(("Programming Languages", ("Python", "C++")), ("Version Control", ("Git",))),
+            missing=(("Cloud & DevOps", ("Kubernetes", "CI/CD")),),
+            gap_percentage=37.5,
+            stack_track="Software Development",
+        ),
+        stages=(
+            Stage("Stage 1: Entry Level (0-2 years)", "Foundations", ("Learn Kubernetes", "Ship a project")),
+            Stage("Stage 2: Mid-Level (2-5 years)", "Specialization", ("Deepen expertise in Python",)),
+            Stage("Stage 3: Senior Level (5+ years)", "Leadership", ("Lead major projects",)),
+        ),
+        next_steps=NextSteps(
+            immediate=(("Skill Enhancement", "Focus on Kubernetes"), ("Networking", "Meet people")),
+            long_term=("Keep learning", "Build a network"),
+        ),
+    )
+
+
+def _golden(fmt):
+    return os.path.join(GOLDEN_DIR, f"career_plan.{EXTENSIONS[fmt]}")
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_rendering_matches_the_golden_file(fmt):
+    with open(_golden(fmt), encoding="utf-8") as f:
+        assert render(_plan(), fmt) == f.read()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_rendering_is_deterministic(fmt):
+    assert render(_plan(), fmt) == render(_plan(), fmt)
+
+
+def test_streamed_markdown_equals_the_whole_document():
+    sections = list(iter_markdown(_plan()))
+    assert len(sections) > 1
+    assert "".join(sections) == render(_plan(), "md")
+
+
+def test_json_round_trips_the_plan():
+    data = json.loads(render(_plan(), "json"))
+    assert data == json.loads(json.dumps(_plan().to_dict()))
+    assert data["gaps"]["matching"] == {"Programming Languages": ["Python", "C++"], "Version Control": ["Git"]}
+
+
+def test_html_escapes_user_supplied_goals():
+    page = render(_plan(HOSTILE), "html")
+    assert "<script>" not in page and "<b>teams</b>" not in page
+    assert "&lt;script&gt;alert(&#x27;x&#x27;)&lt;/script&gt; &amp; &quot;lead&quot; &lt;b&gt;teams&lt;/b&gt;" in page
+    assert "Build &amp; ship &lt;software&gt; systems." in page
+
+
+def test_empty_optional_goals_are_left_out():
+    for fmt in ("md", "text", "html"):
+        assert "Additional Goals" not in render(_plan(""), fmt)
+        assert "Additional Goals" in render(_plan(), fmt)
+
+
+if __name__ == "__main__":
+    # Rewrite the golden files after an intended change to the templates:
+    #   PYTHONPATH=. python tests/test_career_plan.py
+    for fmt in FORMATS:
+        with open(_golden(fmt), "w", encoding="utf-8") as f:
+            f.write(render(_plan(), fmt))
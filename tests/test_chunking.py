@@ -0,0 +1,123 @@
+# tests/test_chunking.py
+import re
+
+import pytest
+
+transformers = pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+import iextract  # noqa: E402
+from cache import ResultCache  # noqa: E402
+from iextract import MAX_CHARS, _merge_windows, chunk_text  # noqa: E402
+
+SKILLS = ("python", "docker", "kubernetes", "postgresql", "tensorflow")
+FILLER = ("built", "services", "with", "the", "team", "for", "data", "pipelines", "and")
+
+
+@pytest.fixture(scope="module")
+def tokenizer():
+    # A small WordPiece vocabulary built in memory: no download, and long
+    # words split into several sub-tokens, like a real BERT tokenizer.
+    vocab = {"[UNK]": 0}
+    for word in FILLER + ("python", "docker"):
+        vocab.setdefault(word, len(vocab))
+    for piece in ("kuber", "##net", "##es", "postgre", "##s", "##q", "##l", "tensor", "##flow"):
+        vocab.setdefault(piece, len(vocab))
+    tok = tokenizers.Tokenizer(tokenizers.models.WordPiece(vocab, unk_token="[UNK]"))
+    tok.normalizer = tokenizers.normalizers.Lowercase()
+    tok.pre_tokenizer = tokenizers.pre_tokenizers.BertPreTokenizer()
+    return transformers.PreTrainedTokenizerFast(tokenizer_object=tok, unk_token="[UNK]", model_max_length=32)
+
+
+def resume_text(lines=60):
+    words = FILLER + SKILLS
+    out = []
+    for i in range(lines):
+        out.append(" ".join(words[(i * 7 + j * 3) % len(words)] for j in range(5 + i % 9)))
+    return "\n".join(out)
+
+
+def fake_ner(text):
+    """Window-relative entities for every skill word, like the HF pipeline."""
+    return [
+        {"entity_group": "SKILL", "word": m.group(), "start": m.start(), "end": m.end()}
+        for m in re.finditer(r"\b(?:%s)\b" % "|".join(SKILLS), text)
+    ]
+
+
+def test_windows_cover_text_and_overlap(tokenizer):
+    text = resume_text()
+    windows = chunk_text(text, tokenizer, stride=8)
+    assert len(windows) > 1
+    covered = set()
+    for offset, window in windows:
+        assert text[offset:offset + len(window)] == window
+        assert len(tokenizer(window, add_special_tokens=False)["input_ids"]) <= 32
+        covered.update(range(offset, offset + len(window)))
+    assert set(range(len(text))) - covered <= {i for i, c in enumerate(text) if c.isspace()}
+    for (a, wa), (b, _) in zip(windows, windows[1:]):
+        assert a < b < a + len(wa), "neighbouring windows must overlap"
+
+
+def test_windows_start_and_end_on_word_boundaries(tokenizer):
+    text = resume_text()
+    for offset, window in chunk_text(text, tokenizer, stride=8):
+        end = offset + len(window)
+        assert offset == 0 or not text[offset - 1].isalnum()
+        assert end == len(text) or not text[end].isalnum()
+
+
+def test_merged_windows_reproduce_whole_text_entities(tokenizer):
+    text = resume_text()
+    windows = chunk_text(text, tokenizer, stride=8)
+    merged = _merge_windows(windows, [fake_ner(w) for _, w in windows])
+    assert merged == fake_ner(text)
+
+
+def test_overlap_entities_come_from_the_owning_window():
+    text = "python and tensorflow docker"
+    # The windows overlap on "tensorflow d" (11-23); each owns up to the
+    # middle of the overlap (17). The first window only saw "dock" of
+    # "docker" (22-28), which starts in the second window's half.
+    windows = [(0, text[:26]), (11, text[11:])]
+    results = [
+        [{"word": "python", "start": 0, "end": 6}, {"word": "tensorflow", "start": 11, "end": 21},
+         {"word": "dock", "start": 22, "end": 26}],
+        [{"word": "tensorflow", "start": 0, "end": 10}, {"word": "docker", "start": 11, "end": 17}],
+    ]
+    merged = _merge_windows(windows, results)
+    assert [(e["word"], e["start"], e["end"]) for e in merged] == [
+        ("python", 0, 6), ("tensorflow", 11, 21), ("docker", 22, 28),
+    ]
+
+
+def test_duplicate_entities_are_reported_once():
+    ent = {"entity_group": "SKILL", "word": "python", "start": 0, "end": 6}
+    assert _merge_windows([(0, "python")], [[ent, dict(ent)]]) == [ent]
+
+
+def test_entities_without_offsets_pass_through():
+    assert _merge_windows([(0, "x")], [[{"word": "x"}]]) == [{"word": "x"}]
+
+
+def test_without_fast_tokenizer_falls_back_to_character_windows():
+    text = "a" * (MAX_CHARS * 2 + 10)
+    windows = chunk_text(text, None)
+    assert all(len(w) <= MAX_CHARS for _, w in windows)
+    assert windows[0][0] == 0 and windows[-1][0] + len(windows[-1][1]) == len(text)
+
+
+def test_extract_entities_offsets_refer_to_text(tokenizer, monkeypatch):
+    class Pipeline:
+        def __init__(self):
+            self.tokenizer = tokenizer
+
+        def __call__(self, inputs, batch_size=None):
+            return fake_ner(inputs) if isinstance(inputs, str) else [fake_ner(t) for t in inputs]
+
+    monkeypatch.setattr(iextract, "get_ner", Pipeline)
+    monkeypatch.setattr(iextract, "NER_BATCHER", None)
+    monkeypatch.setattr(iextract, "ENTITY_CACHE", ResultCache(max_entries=0))
+    text = resume_text()
+    ents = iextract.extract_entities(text, stride=8, mode="ner")
+    assert ents == fake_ner(text)
@@ -0,0 +1,147 @@
+# tests/test_generator.py
+import random
+
+import pytest
+
+from generator import (
+    TIMELINES,
+    _stage_recommendations,
+    analyze_skills_for_career_track,
+    build_career_plan,
+    clear_stage_recommendation_cache,
+    generate_dynamic_stage_recommendations,
+    rank_career_tracks,
+    skill_signature,
+    stage_recommendation_cache_stats,
+)
+from knowledge_base import CAREER_TRACKS
+from matcher import phrase_tokens
+
+KEYWORDS = sorted({keyword for info in CAREER_TRACKS.values() for keyword in info["keywords"]})
+
+
+def _has_run(outer, inner):
+    n = len(inner)
+    return n > 0 and any(outer[i:i + n] == inner for i in range(len(outer) - n + 1))
+
+
+def _reference_ranking(skills):
+    """The tracks x keywords x skills scan the keyword index replaced, on
+    whole-token runs."""
+    scores = {}
+    for track, info in CAREER_TRACKS.items():
+        score = 0
+        for keyword in {k.lower() for k in info["keywords"]}:
+            for skill in skills:
+                k, s = phrase_tokens(keyword), phrase_tokens(skill)
+                if _has_run(s, k) or _has_run(k, s):
+                    score += 1
+        scores[track] = score
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_ranking_matches_a_full_scan(seed):
+    rng = random.Random(seed)
+    skills = rng.sample(KEYWORDS, rng.randint(0, 12))
+    skills += ["Advanced " + rng.choice(KEYWORDS), "learning", "cooking", "r"]
+    assert rank_career_tracks(skills) == _reference_ranking(skills)
+
+
+def test_every_track_is_ranked_best_first_ties_in_knowledge_base_order():
+    assert rank_career_tracks([]) == [(track, 0) for track in CAREER_TRACKS]
+    ranking = rank_career_tracks(["Python", "Machine Learning", "TensorFlow", "SQL"])
+    assert [track for track, _ in ranking] != list(CAREER_TRACKS)
+    scores = [score for _, score in ranking]
+    assert scores == sorted(scores, reverse=True)
+    order = list(CAREER_TRACKS)
+    for (a, sa), (b, sb) in zip(ranking, ranking[1:]):
+        assert sa > sb or order.index(a) < order.index(b)
+
+
+def test_letters_do_not_score_inside_words():
+    letters = [c for c in "aeiost" if not any(c in phrase_tokens(k) for k in KEYWORDS)]
+    assert letters
+    assert all(score == 0 for _, score in rank_career_tracks(letters))
+
+
+def test_skills_pick_the_track_without_an_area_of_interest():
+    skills = ["Python", "Machine Learning", "TensorFlow", "Deep Learning"]
+    track, _ = analyze_skills_for_career_track(skills)
+    assert track == rank_career_tracks(skills)[0][0]
+    ranking = [(t, 0) for t in CAREER_TRACKS]
+    assert analyze_skills_for_career_track(skills, ranking=ranking)[0] == "General Technology"
+
+
+# -- memoized stage recommendations ---------------------------------------
+
+GOALS = [
+    "Become a technical leader/architect",
+    "Move into management/leadership",
+    "Start my own company/entrepreneurship",
+    "Work for top tech companies (FAANG)",
+    "Work remotely/freelance",
+    "Become a subject matter expert",
+    "Achieve work-life balance",
+]
+
+
+@pytest.fixture
+def fresh_memo():
+    clear_stage_recommendation_cache()
+    yield
+    clear_stage_recommendation_cache()
+
+
+def _recommend(track, skills, preferences):
+    return generate_dynamic_stage_recommendations(track, skills, [], [], preferences)
+
+
+def test_same_signature_reuses_the_plan(fresh_memo):
+    preferences = {"timeline": TIMELINES[1], "future_goals": [GOALS[0], GOALS[3]]}
+    first = _recommend("Software Development", ["Python", "Docker"], preferences)
+    # Same matched skills, case and order; goals reordered and repeated.
+    second = _recommend("Software Development", ["docker", "PYTHON"],
+                        {"timeline": TIMELINES[1], "future_goals": [GOALS[3], GOALS[0], GOALS[3]]})
+    assert second == first
+    assert stage_recommendation_cache_stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_results_are_not_shared_between_callers(fresh_memo):
+    first = _recommend("Software Development", ["Python"], {})
+    first[0].append("mutated")
+    assert "mutated" not in _recommend("Software Development", ["Python"], {})[0]
+
+
+@pytest.mark.parametrize("track", ["Software Development", "Business Consulting", "Data Science & Analytics"])
+def test_goals_and_timelines_are_not_mixed_up(fresh_memo, track):
+    rng = random.Random(track)
+    cases = [
+        (skills, {"timeline": timeline, "future_goals": goals})
+        for skills in (["Python", "SQL"], ["Excel", "Communication"], [])
+        for timeline in TIMELINES + ("",)
+        for goals in ([], rng.sample(GOALS, 2), rng.sample(GOALS, 4))
+    ]
+    # Warm the memo in one order, read it back in another, and compare each
+    # answer with an unmemoized computation.
+    for skills, preferences in cases:
+        _recommend(track, skills, preferences)
+    rng.shuffle(cases)
+    for skills, preferences in cases:
+        _, mask, _, _ = skill_signature(track, skills, preferences)
+        goals = tuple(sorted(preferences["future_goals"]))
+        expected = _stage_recommendations.__wrapped__(track, mask, preferences["timeline"], goals)
+        assert _recommend(track, skills, preferences) == tuple(list(recs) for recs in expected)
+
+
+def test_plans_differ_by_timeline_and_goals(fresh_memo):
+    summary = {"skills": ["Python", "SQL", "Machine Learning"], "job_titles": [], "education": []}
+
+    def plan(timeline, goals):
+        prefs = {"area_of_interest": "Data Science", "timeline": timeline, "future_goals": goals}
+        return build_career_plan(dict(summary, user_preferences=prefs))
+
+    fast, steady = plan(TIMELINES[0], []), plan(TIMELINES[1], [])
+    assert fast.stages != steady.stages
+    assert plan(TIMELINES[1], [GOALS[1]]).stages != steady.stages
+    assert plan(TIMELINES[0], []) == fast
@@ -0,0 +1,117 @@
+# tests/test_jobs.py
+import threading
+
+import pytest
+
+import jobs
+from cache import ResultCache
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobQueue
+from pipeline import PROGRESS_STAGES, analyze_resume
+
+
+@pytest.fixture
+def queue():
+    q = JobQueue(max_workers=2)
+    yield q
+    q.shutdown()
+
+
+def _stepped_analysis(monkeypatch, fail_at=None):
+    """Replace the pipeline with one that reports each stage and then waits
+    for the test to release it; raises at ``fail_at``."""
+    reached = {stage: threading.Event() for stage, _ in PROGRESS_STAGES}
+    release = {stage: threading.Event() for stage, _ in PROGRESS_STAGES}
+
+    def analyze(data, filename, preferences, progress=None, ner_slots=None, mode=None):
+        for stage, percent in PROGRESS_STAGES:
+            progress(stage, percent)
+            reached[stage].set()
+            assert release[stage].wait(5)
+            if stage == fail_at:
+                raise RuntimeError(f"{stage} broke")
+        progress("done", 100)
+        return {"summary": {"skills": ["python"]}, "preferences": preferences, "mode": mode}
+
+    monkeypatch.setattr(jobs, "analyze_resume", analyze)
+    return reached, release
+
+
+def test_progress_is_reported_stage_by_stage(queue, monkeypatch):
+    reached, release = _stepped_analysis(monkeypatch)
+    job_id = queue.submit(b"resume", "resume.txt", {"timeline": "x"}, mode="rules")
+
+    seen = []
+    for stage, percent in PROGRESS_STAGES:
+        assert reached[stage].wait(5)
+        status = queue.status(job_id)
+        assert (status["status"], status["stage"], status["progress"]) == (RUNNING, stage, percent)
+        seen.append(percent)
+        release[stage].set()
+
+    assert queue.result(job_id, timeout=5) == {
+        "summary": {"skills": ["python"]}, "preferences": {"timeline": "x"}, "mode": "rules",
+    }
+    status = queue.status(job_id)
+    assert (status["status"], status["stage"], status["progress"]) == (DONE, "done", 100)
+    assert seen == sorted(seen)
+    assert set(status["timings"]) == {stage for stage, _ in PROGRESS_STAGES}
+    assert status["finished_at"] >= status["started_at"] >= status["created_at"]
+
+
+def test_failure_names_the_stage_and_error(queue, monkeypatch):
+    reached, release = _stepped_analysis(monkeypatch, fail_at="extract_entities")
+    for event in release.values():
+        event.set()
+    job_id = queue.submit(b"resume", "resume.txt")
+
+    assert queue.result(job_id, timeout=5) is None
+    status = queue.status(job_id)
+    assert status["status"] == FAILED
+    assert status["failed_stage"] == "extract_entities"
+    assert status["error"] == "RuntimeError: extract_entities broke"
+    assert not reached["normalize_entities"].is_set()
+    assert queue.stats()[FAILED] == 1
+
+
+def test_jobs_wait_for_a_free_worker(monkeypatch):
+    reached, release = _stepped_analysis(monkeypatch)
+    q = JobQueue(max_workers=1)
+    try:
+        first = q.submit(b"a", "a.txt")
+        second = q.submit(b"b", "b.txt")
+        assert reached["extract_text"].wait(5)
+        assert q.status(second)["status"] == QUEUED
+        for event in release.values():
+            event.set()
+        assert q.get(first).wait(5) and q.get(second).wait(5)
+        assert q.stats() == {QUEUED: 0, RUNNING: 0, DONE: 2, FAILED: 0}
+    finally:
+        q.shutdown()
+
+
+def test_finished_jobs_are_pruned(monkeypatch):
+    monkeypatch.setattr(jobs, "analyze_resume", lambda *a, **k: {})
+    q = JobQueue(max_workers=1, max_finished=2)
+    try:
+        ids = [q.submit(b"x", "x.txt") for _ in range(3)]
+        for job_id in ids:
+            q.get(job_id).wait(5)
+        q.submit(b"x", "x.txt")  # pruning happens on submit
+        with pytest.raises(KeyError):
+            q.get(ids[0])
+        assert q.get(ids[2]).finished
+    finally:
+        q.shutdown()
+
+
+def test_real_pipeline_in_rules_mode(queue, monkeypatch):
+    cache = ResultCache()
+    monkeypatch.setattr(jobs, "analyze_resume", lambda *a, **k: analyze_resume(*a, cache=cache, **k))
+
+    job_id = queue.submit(b"Data Scientist\nSkills: Python, SQL", "resume.txt",
+                          {"area_of_interest": "Data Science"}, mode="rules")
+    result = queue.result(job_id, timeout=30)
+    assert result is not None, queue.status(job_id)["error"]
+    assert {"python", "sql"} <= {s.lower() for s in result["summary"]["skills"]}
+    assert result["career_plan"].track.name == "Data Science & Analytics"
+    assert queue.status(job_id)["counters"]
@@ -0,0 +1,44 @@
+# tests/test_matcher.py
+from matcher import PhraseMatcher
+
+
+def phrases(matcher, text):
+    return [(text[start:end], phrase) for start, end, phrase, _ in matcher.finditer(text)]
+
+
+def test_matches_whole_words_only():
+    matcher = PhraseMatcher([("r", None), ("go", None), ("java", None)])
+    assert phrases(matcher, "Writer at Google, knows JavaScript") == []
+    assert phrases(matcher, "R, Go and Java.") == [("R", "r"), ("Go", "go"), ("Java", "java")]
+
+
+def test_punctuation_edges_need_no_boundary():
+    matcher = PhraseMatcher([("c++", None), (".net", None)])
+    assert phrases(matcher, "C++/ASP.NET developer") == [("C++", "c++"), (".NET", ".net")]
+
+
+def test_reports_overlapping_matches():
+    matcher = PhraseMatcher([("google", None), ("google cloud", None), ("cloud", None)])
+    found = phrases(matcher, "Deployed on Google Cloud")
+    assert sorted(found) == [("Cloud", "cloud"), ("Google", "google"), ("Google Cloud", "google cloud")]
+
+
+def test_tags_are_merged_per_phrase():
+    matcher = PhraseMatcher([("python", "skill"), ("Python", "language"), ("python", "skill")])
+    assert len(matcher) == 1
+    assert matcher.findall("python") == [(0, 6, "python", ("skill", "language"))]
+
+
+def test_offsets_survive_length_changing_lowercase():
+    # "İ".lower() is two characters; offsets must still index the original text.
+    text = "İstanbul team, Python"
+    matcher = PhraseMatcher([("python", None)])
+    ((start, end, _, _),) = matcher.findall(text)
+    assert text[start:end] == "Python"
+
+
+def test_phrases_added_after_a_search_are_found():
+    matcher = PhraseMatcher([("sql", None)])
+    assert matcher.findall("rust") == []
+    matcher.add("rust")
+    assert phrases(matcher, "Rust and SQL") == [("Rust", "rust"), ("SQL", "sql")]
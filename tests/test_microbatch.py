@@ -0,0 +1,91 @@
+# tests/test_microbatch.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from microbatch import MicroBatcher
+
+
+def test_concurrent_callers_share_batches_and_get_their_own_results():
+    sizes = []
+
+    def run_batch(items):
+        sizes.append(len(items))
+        return [(caller, i * 10) for caller, i in items]
+
+    batcher = MicroBatcher(run_batch, max_batch=64, max_wait=0.2)
+    callers = 16
+    start = threading.Barrier(callers)
+
+    def call(caller):
+        items = [(caller, i) for i in range(caller % 4 + 1)]
+        start.wait()
+        return batcher.map(items)
+
+    with ThreadPoolExecutor(callers) as pool:
+        results = list(pool.map(call, range(callers)))
+
+    for caller, got in enumerate(results):
+        assert got == [(caller, i * 10) for i in range(caller % 4 + 1)]
+    stats = batcher.stats()
+    assert stats["requests"] == callers
+    assert stats["items"] == sum(sizes) == sum(c % 4 + 1 for c in range(callers))
+    assert stats["batches"] < callers  # requests were coalesced
+
+
+def test_batches_never_exceed_max_batch():
+    sizes = []
+
+    def run_batch(items):
+        sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(run_batch, max_batch=3, max_wait=0.05)
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda c: batcher.map(range(c * 5, c * 5 + 5)), range(4)))
+    assert results == [list(range(c * 5, c * 5 + 5)) for c in range(4)]
+    assert max(sizes) <= 3
+
+
+def test_exception_reaches_every_caller_in_the_batch():
+    def run_batch(items):
+        raise ValueError("model failed")
+
+    batcher = MicroBatcher(run_batch, max_batch=16, max_wait=0.2)
+    start = threading.Barrier(4)
+
+    def call(caller):
+        start.wait()
+        with pytest.raises(ValueError, match="model failed"):
+            batcher.map([caller])
+        return True
+
+    with ThreadPoolExecutor(4) as pool:
+        assert all(pool.map(call, range(4)))
+
+
+def test_worker_survives_a_failed_batch():
+    fail = [True]
+
+    def run_batch(items):
+        if fail.pop() if fail else False:
+            raise RuntimeError("first batch fails")
+        return [i + 1 for i in items]
+
+    batcher = MicroBatcher(run_batch, max_wait=0)
+    with pytest.raises(RuntimeError):
+        batcher.map([1])
+    assert batcher.map([1, 2]) == [2, 3]
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = MicroBatcher(lambda items: items[:-1], max_wait=0)
+    with pytest.raises(RuntimeError, match="returned"):
+        batcher.map([1, 2])
+
+
+def test_empty_input_returns_without_a_batch():
+    batcher = MicroBatcher(lambda items: pytest.fail("no batch expected"))
+    assert batcher.map([]) == []
+    assert batcher.stats()["batches"] == 0
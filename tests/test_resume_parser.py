@@ -0,0 +1,128 @@
+# tests/test_resume_parser.py
+import io
+import os
+import shutil
+
+import pytest
+from PyPDF2 import PageObject
+
+import benchmark
+from resume_parser import (
+    FORMATS,
+    InputTooLarge,
+    _limit_chars,
+    check_size,
+    detect_format,
+    extract_text,
+    iter_pdf_pages,
+    iter_text_segments,
+)
+from utils import upload_source
+
+
+@pytest.fixture(scope="module")
+def corpus(tmp_path_factory):
+    """One long (multi-page) resume per format: ``{format: path}``."""
+    directory = str(tmp_path_factory.mktemp("corpus"))
+    entries = benchmark.build_corpus(directory, per_size=1, sizes={"long": 20}, formats=FORMATS)
+    return {fmt: path for path, fmt, _ in entries}
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+def test_path_bytes_and_file_objects_give_the_same_text(corpus, fmt):
+    path = corpus[fmt]
+    expected = extract_text(path)
+    assert expected
+
+    data = _read(path)
+    assert extract_text(data) == expected
+    assert extract_text(memoryview(data)) == expected
+    assert extract_text(io.BytesIO(data)) == expected
+    with open(path, "rb") as f:
+        assert extract_text(f) == expected
+    assert "\n".join(iter_text_segments(data)) == expected
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+@pytest.mark.parametrize("wrong", [".txt", ".pdf", ".docx", ""])
+def test_format_comes_from_content_not_extension(corpus, tmp_path, fmt, wrong):
+    renamed = str(tmp_path / f"resume{wrong}")
+    shutil.copy(corpus[fmt], renamed)
+    assert detect_format(renamed) == fmt
+    assert extract_text(renamed) == extract_text(corpus[fmt])
+
+
+def test_unknown_binary_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported file type: .doc"):
+        extract_text(b"\xd0\xcf\x11\xe0\x00\x00\x00\x00", "resume.doc")
+
+
+@pytest.mark.parametrize("encoding", ["utf-16-le", "utf-16-be", "utf-32-le"])
+def test_text_with_a_byte_order_mark_is_decoded(encoding):
+    text = "Jane Doe\nPython, SQL — Zürich\n" * 50
+    data = ("\ufeff" + text).encode(encoding)
+    assert detect_format(data) == "txt"
+    assert extract_text(data) == text
+
+
+def test_spilled_upload_is_removed_when_parsing_fails():
+    data = b"%PDF-1.4 not really a pdf" * 10
+    with pytest.raises(Exception):
+        with upload_source(data, "resume.pdf", spill_bytes=16) as source:
+            assert isinstance(source, str) and os.path.exists(source)
+            spilled = source
+            extract_text(source)
+    assert not os.path.exists(spilled)
+
+
+def test_small_upload_is_parsed_from_memory():
+    with upload_source(b"Python developer", "resume.txt") as source:
+        assert isinstance(source, memoryview)
+        assert extract_text(source) == "Python developer"
+
+
+def test_limit_chars_cuts_the_last_segment_and_stops_pulling():
+    pulled = []
+    segments = (pulled.append(s) or s for s in ["aaaa", "bbbb", "cccc"])
+    assert list(_limit_chars(segments, 6)) == ["aaaa", "b"]
+    assert "\n".join(["aaaa", "b"]) == "aaaa\nbbbb"[:6]
+    assert pulled == ["aaaa", "bbbb"]
+
+
+@pytest.mark.parametrize("fmt", FORMATS)
+@pytest.mark.parametrize("limit", [1, 50, 500])
+def test_text_is_cut_at_max_chars(corpus, fmt, limit):
+    full = "\n".join(iter_text_segments(corpus[fmt], max_chars=None))
+    cut = "\n".join(iter_text_segments(corpus[fmt], max_chars=limit))
+    assert cut == full[:limit]
+    assert extract_text(corpus[fmt], max_chars=limit) == full[:limit].strip()
+
+
+def test_pdf_pages_past_the_text_limit_are_not_extracted(corpus, monkeypatch):
+    calls = []
+    original = PageObject.extract_text
+    monkeypatch.setattr(PageObject, "extract_text", lambda page, *a, **k: calls.append(1) or original(page, *a, **k))
+    pages = list(iter_pdf_pages(corpus["pdf"], workers=1))
+    assert len(pages) > 1
+    calls.clear()
+
+    extract_text(corpus["pdf"], max_chars=len(pages[0]) // 2)
+    assert len(calls) == 1
+
+
+def test_pdf_page_cap(corpus):
+    pages = list(iter_pdf_pages(corpus["pdf"], max_pages=None, workers=1))
+    assert len(pages) > 1
+    assert list(iter_pdf_pages(corpus["pdf"], max_pages=1, workers=1)) == pages[:1]
+
+
+def test_byte_limit():
+    check_size(10, limit=10)
+    check_size(10**9, limit=None)
+    with pytest.raises(InputTooLarge):
+        check_size(11, limit=10)
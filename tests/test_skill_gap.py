@@ -0,0 +1,89 @@
+# tests/test_skill_gap.py
+import random
+
+import pytest
+
+from generator import analyze_skills_and_tech_stack, calculate_skill_gap_percentage, compare_skill_gaps
+from knowledge_base import REQUIRED_SKILLS_LOWER
+from matcher import phrase_tokens
+from skill_gap import MIN_MATCH_LENGTH, SKILL_GAP_ENGINE
+
+TRACKS = list(REQUIRED_SKILLS_LOWER)
+VOCABULARY = sorted({skill for categories in REQUIRED_SKILLS_LOWER.values()
+                     for skills in categories.values() for skill, _ in skills})
+# Resume phrasing around required skills, and skills no track asks for.
+EXTRA_SKILLS = ["advanced python programming", "learning", "machine learning pipelines", "Node.js",
+                "CI/CD", "SQL", "team leadership", "cooking", "", "c"]
+
+
+def _has_run(outer, inner):
+    n = len(inner)
+    return n > 0 and any(outer[i:i + n] == inner for i in range(len(outer) - n + 1))
+
+
+def _reference_analysis(track, current_skills):
+    """The per-track loop SkillGapEngine replaced, matching whole-token runs
+    (the engine's rule) where it used raw substrings."""
+    current = [phrase_tokens(skill) for skill in current_skills]
+    matching_skills, missing_skills = {}, {}
+    for category, skills in REQUIRED_SKILLS_LOWER[track].items():
+        matching, missing = [], []
+        for skill, skill_lower in skills:
+            required = phrase_tokens(skill_lower)
+            if len(skill_lower) >= MIN_MATCH_LENGTH and any(
+                _has_run(c, required) or _has_run(required, c) for c in current
+            ):
+                matching.append(skill)
+            else:
+                missing.append(skill)
+        if matching:
+            matching_skills[category] = matching
+        if missing:
+            missing_skills[category] = missing
+    return matching_skills, missing_skills
+
+
+def _candidates(seed):
+    rng = random.Random(seed)
+    yield []
+    yield VOCABULARY
+    for _ in range(25):
+        yield rng.sample(VOCABULARY, rng.randint(1, 30)) + rng.sample(EXTRA_SKILLS, 2)
+
+
+@pytest.mark.parametrize("track", TRACKS)
+def test_engine_matches_the_per_track_loop(track):
+    for skills in _candidates(track):
+        matching, missing = _reference_analysis(track, skills)
+        percentage = calculate_skill_gap_percentage(matching, missing)
+
+        analysis = analyze_skills_and_tech_stack(track, skills)
+        assert analysis["matching_skills"] == matching
+        assert analysis["missing_skills"] == missing
+        assert analysis["skill_gap_percentage"] == percentage
+
+        gap = SKILL_GAP_ENGINE.gap_all(skills)[track]
+        assert gap["matching"] == sum(map(len, matching.values()))
+        assert gap["missing"] == sum(map(len, missing.values()))
+        assert gap["skill_gap_percentage"] == percentage
+
+
+def test_compare_skill_gaps_covers_every_track_smallest_gap_first():
+    skills = ["Python", "SQL", "Machine Learning", "Docker"]
+    ranked = compare_skill_gaps(skills)
+    assert sorted(track for track, _ in ranked) == sorted(TRACKS)
+    percentages = [gap["skill_gap_percentage"] for _, gap in ranked]
+    assert percentages == sorted(percentages)
+    for track, gap in ranked:
+        assert gap["skill_gap_percentage"] == analyze_skills_and_tech_stack(track, skills)["skill_gap_percentage"]
+
+
+@pytest.mark.parametrize("current, required", [("JavaScript", "Java"), ("GitLab", "Git"), ("MySQL", "SQL")])
+def test_substrings_inside_a_word_are_not_matches(current, required):
+    # The replaced loop counted these; the engine matches whole tokens only.
+    tracks = [track for track in TRACKS
+              if any(skill == required for skills in REQUIRED_SKILLS_LOWER[track].values() for skill, _ in skills)]
+    assert tracks
+    for track in tracks:
+        matching = SKILL_GAP_ENGINE.analyze(track, [current])["matching_skills"]
+        assert required not in [skill for skills in matching.values() for skill in skills]
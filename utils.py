@@ -1,15 +1,32 @@
 import os
 import tempfile
+from contextlib import contextmanager
 
 
-def save_uploaded_file(uploaded, filename_hint=None):
-    """Save a Streamlit uploaded file to a temporary path and return path."""
-    if filename_hint:
-        suffix = os.path.splitext(filename_hint)[1]
-    else:
-        suffix = ""
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
-    tmp.write(uploaded.read())
-    tmp.flush()
-    tmp.close()
-    return tmp.name
\ No newline at end of file
+# Uploads up to this size are parsed straight from memory; larger ones are
+# written to a temporary file first, which parsers (and PDF worker
+# processes) open and memory-map instead of holding the bytes.
+SPILL_BYTES = int(os.environ.get("INTELLIPATH_SPILL_BYTES", str(8 * 1024 * 1024)))
+
+
+@contextmanager
+def upload_source(data, filename_hint=None, spill_bytes=SPILL_BYTES):
+    """Parser input for uploaded bytes.
+
+    Yields a memoryview over ``data`` when it is at most ``spill_bytes``,
+    otherwise the path of a temporary copy that is removed on exit, even if
+    parsing fails.
+    """
+    if len(data) <= spill_bytes:
+        yield memoryview(data)
+        return
+    suffix = os.path.splitext(filename_hint)[1] if filename_hint else ""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        tmp.write(data)
+    try:
+        yield tmp.name
+    finally:
+        try:
+            os.remove(tmp.name)
+        except FileNotFoundError:
+            pass